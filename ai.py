@@ -0,0 +1,234 @@
+"""
+Perfect-play tic-tac-toe opponent.
+
+Positions are searched as a pair of 9-bit bitboards (mover's marks, opponent's marks) with a negamax
+alpha-beta search. Results are memoised in a transposition table keyed by the canonical position, i.e. the
+smallest base-3 code of the board under the 8 rotations/reflections of the grid.
+
+The full table is precomputed on the host by running `python ai.py`, which writes ai_table.py. On the Pico
+choosing a move is then a canonicalisation plus a lookup into that bytes blob, no search is run.
+
+Since a missed shot still passes the turn, the mark counts on the board do not have to be balanced. The
+table therefore covers every non-terminal board from the point of view of the player to move.
+"""
+
+try:
+    from ai_table import TABLE
+except ImportError:
+    TABLE = None  # table not generated yet, fall back to a live search
+
+FULL = 0x1FF
+
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # columns
+    0b100010001, 0b001010100                # diagonals
+)
+
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)  # centre, corners, then edges - gives the most cutoffs
+
+# the 8 board symmetries. a transformed board is new[i] = old[perm[i]], so cell i of the transformed board
+# is cell perm[i] of the original.
+SYMMETRIES = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8),  # identity
+    (6, 3, 0, 7, 4, 1, 8, 5, 2),  # rotate 90
+    (8, 7, 6, 5, 4, 3, 2, 1, 0),  # rotate 180
+    (2, 5, 8, 1, 4, 7, 0, 3, 6),  # rotate 270
+    (2, 1, 0, 5, 4, 3, 8, 7, 6),  # mirror
+    (0, 3, 6, 1, 4, 7, 2, 5, 8),  # mirror + rotate 90 (transpose)
+    (6, 7, 8, 3, 4, 5, 0, 1, 2),  # mirror + rotate 180
+    (8, 5, 2, 7, 4, 1, 6, 3, 0),  # mirror + rotate 270 (anti-transpose)
+)
+
+POW3 = (1, 3, 9, 27, 81, 243, 729, 2187, 6561)
+
+ENTRY_SIZE = 3  # table entry: canonical code (2 bytes, big endian) + best move in canonical coordinates
+
+_EXACT = 0
+_LOWER = 1
+_UPPER = 2
+
+
+def is_win(bits):
+    for mask in WIN_MASKS:
+        if bits & mask == mask:
+            return True
+    return False
+
+
+def canonical(cells):
+    """
+    Find the canonical form of a board.
+
+    :param cells: 9 cell values, 0 = empty, 1 = player to move, 2 = opponent
+    :return: tuple of (smallest base-3 code over all symmetries, permutation that produced it)
+    """
+    best_code = -1
+    best_perm = None
+    for perm in SYMMETRIES:
+        code = 0
+        for i in range(9):
+            code += cells[perm[i]] * POW3[i]
+        if best_code < 0 or code < best_code:
+            best_code = code
+            best_perm = perm
+    return best_code, best_perm
+
+
+def _bits_to_cells(mine, theirs):
+    return [1 if mine >> i & 1 else 2 if theirs >> i & 1 else 0 for i in range(9)]
+
+
+def _code_to_bits(code):
+    mine = 0
+    theirs = 0
+    for i in range(9):
+        cell = code // POW3[i] % 3
+        if cell == 1:
+            mine |= 1 << i
+        elif cell == 2:
+            theirs |= 1 << i
+    return mine, theirs
+
+
+class Solver:
+
+    def __init__(self):
+        self.table = {}  # canonical code -> (value, flag, move in canonical coordinates)
+
+    def search(self, mine, theirs, alpha=-100, beta=100):
+        """
+        Negamax search from the point of view of the player owning `mine`. Assumes neither side has a line yet.
+
+        A win scores the number of empty cells left before the winning move (so faster wins score higher),
+        a draw scores 0.
+
+        :return: tuple of (value, best cell) - cell is -1 if the board is full
+        """
+        empty = ~(mine | theirs) & FULL
+        if not empty:
+            return 0, -1
+
+        code, perm = canonical(_bits_to_cells(mine, theirs))
+        alpha_orig = alpha
+
+        entry = self.table.get(code)
+        if entry is not None:
+            value, flag, move = entry
+            # bounds are only used for cutoffs. narrowing the window with them would leave the stored move
+            # unreliable, and every table entry needs an exact move.
+            if flag == _EXACT or (flag == _LOWER and value >= beta) or (flag == _UPPER and value <= alpha):
+                return value, perm[move]
+
+        remaining = bin(empty).count("1")
+        best = -100
+        best_move = -1
+        for cell in MOVE_ORDER:
+            bit = 1 << cell
+            if not empty & bit:
+                continue
+
+            placed = mine | bit
+            if is_win(placed):
+                value = remaining
+            else:
+                value = -self.search(theirs, placed, -beta, -alpha)[0]
+
+            if value > best:
+                best = value
+                best_move = cell
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best <= alpha_orig:
+            flag = _UPPER
+        elif best >= beta:
+            flag = _LOWER
+        else:
+            flag = _EXACT
+        self.table[code] = (best, flag, perm.index(best_move))
+
+        return best, best_move
+
+    def build_table(self):
+        """
+        Solve every non-terminal canonical position.
+
+        :return: bytes blob of sorted ENTRY_SIZE-byte entries
+        """
+        codes = set()
+        for code in range(3 ** 9):
+            mine, theirs = _code_to_bits(code)
+            if mine | theirs == FULL or is_win(mine) or is_win(theirs):
+                continue
+            codes.add(canonical(_bits_to_cells(mine, theirs))[0])
+
+        blob = bytearray()
+        for code in sorted(codes):
+            mine, theirs = _code_to_bits(code)
+            # full window so the root move is exact. the board is already canonical so the move is too.
+            move = self.search(mine, theirs)[1]
+            blob.extend((code >> 8, code & 0xFF, move))
+
+        return bytes(blob)
+
+
+def _lookup(code):
+    lo = 0
+    hi = len(TABLE) // ENTRY_SIZE - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        idx = mid * ENTRY_SIZE
+        entry = (TABLE[idx] << 8) | TABLE[idx + 1]
+        if entry == code:
+            return TABLE[idx + 2]
+        elif entry < code:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return -1
+
+
+def best_move(board, player):
+    """
+    Pick the best cell for `player` to shoot at.
+
+    :param board: list of 9 cells as stored in MainProgram.cur_board (0 = empty, 1 = P1, 2 = P2)
+    :param player: 1 or 2
+    :return: cell index, or -1 if the game is already decided or the board is full
+    """
+    cells = [0 if c == 0 else 1 if c == player else 2 for c in board]
+
+    if TABLE is None:
+        mine = 0
+        theirs = 0
+        for i in range(9):
+            if cells[i] == 1:
+                mine |= 1 << i
+            elif cells[i] == 2:
+                theirs |= 1 << i
+        if is_win(mine) or is_win(theirs):
+            return -1
+        return Solver().search(mine, theirs)[1]
+
+    code, perm = canonical(cells)
+    move = _lookup(code)
+    if move < 0:
+        return -1
+    return perm[move]
+
+
+def write_table(path="ai_table.py"):
+    blob = Solver().build_table()
+    with open(path, "w") as f:
+        f.write('"""\nGenerated by ai.py - do not edit.\n\n{} positions, {} bytes.\n"""\n\n'.format(
+            len(blob) // ENTRY_SIZE, len(blob)))
+        f.write("TABLE = (\n")
+        for i in range(0, len(blob), 24):
+            f.write("    {!r}\n".format(blob[i:i + 24]))
+        f.write(")\n")
+
+
+if __name__ == "__main__":
+    write_table()
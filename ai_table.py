@@ -0,0 +1,206 @@
+"""
+Generated by ai.py - do not edit.
+
+1582 positions, 4746 bytes.
+"""
+
+TABLE = (
+    b'\x00\x00\x04\x00\x01\x04\x00\x02\x04\x00\x03\x04\x00\x04\x02\x00\x05\x04\x00\x06\x04\x00\x07\x04'
+    b'\x00\x08\x02\x00\n\x01\x00\x0b\x06\x00\x0e\x04\x00\x10\x04\x00\x11\x08\x00\x14\x01\x00\x17\x04'
+    b'\x00\x1e\x04\x00\x1f\x02\x00 \x04\x00!\x04\x00"\x06\x00#\x02\x00$\x04\x00%\x06'
+    b"\x00&\x04\x00'\x00\x00)\x04\x00*\x04\x00+\x06\x00,\x04\x00-\x00\x00.\x06"
+    b'\x00/\x01\x000\x04\x001\x06\x002\x04\x003\x00\x004\x06\x00<\x04\x00=\x04'
+    b'\x00>\x04\x00?\x04\x00@\x01\x00A\x06\x00B\x00\x00D\x06\x00E\x08\x00F\x04'
+    b'\x00G\x06\x00H\x04\x00I\x04\x00J\x04\x00K\x04\x00L\x04\x00M\x06\x00N\x00'
+    b'\x00O\x04\x00Q\x00\x00R\x08\x00S\x02\x00T\x07\x00U\x02\x00V\x07\x00W\x00'
+    b'\x00X\x08\x00Y\x02\x00[\x06\x00\\\x06\x00_\x06\x00a\x06\x00b\x06\x00e\x01'
+    b'\x00h\x07\x00o\x05\x00p\x02\x00q\x05\x00r\x05\x00s\x06\x00t\x05\x00u\x06'
+    b'\x00v\x06\x00w\x06\x00x\x00\x00z\x06\x00{\x06\x00|\x06\x00}\x06\x00~\x05'
+    b'\x00\x7f\x06\x00\x80\x05\x00\x81\x05\x00\x82\x06\x00\x83\x05\x00\x84\x05\x00\x85\x06\x00\x8d\x00'
+    b'\x00\x8e\x08\x00\x8f\x02\x00\x90\x06\x00\x91\x06\x00\x92\x06\x00\x93\x00\x00\x95\x06\x00\x96\x06'
+    b'\x00\x97\x06\x00\x98\x06\x00\x99\x00\x00\x9a\x08\x00\x9b\x06\x00\x9c\x07\x00\x9d\x08\x00\x9e\x07'
+    b'\x00\x9f\x00\x00\xa0\x08\x00\xa2\x00\x00\xa3\x02\x00\xa4\x08\x00\xa5\x00\x00\xa6\x02\x00\xa7\x08'
+    b'\x00\xa8\x07\x00\xa9\x07\x00\xaa\x02\x00\xac\x01\x00\xad\x08\x00\xb0\x08\x00\xb2\x07\x00\xb3\x08'
+    b'\x00\xb6\x06\x00\xb9\x06\x00\xc0\x00\x00\xc1\x02\x00\xc2\x08\x00\xc3\x07\x00\xc4\x06\x00\xc5\x02'
+    b'\x00\xc6\x00\x00\xc7\x06\x00\xc8\x08\x00\xc9\x00\x00\xcb\x08\x00\xcc\x07\x00\xcd\x06\x00\xce\x08'
+    b'\x00\xcf\x06\x00\xd0\x06\x00\xd1\x06\x00\xd2\x06\x00\xd3\x06\x00\xd4\x06\x00\xd5\x00\x00\xd6\x06'
+    b'\x00\xde\x00\x00\xdf\x02\x00\xe0\x02\x00\xe1\x05\x00\xe2\x01\x00\xe3\x06\x00\xe4\x00\x00\xe6\x08'
+    b'\x00\xe7\x00\x00\xe8\x06\x00\xe9\x06\x00\xea\x00\x00\xeb\x06\x00\xec\x06\x00\xed\x00\x00\xee\x06'
+    b'\x00\xef\x06\x00\xf0\x00\x00\xf1\x06\x01\x0e\x04\x01\x0f\x04\x01\x10\x04\x01\x11\x04\x01\x12\x04'
+    b'\x01\x13\x04\x01\x14\x04\x01\x15\x04\x01\x16\x04\x01\x18\x04\x01\x19\x04\x01\x1c\x04\x01\x1e\x04'
+    b'\x01\x1f\x04\x01"\x04\x01%\x04\x01)\x04\x01*\x02\x01+\x06\x01,\x02\x01-\x02'
+    b'\x01.\x06\x01/\x00\x010\x08\x011\x04\x012\x08\x013\x08\x014\x08\x015\x00'
+    b'\x017\x08\x018\x08\x019\x08\x01:\x08\x01;\x00\x01<\x04\x01=\x04\x01>\x04'
+    b'\x01?\x04\x01@\x06\x01A\x00\x01B\x04\x01z\x02\x01{\x08\x01|\x06\x01}\x07'
+    b'\x01~\x02\x01\x7f\x07\x01\x80\x02\x01\x81\x08\x01\x82\x02\x01\x83\x06\x01\x84\x06\x01\x85\x06'
+    b'\x01\x86\x00\x01\x88\x08\x01\x89\x06\x01\x8a\x06\x01\x8b\x08\x01\x8c\x00\x01\x8d\x08\x01\x8e\x08'
+    b'\x01\x8f\x07\x01\x90\x08\x01\x91\x07\x01\x92\x00\x01\x93\x08\x01\xb0\x00\x01\xb1\x06\x01\xb2\x08'
+    b'\x01\xb3\x00\x01\xb4\x02\x01\xb5\x08\x01\xb6\x07\x01\xb7\x06\x01\xb8\x02\x01\xba\x06\x01\xbb\x08'
+    b'\x01\xbe\x08\x01\xc0\x06\x01\xc1\x08\x01\xc4\x06\x01\xc7\x06\x01\xcb\x08\x01\xcc\x02\x01\xcd\x06'
+    b'\x01\xce\x02\x01\xcf\x02\x01\xd0\x02\x01\xd1\x07\x01\xd2\x07\x01\xd3\x02\x01\xd4\x08\x01\xd5\x08'
+    b'\x01\xd6\x08\x01\xd7\x00\x01\xd9\x08\x01\xda\x08\x01\xdb\x08\x01\xdc\x08\x01\xdd\x06\x01\xde\x06'
+    b'\x01\xdf\x06\x01\xe0\x06\x01\xe1\x06\x01\xe2\x06\x01\xe3\x00\x01\xe4\x06\x02\x1c\x04\x02\x1d\x04'
+    b'\x02\x1e\x04\x02\x1f\x04\x02 \x02\x02!\x04\x02"\x04\x02#\x04\x02$\x04\x02&\x01'
+    b"\x02'\x04\x02*\x04\x02,\x04\x02-\x04\x020\x04\x023\x04\x02m\x00\x02n\x08"
+    b'\x02o\x06\x02p\x07\x02q\x02\x02r\x07\x02s\x00\x02t\x08\x02u\x02\x02w\x06'
+    b'\x02x\x06\x02{\x06\x02}\x06\x02~\x06\x02\x81\x06\x02\x84\x07\x02\xe2\x04\x02\xe3\x04'
+    b'\x02\xe4\x04\x02\xe5\x04\x02\xe7\x04\x02\xe8\x04\x02\xe9\x04\x02\xea\x04\x02\xeb\x00\x02\xec\x03'
+    b'\x02\xed\x01\x02\xee\x07\x02\xef\x03\x02\xf0\x07\x02\xf1\x00\x02\xf2\x03\x03\x00\x04\x03\x02\x04'
+    b'\x03\x03\x04\x03\x05\x04\x03\x06\x00\x03\x08\x01\x03\t\x00\x03\x0b\x04\x03\x0c\x00\x03\x1e\x04'
+    b'\x03\x1f\x04\x03 \x04\x03!\x04\x03"\x08\x03#\x01\x03$\x07\x03%\x04\x03&\x07'
+    b"\x03'\x00\x03(\x08\x03<\x00\x03=\x08\x03>\x01\x03?\x07\x03@\x08\x03A\x07"
+    b'\x03B\x00\x03C\x08\x03W\x00\x03Y\x05\x03Z\x00\x03\\\x07\x03]\x00\x03r\x08'
+    b'\x03s\x08\x03t\x01\x03u\x07\x03v\x08\x03w\x07\x03x\x00\x03y\x08\x03\x84\x00'
+    b'\x03\x85\x01\x03\x86\x08\x03\x87\x00\x03\x89\x08\x03\x8a\x07\x03\x8b\x03\x03\x8c\x08\x03\x8d\x08'
+    b'\x03\x8e\x03\x03\x8f\x08\x03\x90\x00\x03\x91\x03\x03\x92\x08\x03\x93\x00\x03\x94\x03\x03\xa2\x00'
+    b'\x03\xa4\x08\x03\xa5\x00\x03\xa7\x08\x03\xa8\x00\x03\xaa\x08\x03\xab\x00\x03\xad\x08\x03\xae\x00'
+    b'\x03\xc0\x00\x03\xc1\x08\x03\xc2\x08\x03\xc3\x05\x03\xc4\x05\x03\xc5\x08\x03\xc6\x05\x03\xc7\x05'
+    b'\x03\xc8\x08\x03\xc9\x00\x03\xca\x08\x03\xcd\x03\x03\xce\x04\x03\xcf\x04\x03\xd0\x02\x03\xd1\x04'
+    b'\x03\xd2\x04\x03\xd3\x03\x03\xd4\x02\x03\xd6\x04\x03\xd7\x04\x03\xd8\x04\x03\xda\x04\x03\xdb\x04'
+    b'\x03\xdc\x04\x03\xdd\x04\x03\xdf\x03\x03\xe0\x01\x03\xe1\x04\x03\xe2\x03\x03\xe3\x04\x03\xe4\x00'
+    b'\x03\xe5\x03\x03\xe9\x04\x03\xea\x04\x03\xec\x04\x03\xed\x04\x03\xef\x04\x03\xf0\x04\x03\xf2\x04'
+    b'\x03\xf3\x04\x03\xf5\x04\x03\xf6\x04\x03\xf8\x04\x03\xf9\x04\x03\xfb\x04\x03\xfc\x04\x03\xfe\x04'
+    b'\x03\xff\x04\x04\x03\x04\x04\x04\x02\x04\x05\x04\x04\x06\x02\x04\x07\x04\x04\x08\x02\x04\t\x04'
+    b'\x04\n\x02\x04\x0b\x04\x04\x0c\x04\x04\r\x04\x04\x0e\x04\x04\x10\x04\x04\x11\x04\x04\x12\x04'
+    b'\x04\x13\x04\x04\x14\x04\x04\x15\x08\x04\x16\x01\x04\x17\x07\x04\x18\x04\x04\x19\x07\x04\x1a\x00'
+    b'\x04\x1b\x08\x04\x1e\x02\x04\x1f\x02\x04 \x02\x04!\x02\x04"\x02\x04#\x02\x04$\x02'
+    b'\x04%\x02\x040\x08\x041\x03\x042\x03\x043\x08\x044\x03\x045\x03\x046\x08'
+    b'\x04T\x02\x04U\x02\x04V\x02\x04W\x02\x04X\x02\x04Y\x02\x04Z\x02\x04[\x02'
+    b'\x04e\x08\x04f\x08\x04g\x01\x04h\x07\x04i\x08\x04j\x07\x04k\x00\x04l\x08'
+    b'\x04o\x03\x04p\x08\x04q\x00\x04r\x02\x04s\x08\x04t\x07\x04u\x03\x04v\x02'
+    b'\x04x\x08\x04y\x08\x04z\x00\x04|\x08\x04}\x08\x04~\x08\x04\x7f\x08\x04\x81\x03'
+    b'\x04\x82\x08\x04\x83\x00\x04\x84\x03\x04\x85\x08\x04\x86\x08\x04\x87\x03\x04\x8b\x08\x04\x8c\x00'
+    b'\x04\x8e\x08\x04\x8f\x00\x04\x91\x02\x04\x92\x00\x04\x94\x08\x04\x95\x00\x04\x97\x08\x04\x98\x00'
+    b'\x04\x9a\x08\x04\x9b\x00\x04\x9d\x08\x04\x9e\x00\x04\xa0\x08\x04\xa1\x00\x04\xa5\x02\x04\xa6\x08'
+    b'\x04\xa7\x02\x04\xa8\x02\x04\xa9\x08\x04\xaa\x07\x04\xab\x07\x04\xac\x02\x04\xad\x08\x04\xae\x08'
+    b'\x04\xaf\x08\x04\xb0\x00\x04\xb2\x08\x04\xb3\x08\x04\xb4\x08\x04\xb5\x08\x04\xb6\x08\x04\xb7\x08'
+    b'\x04\xb8\x08\x04\xb9\x00\x04\xba\x08\x04\xbb\x08\x04\xbc\x00\x04\xbd\x07\x04\xc0\x03\x04\xc1\x08'
+    b'\x04\xc3\x02\x04\xc4\x04\x04\xc5\x00\x04\xc6\x03\x04\xc7\x02\x04\xc9\x04\x04\xca\x04\x04\xcd\x04'
+    b'\x04\xce\x04\x04\xcf\x04\x04\xd0\x04\x04\xd2\x03\x04\xd3\x04\x04\xd5\x03\x04\xd6\x08\x04\xd7\x04'
+    b'\x04\xd8\x03\x04\xdc\x08\x04\xdd\x00\x04\xdf\x04\x04\xe0\x00\x04\xe2\x02\x04\xe5\x04\x04\xe6\x04'
+    b'\x04\xe8\x04\x04\xe9\x04\x04\xeb\x04\x04\xec\x00\x04\xee\x04\x04\xef\x00\x04\xf1\x08\x04\xf2\x00'
+    b'\x04\xf6\x04\x04\xf7\x04\x04\xf8\x04\x04\xf9\x02\x04\xfa\x04\x04\xfb\x04\x04\xfc\x04\x04\xfd\x04'
+    b'\x04\xfe\x04\x04\xff\x04\x05\x00\x04\x05\x01\x04\x05\x03\x04\x05\x04\x04\x05\x05\x04\x05\x06\x04'
+    b'\x05\x07\x04\x05\x08\x04\x05\t\x04\x05\n\x04\x05\x0b\x04\x05\x0c\x04\x05\r\x04\x05\x0e\x04'
+    b'\x05\x11\x02\x05\x12\x02\x05\x14\x02\x05\x15\x02\x05\x16\x02\x05\x17\x02\x05\x18\x02\x05#\x08'
+    b"\x05$\x08\x05&\x08\x05'\x07\x05(\x00\x05)\x08\x05-\x02\x05.\x00\x050\x02"
+    b'\x051\x00\x053\x02\x05=\x00\x05?\x08\x05@\x00\x05B\x07\x05C\x00\x05G\x02'
+    b'\x05H\x02\x05I\x02\x05J\x02\x05K\x02\x05L\x02\x05M\x02\x05N\x02\x05X\x08'
+    b'\x05Y\x08\x05Z\x08\x05[\x07\x05\\\x08\x05]\x07\x05^\x00\x05_\x08\x05b\x03'
+    b'\x05c\x08\x05e\x02\x05f\x02\x05g\x00\x05h\x03\x05i\x02\x05k\x01\x05l\x08'
+    b'\x05o\x08\x05p\x00\x05q\x03\x05r\x08\x05t\x03\x05u\x08\x05w\x03\x05x\x08'
+    b'\x05y\x08\x05z\x03\x05~\x08\x05\x7f\x00\x05\x81\x08\x05\x82\x00\x05\x84\x02\x05\x87\x08'
+    b'\x05\x88\x00\x05\x8a\x08\x05\x8b\x00\x05\x8d\x08\x05\x8e\x00\x05\x90\x08\x05\x91\x00\x05\x93\x08'
+    b'\x05\x94\x00\x05\xc4\x04\x05\xc5\x04\x05\xc6\x04\x05\xc7\x04\x05\xc8\x04\x05\xc9\x04\x05\xca\x04'
+    b'\x05\xcb\x04\x05\xe2\x04\x05\xe3\x04\x05\xe4\x04\x05\xe5\x04\x05\xe6\x04\x06\x00\x04\x06\x01\x04'
+    b'\x06\x15\x01\x06\x16\x08\x06\x17\x08\x06\x18\x07\x06\x19\x08\x06\x1a\x07\x06\x1b\x00\x06\x1c\x08'
+    b'\x063\x05\x064\x08\x065\x05\x066\x05\x067\x08\x06Q\x00\x06R\x08\x06\xa7\x03'
+    b'\x06\xa8\x04\x06\xa9\x02\x06\xaa\x03\x06\xab\x04\x06\xac\x04\x06\xad\x04\x06\xaf\x08\x06\xb0\x08'
+    b'\x06\xb1\x00\x06\xb3\x08\x06\xb4\x08\x06\xb5\x08\x06\xb6\x08\x06\xb8\x04\x06\xb9\x04\x06\xba\x04'
+    b'\x06\xbb\x04\x06\xbc\x04\x06\xbd\x04\x06\xbe\x04\x06\xc2\x04\x06\xc3\x04\x06\xc4\x04\x06\xc5\x04'
+    b'\x06\xc6\x04\x06\xc7\x04\x06\xc8\x04\x06\xca\x04\x06\xcb\x04\x06\xcc\x04\x06\xce\x04\x06\xcf\x04'
+    b'\x06\xd0\x04\x06\xd1\x04\x06\xd2\x04\x06\xd3\x04\x06\xd4\x04\x06\xd5\x04\x06\xd6\x04\x06\xd7\x04'
+    b'\x06\xd8\x04\x06\xd9\x04\x06\xde\x00\x06\xdf\x02\x06\xe1\x00\x06\xe2\x08\x06\xe5\x08\x06\xe7\x00'
+    b'\x06\xea\x08\x06\xeb\x08\x06\xed\x04\x06\xee\x04\x06\xf0\x04\x06\xf1\x04\x06\xf3\x04\x06\xf4\x04'
+    b'\x06\xf8\x03\x06\xf9\x03\x06\xfa\x02\x06\xfb\x03\x06\xfc\x03\x06\xfd\x08\x06\xfe\x03\x07\x00\x08'
+    b'\x07\x01\x08\x07\x02\x00\x07\x04\x08\x07\x05\x08\x07\x06\x08\x07\x07\x08\x07\t\x08\x07\n\x03'
+    b'\x07\x0b\x03\x07\x0c\x08\x07\r\x03\x07\x0e\x03\x07\x0f\x08\x07/\x07\x070\x02\x072\x00'
+    b'\x073\x08\x076\x08\x078\x00\x07;\x08\x07<\x08\x07>\x00\x07?\x08\x07A\x07'
+    b'\x07B\x08\x07D\x00\x07E\x08\x07I\x02\x07J\x02\x07K\x02\x07L\x02\x07M\x08'
+    b'\x07N\x02\x07O\x02\x07Q\x08\x07R\x08\x07S\x00\x07U\x08\x07V\x08\x07W\x08'
+    b'\x07X\x08\x07d\x02\x07e\x02\x07f\x02\x07g\x02\x07h\x00\x07i\x02\x07j\x02'
+    b'\x07l\x08\x07m\x08\x07n\x00\x07p\x08\x07q\x08\x07r\x08\x07s\x08\x07\x80\x00'
+    b'\x07\x81\x02\x07\x83\x00\x07\x84\x02\x07\x87\x08\x07\x89\x00\x07\x8c\x08\x07\x8d\x08\x07\x9a\x03'
+    b'\x07\x9c\x02\x07\x9d\x03\x07\x9e\x04\x07\x9f\x04\x07\xa0\x04\x07\xa2\x01\x07\xa3\x03\x07\xa6\x03'
+    b'\x07\xa7\x04\x07\xa8\x04\x07\xa9\x03\x07\xab\x04\x07\xac\x04\x07\xae\x04\x07\xaf\x04\x07\xb0\x04'
+    b'\x07\xb1\x04\x07\xb5\x04\x07\xb6\x04\x07\xb7\x02\x07\xb8\x04\x07\xb9\x04\x07\xba\x04\x07\xbb\x02'
+    b'\x07\xbd\x01\x07\xbe\x04\x07\xbf\x00\x07\xc1\x04\x07\xc2\x04\x07\xc3\x04\x07\xc4\x04\x07\xc6\x04'
+    b'\x07\xc7\x04\x07\xc8\x04\x07\xc9\x04\x07\xca\x04\x07\xcb\x04\x07\xcc\x04\x07\xd1\x04\x07\xd2\x02'
+    b'\x07\xd4\x04\x07\xd5\x04\x07\xd8\x01\x07\xda\x00\x07\xdd\x04\x07\xde\x04\x07\xe0\x04\x07\xe1\x04'
+    b'\x07\xe3\x04\x07\xe4\x04\x07\xe6\x04\x07\xe7\x04\x07\xeb\x03\x07\xed\x02\x07\xee\x07\x07\xef\x02'
+    b'\x07\xf0\x08\x07\xf1\x02\x07\xf3\x08\x07\xf4\x03\x07\xf7\x07\x07\xf8\x08\x07\xf9\x08\x07\xfa\x03'
+    b'\x07\xfc\x08\x07\xfd\x08\x07\xff\x08\x08\x00\x07\x08\x01\x00\x08\x02\x08\x08\x06\x08\x08\x07\x07'
+    b'\x08\x08\x02\x08\t\x07\x08\n\x02\x08\x0b\x08\x08\x0c\x02\x08\x0e\x08\x08\x0f\x08\x08\x10\x00'
+    b'\x08\x12\x07\x08\x13\x00\x08\x14\x08\x08\x15\x08\x08\x17\x08\x08\x18\x08\x08\x19\x07\x08\x1a\x08'
+    b'\x08\x1b\x07\x08\x1c\x00\x08\x1d\x08\x08"\x07\x08#\x02\x08%\x00\x08&\x08\x08)\x08'
+    b'\x08+\x00\x08.\x00\x08/\x08\x081\x00\x082\x08\x084\x07\x085\x08\x087\x00'
+    b'\x088\x08\x08<\x02\x08>\x02\x08?\x02\x08@\x00\x08A\x02\x08B\x02\x08D\x01'
+    b'\x08E\x08\x08H\x08\x08I\x00\x08J\x08\x08K\x08\x08W\x02\x08X\x02\x08Y\x02'
+    b'\x08Z\x02\x08[\x00\x08\\\x02\x08]\x02\x08_\x01\x08`\x08\x08a\x00\x08c\x08'
+    b'\x08d\x07\x08e\x07\x08f\x08\t\x9c\x04\t\x9d\x04\t\x9e\x04\t\x9f\x04\t\xa0\x04'
+    b'\t\xa1\x04\t\xa3\x04\t\xa4\x04\t\xa7\x04\t\xa9\x04\t\xaa\x04\t\xad\x04\t\xb0\x04'
+    b'\t\xba\x08\t\xbb\x08\t\xbc\x04\t\xbe\x08\t\xbf\x08\t\xc0\x04\t\xc2\x04\t\xc3\x08'
+    b'\t\xc4\x08\t\xc5\x08\t\xc7\x04\t\xc8\x04\t\xc9\x04\t\xca\x04\t\xcb\x04\t\xcc\x00'
+    b'\t\xcd\x08\n\x0b\x08\n\x0c\x08\n\r\x08\n\x0f\x06\n\x10\x06\n\x14\x06\n\x15\x06'
+    b'\n\x16\x06\n\x18\x08\n\x19\x01\n\x1d\x00\n\x1e\x08\n>\x00\n?\x02\n@\x08'
+    b'\nA\x06\nB\x06\nC\x02\nE\x06\nF\x08\nI\x08\nK\x06\nL\x08'
+    b'\nO\x06\nR\x06\n\\\x08\n]\x08\n^\x02\n`\x08\na\x08\nb\x00'
+    b'\nd\x08\ne\x08\nf\x08\ng\x08\ni\x06\nj\x06\nk\x06\nl\x06'
+    b'\nm\x06\nn\x08\no\x06\n\xaa\x04\n\xab\x04\n\xac\x04\n\xad\x04\n\xae\x04'
+    b'\n\xaf\x04\n\xb1\x01\n\xb2\x04\n\xb5\x04\n\xb7\x04\n\xb8\x04\n\xbb\x04\n\xbe\x04'
+    b'\n\xfe\x08\n\xff\x08\x0b\x00\x06\x0b\x02\x06\x0b\x03\x06\x0b\x08\x06\x0b\t\x06\x0b\x0c\x01'
+    b'\x0ca\x04\x0cb\x04\x0ce\x04\x0cg\x04\x0ch\x04\x0cj\x08\x0ck\x08\x0cm\x04'
+    b'\x0cn\x04\x0cp\x08\x0c~\x04\x0c\x80\x04\x0c\x81\x04\x0c\x83\x04\x0c\x86\x04\x0c\x87\x04'
+    b'\x0c\x89\x04\x0c\x8a\x04\x0c\x9c\x04\x0c\x9d\x04\x0c\x9e\x04\x0c\xa0\x08\x0c\xa1\x08\x0c\xa2\x04'
+    b'\x0c\xa3\x04\x0c\xa4\x04\x0c\xa5\x08\x0c\xa6\x08\x0c\xbb\x08\x0c\xbc\x08\x0c\xc1\x08\x0c\xf1\x08'
+    b'\x0c\xf2\x08\x0c\xf6\x08\x0c\xf7\x08\r\x03\x08\r\x04\x08\r\x07\x08\r\t\x08\r\n\x08'
+    b'\r\x0c\x08\r\r\x08\r\x0f\x08\r\x10\x08\r\x12\x08\r \x00\r"\x08\r#\x00'
+    b'\r%\x08\r(\x08\r)\x00\r+\x08\r,\x00\r>\x08\r?\x08\r@\x08'
+    b'\rB\x08\rC\x08\rD\x08\rE\x08\rF\x08\rG\x08\rH\x08\rN\x04'
+    b'\rO\x04\rQ\x08\rR\x08\rT\x04\rU\x04\rX\x04\rZ\x04\r[\x04'
+    b'\r]\x08\r^\x08\r`\x04\ra\x04\rc\x08\rj\x04\rk\x00\rm\x08'
+    b'\rp\x04\rs\x04\rt\x04\rv\x04\ry\x08\r|\x04\r}\x00\r\x84\x04'
+    b'\r\x85\x04\r\x86\x08\r\x87\x08\r\x88\x08\r\x8a\x04\r\x8b\x04\r\x8c\x04\r\x8e\x04'
+    b'\r\x8f\x04\r\x90\x04\r\x91\x04\r\x93\x08\r\x94\x08\r\x95\x04\r\x96\x04\r\x97\x04'
+    b'\r\x98\x08\r\x99\x08\r\xa2\x02\r\xa3\x02\r\xae\x08\r\xaf\x08\r\xb4\x08\r\xbc\x00'
+    b'\r\xbe\x08\r\xca\x08\r\xce\x00\r\xd7\x02\r\xd8\x02\r\xd9\x02\r\xe4\x08\r\xe5\x08'
+    b'\r\xe9\x08\r\xea\x08\r\xf0\x08\r\xf1\x08\r\xf3\x08\r\xf4\x08\r\xf6\x08\r\xf7\x08'
+    b'\r\xfa\x08\r\xfc\x08\r\xfd\x08\r\xff\x08\x0e\x00\x08\x0e\x02\x08\x0e\x03\x08\x0e\x05\x08'
+    b'\x0e\x0c\x08\x0e\r\x08\x0e\x0f\x08\x0e\x12\x08\x0e\x15\x08\x0e\x16\x08\x0e\x18\x08\x0e\x1b\x08'
+    b'\x0e\x1e\x08\x0e\x1f\x08\x0fC\x04\x0fD\x04\x0fF\x04\x0fG\x04\x0fI\x04\x0f`\x04'
+    b'\x0fa\x04\x0fb\x04\x0fc\x04\x0fd\x04\x0f~\x04\x0f\x7f\x04\x0f\x94\x08\x0f\x95\x01'
+    b'\x0f\x9a\x08\x0f\xcf\x00\x0f\xd0\x08\x10(\x04\x10*\x04\x10+\x04\x10-\x01\x10.\x03'
+    b'\x101\x04\x103\x04\x104\x03\x106\x04\x107\x04\x109\x04\x10:\x04\x10<\x04'
+    b'\x10C\x04\x10D\x02\x10E\x04\x10F\x02\x10H\x01\x10I\x04\x10L\x04\x10M\x04'
+    b'\x10N\x04\x10O\x04\x10Q\x04\x10R\x04\x10T\x04\x10U\x04\x10V\x04\x10W\x04'
+    b'\x10_\x04\x10`\x04\x10c\x01\x10h\x04\x10i\x04\x10l\x04\x10n\x04\x10o\x04'
+    b'\x10q\x04\x10r\x04\x10{\x08\x10|\x02\x10~\x08\x10\x7f\x01\x10\x84\x08\x10\x85\x03'
+    b'\x10\x87\x08\x10\x88\x01\x10\x8d\x08\x10\x95\x00\x10\x96\x08\x10\x97\x02\x10\x99\x08\x10\x9a\x01'
+    b'\x10\x9e\x08\x10\x9f\x08\x10\xa0\x08\x10\xa2\x08\x10\xa3\x01\x10\xa7\x00\x10\xa8\x08\x10\xb0\x00'
+    b'\x10\xb1\x08\x10\xb4\x08\x10\xb9\x00\x10\xba\x08\x10\xbd\x08\x10\xc2\x00\x10\xc3\x08\x10\xca\x08'
+    b'\x10\xcc\x08\x10\xcd\x02\x10\xcf\x01\x10\xd0\x08\x10\xd3\x08\x10\xd5\x03\x10\xd6\x08\x10\xe5\x08'
+    b'\x10\xe6\x02\x10\xe7\x02\x10\xe8\x02\x10\xea\x01\x10\xeb\x08\x10\xee\x08\x10\xef\x00\x10\xf0\x08'
+    b'\x10\xf1\x08\x138\x04\x139\x04\x13:\x04\x13<\x01\x13=\x04\x13@\x04\x13B\x04'
+    b'\x13C\x04\x13F\x04\x13I\x04\x13\x89\x00\x13\x8a\x08\x13\x8b\x02\x13\x8d\x06\x13\x8e\x06'
+    b'\x13\x91\x06\x13\x93\x06\x13\x94\x06\x13\x97\x06\x13\x9a\x06\x15\xdf\x04\x15\xe0\x04\x15\xe3\x04'
+    b'\x15\xe5\x04\x15\xe6\x04\x15\xe8\x03\x15\xe9\x04\x15\xeb\x03\x15\xec\x08\x15\xee\x03\x15\xfe\x04'
+    b'\x16\x01\x04\x16\x04\x04\x16\x07\x08\x16\x1a\x04\x16\x1b\x04\x16\x1c\x04\x16\x1e\x04\x16\x1f\x04'
+    b'\x16!\x04\x16"\x04\x16#\x04\x16$\x04\x169\x08\x16:\x08\x16<\x08\x16=\x08'
+    b'\x16?\x08\x16U\x08\x16X\x08\x16o\x08\x16p\x08\x16r\x08\x16s\x08\x16t\x00'
+    b'\x16u\x08\x16\x81\x01\x16\x82\x08\x16\x85\x08\x16\x8a\x03\x16\x8b\x08\x16\x8d\x03\x16\x8e\x08'
+    b'\x16\xa0\x08\x16\xa6\x08\x16\xa9\x08\x18\xc1\x04\x18\xc2\x04\x18\xc4\x04\x18\xc5\x04\x18\xc7\x04'
+    b'\x18\xdf\x04\x18\xe0\x04\x18\xe2\x04\x18\xfc\x04\x18\xfd\x04\x19\x12\x08\x19\x13\x08\x19\x15\x08'
+    b'\x19\x16\x08\x19\x18\x08\x190\x08\x191\x08\x193\x08\x19M\x00\x19N\x08\x1c\x84\x04'
+    b'\x1c\x85\x04\x1c\x88\x04\x1c\x8a\x04\x1c\x8b\x04\x1c\x8e\x07\x1c\x91\x07\x1c\xa3\x04\x1c\xa6\x04'
+    b'\x1c\xa9\x07\x1c\xac\x07\x1c\xc0\x04\x1c\xc1\x04\x1c\xc3\x04\x1c\xc4\x07\x1c\xc6\x04\x1c\xc7\x07'
+    b'\x1c\xc9\x04\x1c\xdf\x07\x1c\xe2\x07\x1c\xfa\x07\x1c\xfd\x07\x1d\x15\x07\x1d\x18\x07\x1d&\x01'
+    b"\x1d'\x07\x1d*\x05\x1d,\x03\x1d-\x07\x1d0\x07\x1d3\x07\x1dE\x07\x1dH\x05"
+    b'\x1dK\x07\x1dN\x07\x1db\x05\x1dc\x05\x1de\x07\x1df\x07\x1dh\x07\x1di\x07'
+    b'\x1dk\x07\x1d\x9c\x04\x1d\x9f\x04\x1d\xb6\x04\x1d\xb7\x07\x1d\xb9\x04\x1d\xba\x07\x1d\xbc\x04'
+    b'\x1e\x08\x07\x1e\x0b\x07\x1e>\x07\x1eA\x07\x1eX\x07\x1eY\x07\x1e[\x07\x1e\\\x07'
+    b'\x1e^\x07\x1e\xa0\x04\x1e\xa1\x04\x1e\xa4\x04\x1e\xa6\x04\x1e\xa7\x04\x1e\xaa\x07\x1e\xad\x07'
+    b'\x1e\xfb\x07\x1e\xfe\x07\x1ff\x04\x1fg\x04\x1fi\x04\x1fj\x04\x1fl\x04\x1f\x84\x04'
+    b'\x1f\x85\x04\x1f\x87\x04\x1f\xa2\x04\x1f\xb8\x03\x1f\xbb\x07\x1f\xd6\x07 Z\x04 \\\x04'
+    b' ]\x04 _\x04 t\x04 u\x04 w\x04 x\x04 z\x04 \x8f\x04'
+    b' \x92\x04 \x95\x04 \xab\x03 \xae\x07!D\x03!G\x03!I\x04!J\x03'
+    b'!M\x04!P\x04!R\x04!_\x04!b\x04!d\x04!e\x04!h\x04'
+    b'!j\x04!k\x04!m\x04!\x7f\x04!\x82\x04!\x85\x04!\x88\x04!\x95\x03'
+    b'!\x98\x07!\x9b\x03!\x9e\x01!\xa1\x07!\xb0\x01!\xb3\x07!\xb6\x07!\xb9\x01'
+    b'!\xbc\x07!\xe6\x03!\xe9\x03!\xeb\x07!\xec\x03"\x01\x07"\x04\x07"\x06\x07'
+    b'"\x07\x07(\xe5\x04(\xe8\x04)\x02\x04)\x03\x04)\x05\x04) \x04)6\x03'
+    b')\xd2\x04)\xd5\x03)\xd8\x04)\xdb\x04)\xed\x04)\xef\x04)\xf0\x04)\xf3\x04'
+    b')\xf6\x04)\xf8\x04*\n\x04*\x10\x04*\x13\x04*&\x03*)\x01*D\x01'
+    b'*t\x03*w\x03/\xbc\x04/\xbd\x04/\xc0\x04/\xc3\x040\x11\x012c\x04'
+    b'2f\x042\x81\x042\x9e\x042\xb4\x032\xb7\x039\x08\x049\x0b\x049&\x04'
+    b'9Y\x019\\\x079w\x05:\x16\x04:\x19\x04B\xa4\x04'
+)
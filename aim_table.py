@@ -0,0 +1,93 @@
+"""
+Calibrated aim for each board cell.
+
+Stores the theta/phi stepper positions (in steps) that landed a ball in each of the 9 cells. The table lives on
+the Pico flash as 9 little-endian int16 pairs (36 bytes) and is loaded once at startup, so aiming at a cell is
+a single array lookup. Each cell is written in place, recalibrating one cell leaves the others untouched.
+
+record() only changes the table in RAM, as it is called while a shot is being scored. commit(), called from an
+idle tick of the main loop, writes the cells recorded since the last commit: a flash write stalls the Pico's
+code fetch, and the step train and beam timing with it.
+"""
+
+import array
+
+AIM_FILE = "aim.bin"
+
+UNSET = -32768  # marks a cell that has not been calibrated yet
+
+_CELL_SIZE = 4  # bytes per cell: theta, phi as int16
+
+
+class AimTable:
+
+    def __init__(self, path=AIM_FILE):
+        self.path = path
+        self.steps = array.array("h", [UNSET] * 18)  # theta, phi interleaved per cell
+        self.dirty = 0  # bit per cell recorded but not yet on flash
+        self.writes = 0
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "rb") as f:
+                f.readinto(self.steps)
+        except OSError:
+            pass  # nothing calibrated yet
+
+    def is_calibrated(self, cell):
+        return self.steps[cell * 2] != UNSET
+
+    def get(self, cell):
+        """
+        :param cell: board cell 0..8
+        :return: tuple of (theta steps, phi steps) or None if the cell is not calibrated
+        """
+        if self.steps[cell * 2] == UNSET:
+            return None
+        return self.steps[cell * 2], self.steps[cell * 2 + 1]
+
+    def record(self, cell, theta, phi):
+        """
+        Store the stepper position that hit a cell, commit() writes it to flash.
+        """
+        if self.steps[cell * 2] == theta and self.steps[cell * 2 + 1] == phi:
+            return
+
+        self.steps[cell * 2] = theta
+        self.steps[cell * 2 + 1] = phi
+        self.dirty |= 1 << cell
+
+    def commit(self):
+        """
+        Write the cells recorded since the last commit back to flash, each in place.
+
+        :return: True if the file was written
+        """
+        if not self.dirty:
+            return False
+
+        try:
+            f = open(self.path, "r+b")
+        except OSError:
+            # first calibration, write out the whole table
+            with open(self.path, "wb") as f:
+                f.write(self.steps)
+        else:
+            with f:
+                for cell in range(9):
+                    if self.dirty >> cell & 1:
+                        f.seek(cell * _CELL_SIZE)
+                        f.write(memoryview(self.steps)[cell * 2:cell * 2 + 2])
+        self.dirty = 0
+        self.writes += 1
+        return True
+
+    def clear(self, cell=None):
+        # from the REPL, written straight away
+        if cell is None:
+            for i in range(9):
+                self.record(i, UNSET, UNSET)
+        else:
+            self.record(cell, UNSET, UNSET)
+        self.commit()
@@ -0,0 +1,238 @@
+"""
+Pre-rendered matrix messages and LED animation frames, in one file on flash.
+
+Every message used to be rendered into a new buffer the first time it was shown, and the menu animation computed
+its gradients every LED tick. `python assets.py`, on the host from the repo root like ai.py, renders them all once
+into assets.bin, which goes on the Pico next to main.py. The messages are found in main.py's disp_*_message calls,
+the animations are listed in ANIMATIONS.
+
+    header   MAGIC, VERSION, asset count, longest name, widest message (in columns), 16 bytes
+    index    an entry per asset, sorted by key: key, data offset, data bytes, width, name length, kind, 16 bytes
+    data     per asset its name, then its data
+
+A message's data is its column bytes as font.render writes them and its width is its columns. An animation's
+data is its frames one after the other, each `width` little-endian 0xRRGGBB words, so a frame reads straight
+into a Compositor layer.
+
+Opening the pack reads the header only. locate() binary searches the index on flash, an entry read at a time,
+and checks the name, readinto() reads an asset's data into the caller's buffer. So RAM and startup time don't
+grow with the number of assets, only with the widest message, and nothing allocates after the pack is open:
+
+    assets = AssetPack()
+    offset = assets.locate("P1 GO!", KIND_TEXT)
+    if offset >= 0:
+        assets.readinto(offset, buf)  # assets.width columns
+
+A missing or out of date pack locates nothing, the callers render at runtime then.
+"""
+
+ASSET_FILE = "assets.bin"
+
+MAGIC = b"TTTA"
+VERSION = 1
+HEADER_SIZE = 16
+ENTRY_SIZE = 16
+
+KIND_TEXT = 0
+KIND_FRAMES = 1
+
+MENU_GRADIENT = "menu_gradient"
+MENU_LEDS = 9  # pixels of each strip the menu animation covers
+
+MESSAGE_SOURCES = ("main.py",)
+MESSAGE_CALLS = ("disp_static_message", "disp_scrolling_message", "disp_flashing_message")
+
+
+def name_key(name):
+    # 24 bit hash of a name, every step stays a small int on the Pico
+    h = 0
+    for ch in name:
+        h = ((h << 5) & 0xFFFFFF | h >> 19) ^ ord(ch)
+    return h
+
+
+def _u32(buf, i):
+    return buf[i] | buf[i + 1] << 8 | buf[i + 2] << 16 | buf[i + 3] << 24
+
+
+def _u16(buf, i):
+    return buf[i] | buf[i + 1] << 8
+
+
+class AssetPack:
+
+    def __init__(self, path=ASSET_FILE):
+        self.path = path
+        self.file = None
+        self.count = 0
+        self.max_name = 0
+        self.max_columns = 0  # the widest message, the buffer a message is read into needs this many bytes
+        self.entry = bytearray(ENTRY_SIZE)
+        self.name = None
+
+        # the asset last located
+        self.size = 0  # bytes of data
+        self.width = 0  # a message's columns, an animation's pixels per frame
+
+        self.lookups = 0
+        self.hits = 0
+        self.reads = 0
+        self.open()
+
+    def open(self):
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return  # no pack, everything is rendered at runtime
+        header = bytearray(HEADER_SIZE)
+        if f.readinto(header) != HEADER_SIZE or header[:4] != MAGIC or _u16(header, 4) != VERSION:
+            f.close()
+            return
+        self.file = f
+        self.count = _u16(header, 6)
+        self.max_name = _u16(header, 8)
+        self.max_columns = _u16(header, 10)
+        self.name = bytearray(self.max_name)
+
+    def locate(self, name, kind):
+        """
+        :param name: a message's text or an animation's name
+        :param kind: KIND_TEXT or KIND_FRAMES
+        :return: offset of the asset's data for readinto(), -1 if the pack doesn't have it. size and width are
+        the asset's after a hit
+        """
+        self.lookups = (self.lookups + 1) & 0x3FFFFFFF
+        f = self.file
+        if f is None:
+            return -1
+        key = name_key(name)
+        entry = self.entry
+        lo = 0
+        hi = self.count - 1
+        while lo <= hi:
+            mid = (lo + hi) >> 1
+            f.seek(HEADER_SIZE + mid * ENTRY_SIZE)
+            f.readinto(entry)
+            found = _u32(entry, 0)
+            if found < key:
+                lo = mid + 1
+            elif found > key:
+                hi = mid - 1
+            else:
+                break
+        else:
+            return -1
+
+        # keys are unique in a pack, the name tells a hit from another name with the same key
+        length = entry[14]
+        if entry[15] != kind or length != len(name):
+            return -1
+        offset = _u32(entry, 4)
+        f.seek(offset)
+        f.readinto(self.name)
+        for i in range(length):
+            if self.name[i] != ord(name[i]):
+                return -1
+        self.size = _u32(entry, 8)
+        self.width = _u16(entry, 12)
+        self.hits = (self.hits + 1) & 0x3FFFFFFF
+        return offset + length
+
+    def readinto(self, offset, buf):
+        """
+        Read data from offset on into buf, as much as buf holds.
+
+        :return: bytes read
+        """
+        f = self.file
+        f.seek(offset)
+        self.reads = (self.reads + 1) & 0x3FFFFFFF
+        return f.readinto(buf)
+
+
+# ----------------------------------------- BUILD ----------------------------------------- #
+# host only from here on
+
+
+def messages(sources=MESSAGE_SOURCES):
+    """
+    :return: every string literal passed to LEDMatrix's disp_*_message calls in the sources, both sides of
+    a conditional included. a message built at runtime isn't found, it's rendered when shown
+    """
+    import ast
+    found = []
+    for source in sources:
+        with open(source) as f:
+            tree = ast.parse(f.read(), source)
+        for node in ast.walk(tree):
+            if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and node.func.attr in MESSAGE_CALLS and node.args):
+                for arg in ast.walk(node.args[0]):
+                    if isinstance(arg, ast.Constant) and isinstance(arg.value, str) and arg.value not in found:
+                        found.append(arg.value)
+    return found
+
+
+def menu_gradient():
+    # a frame per pair of led_compositor.PRIMARIES, frame left << 3 | right, as the menu picks them
+    import array
+    from led_compositor import Compositor, LAYER_BACKGROUND, PRIMARIES
+
+    class Strip:
+        num_leds = MENU_LEDS
+
+    layers = Compositor(Strip())
+    frames = array.array("I")
+    for left in PRIMARIES:
+        for right in PRIMARIES:
+            layers.gradient(LAYER_BACKGROUND, 0, MENU_LEDS - 1, left, right)
+            frames.extend(layers.colors[:MENU_LEDS])
+    return MENU_LEDS, frames
+
+
+ANIMATIONS = ((MENU_GRADIENT, menu_gradient),)
+
+
+def build(path=ASSET_FILE, sources=MESSAGE_SOURCES):
+    import os
+    import struct
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "sim"))  # framebuf, for font
+    import font
+
+    assets = []  # (key, name, kind, width, data)
+    for text in messages(sources):
+        data = bytearray(max(font.text_width(text), 1))
+        font.render(text, data)
+        assets.append((name_key(text), text, KIND_TEXT, font.text_width(text), bytes(data)))
+    for name, frames in ANIMATIONS:
+        width, data = frames()
+        if sys.byteorder != "little":
+            data.byteswap()
+        assets.append((name_key(name), name, KIND_FRAMES, width, data.tobytes()))
+    assets.sort()
+
+    for i in range(1, len(assets)):
+        if assets[i][0] == assets[i - 1][0]:
+            raise ValueError("{!r} and {!r} have the same key".format(assets[i - 1][1], assets[i][1]))
+    for _, name, _, _, _ in assets:
+        if len(name) > 255 or not name.isascii():
+            raise ValueError("{!r} can't be a name".format(name))
+
+    max_name = max(len(name) for _, name, _, _, _ in assets)
+    max_columns = max([width for _, _, kind, width, _ in assets if kind == KIND_TEXT] or [0])
+    header = struct.pack("<4sHHHH4x", MAGIC, VERSION, len(assets), max_name, max_columns)
+    index = bytearray()
+    blob = bytearray()
+    offset = HEADER_SIZE + ENTRY_SIZE * len(assets)
+    for key, name, kind, width, data in assets:
+        index += struct.pack("<IIIHBB", key, offset + len(blob), len(data), width, len(name), kind)
+        blob += name.encode() + data
+    with open(path, "wb") as f:
+        f.write(header + index + blob)
+    return len(assets), len(header) + len(index) + len(blob)
+
+
+if __name__ == "__main__":
+    count, size = build()
+    print("{} assets, {} bytes in {}".format(count, size, ASSET_FILE))
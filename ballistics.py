@@ -0,0 +1,223 @@
+"""
+Ballistic model of the solenoid launcher.
+
+The ball leaves the launcher at a fixed muzzle velocity from `launch_height` above the landing zone and flies
+under gravity and quadratic air drag. Theta is the elevation in degrees (0 = level, 90 = straight up), phi is
+the azimuth in degrees (0 = towards the centre column of the landing zone).
+
+Since the launcher is a mortar, the high arc is used. Range only depends on theta, so the solver sweeps the
+high-arc elevations once and inverts that into a range-indexed cache. Aiming at a point is then an atan2 and a
+linear interpolation into the cache, no iterative solve is run at runtime.
+
+Building the cache takes a couple of hundred trajectory simulations, seconds of float maths on the Pico, so for
+the default launcher it is built on the host by running `python ballistics.py`, which writes
+ballistics_table.py. A model with other parameters, or without the table, builds its cache when created.
+"""
+
+import array
+import math
+
+try:
+    from ballistics_table import PARAMS, MAX_RANGE_THETA, CACHE_MIN, CACHE_STEP, CACHE
+except ImportError:
+    PARAMS = None  # table not generated yet, the cache is built at runtime
+
+GRAVITY = 9.81  # m/s^2
+AIR_DENSITY = 1.2  # kg/m^3
+
+BALL_MASS = 0.0027  # kg, regulation ping pong ball
+BALL_DIAMETER = 0.040  # m
+BALL_DRAG_COEFF = 0.5
+
+
+class Ballistics:
+
+    def __init__(self, muzzle_velocity=5.0, launch_height=0.3, lz_distance=1.5, cell_pitch=0.15,
+                 cache_size=64, dt=0.002):
+        """
+        :param muzzle_velocity: ball speed leaving the launcher in m/s
+        :param launch_height: launcher muzzle height above the landing zone in m
+        :param lz_distance: distance from the launcher to the centre cell in m
+        :param cell_pitch: distance between neighbouring cell centres in m
+        :param cache_size: number of range entries in the aim cache
+        :param dt: simulation time step in s
+        """
+        self.muzzle_velocity = muzzle_velocity
+        self.launch_height = launch_height
+        self.lz_distance = lz_distance
+        self.cell_pitch = cell_pitch
+        self.dt = dt
+
+        area = math.pi * (BALL_DIAMETER / 2) ** 2
+        self.drag_k = 0.5 * AIR_DENSITY * BALL_DRAG_COEFF * area / BALL_MASS
+
+        self.cache_size = cache_size
+        if PARAMS == (muzzle_velocity, launch_height, lz_distance, cell_pitch, cache_size, dt):
+            self.cache = array.array("f", bytearray(CACHE))  # theta for evenly spaced ranges
+            self.cache_min = CACHE_MIN
+            self.cache_step = CACHE_STEP
+            self._max_range_theta = MAX_RANGE_THETA
+        else:
+            self.cache = array.array("f", [0] * cache_size)
+            self.cache_min = 0
+            self.cache_step = 1
+            self._max_range_theta = 45.0
+            self.build_cache()
+
+    # ----------------------------------------- MODEL ----------------------------------------- #
+
+    def simulate(self, theta):
+        """
+        Fly a ball launched at elevation theta.
+
+        :return: horizontal distance travelled when the ball is back at landing zone height, in m
+        """
+        rad = math.radians(theta)
+        vx = self.muzzle_velocity * math.cos(rad)
+        vz = self.muzzle_velocity * math.sin(rad)
+        x = 0.0
+        z = self.launch_height
+        dt = self.dt
+        k = self.drag_k
+
+        while True:
+            v = math.sqrt(vx * vx + vz * vz)
+            vx -= k * v * vx * dt
+            vz -= (GRAVITY + k * v * vz) * dt
+            last_x = x
+            last_z = z
+            x += vx * dt
+            z += vz * dt
+            if z <= 0 and vz < 0:
+                # interpolate the crossing within the last step
+                return last_x + (x - last_x) * last_z / (last_z - z)
+
+    def solve(self, distance, iterations=30):
+        """
+        Find the high-arc elevation landing at `distance` by bisection. Too slow for the main loop, this is the
+        reference the cache is checked against.
+
+        :return: theta in degrees, or None if the distance is out of reach
+        """
+        lo = self._max_range_theta
+        hi = 89.9
+        if not self.simulate(hi) <= distance <= self.simulate(lo):
+            return None
+
+        # range falls as theta rises on the high arc
+        for _ in range(iterations):
+            mid = (lo + hi) / 2
+            if self.simulate(mid) > distance:
+                lo = mid
+            else:
+                hi = mid
+        return (lo + hi) / 2
+
+    # ----------------------------------------- CACHE ----------------------------------------- #
+
+    def build_cache(self, sweep_step=0.5):
+        # find the elevation with the longest range, the high arc is everything above it
+        best_theta = 45.0
+        best_range = 0
+        theta = 20.0
+        while theta < 70:
+            r = self.simulate(theta)
+            if r > best_range:
+                best_range = r
+                best_theta = theta
+            theta += sweep_step
+        self._max_range_theta = best_theta
+
+        # sweep the high arc, ranges come out in decreasing order
+        thetas = []
+        ranges = []
+        theta = best_theta
+        while theta < 89.9:
+            thetas.append(theta)
+            ranges.append(self.simulate(theta))
+            theta += sweep_step
+
+        # only cache around the landing zone, theta changes fast with range near the apex and straight up
+        near = max(ranges[-1], self.lz_distance - 3 * self.cell_pitch)
+        far = min(ranges[0], self.lz_distance + 3 * self.cell_pitch)
+        self.cache_min = near
+        self.cache_step = (far - near) / (self.cache_size - 1)
+
+        # invert into evenly spaced ranges
+        j = len(ranges) - 1
+        for i in range(self.cache_size):
+            r = self.cache_min + i * self.cache_step
+            while j > 0 and ranges[j - 1] < r:
+                j -= 1
+            if j == 0:
+                self.cache[i] = thetas[0]
+            else:
+                r_hi = ranges[j - 1]
+                r_lo = ranges[j]
+                frac = (r - r_lo) / (r_hi - r_lo) if r_hi != r_lo else 0
+                self.cache[i] = thetas[j] + (thetas[j - 1] - thetas[j]) * frac
+
+    def theta_for(self, distance):
+        """
+        :return: cached high-arc elevation for a distance, clamped to the cached range
+        """
+        pos = (distance - self.cache_min) / self.cache_step
+        if pos <= 0:
+            return self.cache[0]
+        if pos >= self.cache_size - 1:
+            return self.cache[self.cache_size - 1]
+        idx = int(pos)
+        frac = pos - idx
+        return self.cache[idx] + (self.cache[idx + 1] - self.cache[idx]) * frac
+
+    # ----------------------------------------- AIMING ----------------------------------------- #
+
+    def aim(self, x, y):
+        """
+        :param x: distance forward from the launcher in m
+        :param y: distance to the right of the launcher in m
+        :return: tuple of (theta, phi) in degrees
+        """
+        return self.theta_for(math.sqrt(x * x + y * y)), math.degrees(math.atan2(y, x))
+
+    def cell_position(self, cell):
+        """
+        Landing zone coordinate of a board cell. Row 0 of the board is the far row, column 0 the left column.
+        """
+        row = cell // 3
+        col = cell % 3
+        return self.lz_distance + (1 - row) * self.cell_pitch, (col - 1) * self.cell_pitch
+
+    def aim_cell(self, cell):
+        x, y = self.cell_position(cell)
+        return self.aim(x, y)
+
+
+def write_table(path="ballistics_table.py"):
+    import sys
+    global PARAMS
+    PARAMS = None  # build the cache, don't load the one being replaced
+    model = Ballistics()
+    params = (model.muzzle_velocity, model.launch_height, model.lz_distance, model.cell_pitch, model.cache_size,
+              model.dt)
+
+    cache = array.array("f", model.cache)
+    if sys.byteorder != "little":
+        cache.byteswap()
+    blob = cache.tobytes()
+    with open(path, "w") as f:
+        f.write('"""\nGenerated by ballistics.py - do not edit.\n\n{} ranges, {:.3f}..{:.3f} m.\n"""\n\n'.format(
+            model.cache_size, model.cache_min, model.cache_min + model.cache_step * (model.cache_size - 1)))
+        f.write("PARAMS = {!r}  # muzzle_velocity, launch_height, lz_distance, cell_pitch, cache_size, dt\n".format(
+            params))
+        f.write("MAX_RANGE_THETA = {!r}\n".format(model._max_range_theta))
+        f.write("CACHE_MIN = {!r}\n".format(model.cache_min))
+        f.write("CACHE_STEP = {!r}\n".format(model.cache_step))
+        f.write("CACHE = (  # little-endian float32 thetas\n")
+        for i in range(0, len(blob), 24):
+            f.write("    {!r}\n".format(blob[i:i + 24]))
+        f.write(")\n")
+
+
+if __name__ == "__main__":
+    write_table()
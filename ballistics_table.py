@@ -0,0 +1,23 @@
+"""
+Generated by ballistics.py - do not edit.
+
+64 ranges, 1.050..1.950 m.
+"""
+
+PARAMS = (5.0, 0.3, 1.5, 0.15, 64, 0.002)  # muzzle_velocity, launch_height, lz_distance, cell_pitch, cache_size, dt
+MAX_RANGE_THETA = 39.5
+CACHE_MIN = 1.05
+CACHE_STEP = 0.014285714285714284
+CACHE = (  # little-endian float32 thetas
+    b'sI\x96Bb\xd6\x95B\x92b\x95B\x93\xee\x94B\x8cy\x94B\x84\x04\x94B'
+    b'E\x8e\x93B\xf9\x17\x93B\xa0\xa0\x92B\x02)\x92B~\xb0\x91B\x807\x91B'
+    b'\xbd\xbd\x90BQC\x90B9\xc8\x8fBPL\x8fB\xce\xcf\x8eBYR\x8eB'
+    b'U\xd4\x8dBCU\x8dB\xa3\xd5\x8cB\xe3T\x8cB\x8a\xd3\x8bB\tQ\x8bB'
+    b'\xd7\xcd\x8aB\x84I\x8aBZ\xc4\x89B$>\x89B\xdc\xb6\x88B\xa8.\x88B'
+    b'\x1b\xa5\x87B\xdb\x1a\x87B\xdf\x8e\x86Bx\x02\x86B\xdfs\x85B\xcb\xe4\x84B'
+    b'\xd2S\x84B\xd2\xc1\x83Bj.\x83BC\x99\x82BN\x03\x82B\xc3j\x81B'
+    b'S\xd1\x80B\xee5\x80BJ1\x7fB\x80\xf4}B\xda\xb1|BUl{B'
+    b'L#zBQ\xd4xB\x0f\x82wBc+vBJ\xcetB\x16msB'
+    b'U\x07rB\xa3\x99pB\xd5&oB\x89\xaemB(/lBu\xa7jB'
+    b'\xd8\x18iB\xbf\x82gB\x8a\xe4eB\xd5;dB'
+)
@@ -0,0 +1,103 @@
+"""
+Ballistic model benchmark. Run on the host from the repo root:
+
+    python bench/bench_ballistics.py [aim.bin]
+
+Reports the model's aim error against the calibrated aim table, the cache error against the exact solver, whether
+ballistics_table.py matches a freshly built cache, and aim lookups per second. Without a calibration file the calibration is synthesised from a model with slightly
+different launch parameters, quantised to whole steps the way the real table is.
+"""
+
+import array
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aim_table import AimTable, UNSET
+import ballistics
+from ballistics import Ballistics
+from step_convert import deg_to_steps, steps_to_deg
+
+
+def load_calibration(path):
+    table = AimTable(path)
+    if any(table.is_calibrated(cell) for cell in range(9)):
+        return table, path
+
+    true_model = Ballistics(muzzle_velocity=5.15, launch_height=0.32)
+    table = AimTable("/nonexistent/aim.bin")
+    for cell in range(9):
+        theta, phi = true_model.aim_cell(cell)
+        table.steps[cell * 2] = deg_to_steps(theta)
+        table.steps[cell * 2 + 1] = deg_to_steps(phi)
+    return table, "synthetic (v0 +3%, height +2 cm)"
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "aim.bin"
+    model = Ballistics()
+    table, source = load_calibration(path)
+
+    print("calibration:", source)
+    print("cell  theta cal  theta model  err    phi cal  phi model  err")
+    worst_theta = 0
+    worst_phi = 0
+    for cell in range(9):
+        aim = table.get(cell)
+        if aim is None or aim[0] == UNSET:
+            print("{:4}  not calibrated".format(cell))
+            continue
+        cal_theta = steps_to_deg(aim[0])
+        cal_phi = steps_to_deg(aim[1])
+        theta, phi = model.aim_cell(cell)
+        worst_theta = max(worst_theta, abs(theta - cal_theta))
+        worst_phi = max(worst_phi, abs(phi - cal_phi))
+        print("{:4}  {:9.3f}  {:11.3f}  {:5.2f}  {:7.3f}  {:9.3f}  {:5.2f}".format(
+            cell, cal_theta, theta, theta - cal_theta, cal_phi, phi, phi - cal_phi))
+    print("worst error: theta {:.3f} deg, phi {:.3f} deg".format(worst_theta, worst_phi))
+
+    # cache against the exact bisection solve over the whole cached range
+    worst_cache = 0
+    samples = 200
+    lo = model.cache_min
+    hi = model.cache_min + model.cache_step * (model.cache_size - 1)
+    for i in range(samples):
+        distance = lo + (hi - lo) * (i + 0.5) / samples
+        exact = model.solve(distance)
+        if exact is not None:
+            worst_cache = max(worst_cache, abs(model.theta_for(distance) - exact))
+    print("cache vs solver worst error: {:.4f} deg over {:.2f}..{:.2f} m".format(worst_cache, lo, hi))
+
+    # the shipped cache against one built now, they differ if ballistics.py changed and the table wasn't rewritten
+    if ballistics.PARAMS is None:
+        print("cache table: not generated, run python ballistics.py")
+    else:
+        shipped = (array.array("f", model.cache), model.cache_min, model.cache_step)
+        start = time.perf_counter()
+        model.build_cache()
+        build_ms = (time.perf_counter() - start) * 1000
+        same = shipped == (model.cache, model.cache_min, model.cache_step)
+        print("cache table: {}, built here in {:.1f} ms".format(
+            "matches" if same else "STALE, run python ballistics.py", build_ms))
+        if not same:
+            sys.exit(1)
+
+    n = 100000
+    start = time.perf_counter()
+    for i in range(n):
+        model.aim_cell(i % 9)
+    elapsed = time.perf_counter() - start
+    print("cached aim: {:,.0f} lookups/s".format(n / elapsed))
+
+    n = 20
+    start = time.perf_counter()
+    for i in range(n):
+        model.solve(model.lz_distance + (i % 3 - 1) * model.cell_pitch)
+    elapsed = time.perf_counter() - start
+    print("iterative solve: {:,.1f} solves/s".format(n / elapsed))
+
+
+if __name__ == "__main__":
+    main()
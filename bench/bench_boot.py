@@ -0,0 +1,90 @@
+"""
+Boot timeline under the simulator. Run on the host from the repo root:
+
+    python bench/bench_boot.py [--runs 20] [--budget-ms 50]
+
+Boots MainProgram on a fresh simulated board, re-importing the firmware each time, and runs the first update.
+The clock follows the host, so the per-stage times are host times: they show where boot goes and catch
+regressions, not what the Pico takes. Bus traffic per boot is exact. With --budget-ms, exits 1 if the median
+time to the end of the first update is over budget.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sim"))
+
+import simulator
+
+clock = simulator.install()
+
+
+def purge_firmware():
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None) or ""
+        if os.path.dirname(os.path.abspath(path)) == simulator.REPO_DIR:
+            del sys.modules[name]
+
+
+def boot_once():
+    purge_firmware()
+    board = simulator.Board(matrix_model=False)
+    clock._base_ns = time.perf_counter_ns()  # tick 0, the reset
+
+    import main
+    program = main.MainProgram()
+    program.update(0)
+
+    boot = program.boot
+    stages = [(boot.names[i], boot.duration_us(i)) for i in range(len(boot.names))]
+
+    start = time.perf_counter()
+    program.load_aim_model()
+    deferred_us = (time.perf_counter() - start) * 1e6
+
+    traffic = {}
+    for name, stats in board.bus_stats().items():
+        for key, value in stats.items():
+            if value:
+                traffic["{}_{}".format(name, key)] = value
+    return stages, boot.total_us(), deferred_us, traffic
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Boot timeline under the simulator")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, help="fail if time to first update is over this")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="launcher-boot-"))
+    clock.realtime = True
+
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    results = [boot_once() for _ in range(args.runs)]
+    sys.stdout = stdout
+
+    def median(values):
+        values = sorted(values)
+        return values[len(values) // 2]
+
+    names = [name for name, _ in results[0][0]]
+    print("stage          median us")
+    for i, name in enumerate(names):
+        print("{:14} {:9.0f}".format(name, median(r[0][i][1] for r in results)))
+    total_ms = median(r[1] for r in results) / 1000
+    print("{:14} {:9.0f}".format("interactive", total_ms * 1000))
+    print("{:14} {:9.0f}  (deferred to the menu)".format("aim model", median(r[2] for r in results)))
+    print("bus traffic to first update:", ", ".join(
+        "{} {}".format(k, v) for k, v in sorted(results[-1][3].items())))
+
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print("OVER BUDGET: {:.2f} ms to first update, budget {:.2f} ms".format(total_ms, args.budget_ms))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
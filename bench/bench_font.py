@@ -0,0 +1,92 @@
+"""
+Proportional font against framebuf's fixed 8x8 font for the firmware's messages. Run on the host from the repo
+root:
+
+    python bench/bench_font.py
+
+For every message: its width in columns in both fonts, how long one pass of the scroll takes at the default
+scroll speed, and the SPI bytes that pass sends to the matrix (from the simulated bus, scrolling the message
+through LEDMatrix end to end). Also times rendering a message against fetching it from the cache.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sim"))
+
+import simulator
+
+simulator.install()
+
+MESSAGES = (
+    "Welcome To Tic-Tac-Toe Mortar Launcher! PRESS RED BUTTON TO CONTINUE!",
+    "SELECT GAME MODE!",
+    "AUTO MODE SELECTED",
+    "MANUAL MODE SELECTED",
+    "PRESS ANY BUTTON TO PLAY AGAIN!",
+    "P1 SCORE!",
+    "P2 WINS!",
+    "BOOM!",
+)
+
+
+def scroll_pass(board, display, message, columns):
+    # ms and SPI bytes for one pass, from the first frame until the message has left the display
+    display.reset_disp()
+    display.cur_message = ""
+    display.disp_scrolling_message(message)
+    display.column = columns
+    board.reset_bus_stats()
+    ticks = 0
+    frames = 0
+    while display.buf_x > -display.column:
+        display.update(ticks)
+        ticks += display.scroll_speed
+        frames += 1
+    return frames * display.scroll_speed, board.bus_stats()["spi0"]["bytes"]
+
+
+def main():
+    import font
+    from led_matrix import LEDMatrix
+
+    board = simulator.Board(matrix_model=False)
+    display = LEDMatrix()
+
+    print("{:70} {:>8} {:>8} {:>9} {:>9} {:>9} {:>9}".format(
+        "message", "8x8 col", "prop col", "8x8 ms", "prop ms", "8x8 B", "prop B"))
+    totals = [0, 0, 0, 0]
+    for message in MESSAGES:
+        fixed = len(message) * 8
+        proportional = font.text_width(message)
+        fixed_ms, fixed_bytes = scroll_pass(board, display, message, fixed)
+        prop_ms, prop_bytes = scroll_pass(board, display, message, proportional)
+        print("{:70} {:8} {:8} {:9} {:9} {:9} {:9}".format(
+            message, fixed, proportional, fixed_ms, prop_ms, fixed_bytes, prop_bytes))
+        totals[0] += fixed_ms
+        totals[1] += prop_ms
+        totals[2] += fixed_bytes
+        totals[3] += prop_bytes
+    print("scroll time {:.0%} of the 8x8 font, SPI bytes {:.0%}".format(totals[1] / totals[0],
+                                                                      totals[3] / totals[2]))
+
+    n = 2000
+    banner = MESSAGES[0]
+    buf = bytearray(font.text_width(banner))
+    start = time.perf_counter()
+    for _ in range(n):
+        font.render(banner, buf)
+    render_us = (time.perf_counter() - start) / n * 1e6
+
+    cache = font.TextCache()
+    cache.get(banner)
+    start = time.perf_counter()
+    for _ in range(n):
+        cache.get(banner)
+    cached_us = (time.perf_counter() - start) / n * 1e6
+    print("banner render {:.1f} us, from the cache {:.2f} us (host)".format(render_us, cached_us))
+
+
+if __name__ == "__main__":
+    main()
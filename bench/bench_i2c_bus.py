@@ -0,0 +1,183 @@
+"""
+I2C traffic of the expander outputs through the bus arbiter, under the simulator. Run on the host from the repo
+root:
+
+    python bench/bench_i2c_bus.py [--freq 400000]
+
+Plays manual shots (aim, fire, land, score timeout) with the steppers feeding every tick and reports, per tick
+and for the busiest tick, the pin writes queued, the transactions and bytes the arbiter sent and the share of
+the 1 ms tick the bus was busy. The same pin writes are replayed one by one through mcp23017.VirtualPin onto a
+second expander for comparison, the way they were sent before. Then checks on two expanders that a flush sends
+the solenoid before lower priority ports queued ahead of it, that both ports of an expander share one write,
+that a pin set and cleared in one tick sends nothing, that a direction change goes out on its own ahead of the
+step it comes with, and that a send from the solenoid's timer callback leaves a flush's buffer alone. Exits 1
+if a check fails.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sim"))
+
+import simulator
+
+simulator.install()
+
+SHOTS = 3
+SECOND_ADDRESS = 0x21
+
+
+def check(condition, what):
+    if not condition:
+        sys.stdout = sys.__stdout__
+        print("FAIL:", what)
+        sys.exit(1)
+
+
+def bus_us(transactions, nbytes, freq):
+    # 9 clocks a byte, plus start and stop
+    return (nbytes * 9 + transactions * 2) * 1e6 / freq
+
+
+def spy(model, address, log):
+    write = model.write
+
+    def logged(reg, val):
+        log.append((address, reg, val))
+        write(reg, val)
+    model.write = logged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="expander output traffic")
+    parser.add_argument("--freq", type=int, default=400000, help="I2C clock")
+    args = parser.parse_args()
+    os.chdir(tempfile.mkdtemp(prefix="launcher-i2c-"))  # aim.bin and friends stay out of the tree
+
+    import machine
+    import main as firmware
+    import bus_arbiter
+    from devices import MCP23017Model
+    from mcp23017 import MCP23017
+
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+
+    board = simulator.Board()
+    program = board.load_program()
+    program.remote = None
+    runner = simulator.Runner(program)
+    runner.run_ms(50)
+    program.steppers.feed_rate = 1
+
+    # the same pin writes, sent straight through VirtualPin onto a second expander
+    machine.I2C.devices[1] = {SECOND_ADDRESS: MCP23017Model()}
+    direct_bus = machine.I2C(1)
+    direct = MCP23017(direct_bus, SECOND_ADDRESS)
+    bus = program.bus
+    queue = bus.write
+
+    def write(latch, mask, level, priority):
+        queue(latch, mask, level, priority)
+        pin = (8 if latch.port is latch.mcp.portb else 0) + (mask.bit_length() - 1)
+        direct[pin].output(level)
+    bus.write = write
+
+    i2c = machine.I2C.buses[0]
+    i2c.reset_stats()
+    direct_bus.reset_stats()
+    writes_before = bus.writes
+    loops_before = runner.loops
+    worst = (0, 0)
+    for shot in range(SHOTS):
+        program.game_state = firmware.MANUAL_MODE
+        program.steppers.write_theta(30 + 20 * shot)
+        program.steppers.write_phi(-20 + 20 * shot)
+        while not program.steppers.at_goal():
+            before = (i2c.transactions, i2c.bytes)
+            runner.step()
+            tick = (i2c.transactions - before[0], i2c.bytes - before[1])
+            worst = max(worst, tick)
+        program.fire(runner.total_ticks)
+        runner.run_until(lambda: program.game_state == firmware.WAIT_SCORE, 2000)
+        board.break_beam(1)
+        board.break_beam(4)
+        runner.run_ms(20)
+        board.restore_all()
+        runner.run_until(lambda: program.game_state == firmware.MANUAL_MODE, 10000)
+        program.cur_board = [0] * 9
+    check(board.solenoid() == 0, "solenoid off after the shots")
+    writes = bus.writes - writes_before
+    ticks = runner.loops - loops_before
+
+    sys.stdout = stdout
+    print("{} shots, {} ticks, {} pin writes, I2C at {:,} Hz".format(SHOTS, ticks, writes, args.freq))
+    print("{:12} {:>13} {:>12} {:>14} {:>22}".format("", "transactions", "bytes", "bus us/tick", "busiest tick"))
+    for name, t, b, peak in (("arbiter", i2c.transactions, i2c.bytes, worst),
+                             ("VirtualPin", direct_bus.transactions, direct_bus.bytes, None)):
+        busiest = "{} tr, {:.0f} us ({:.1%})".format(peak[0], bus_us(*peak, args.freq),
+                                                    bus_us(*peak, args.freq) / 1000) if peak else ""
+        print("{:12} {:13} {:12} {:14.1f} {:>22}".format(name, t, b, bus_us(t, b, args.freq) / ticks, busiest))
+    print("arbiter counters: {} flushes, {} transactions, {} bytes, {} ports elided".format(
+        bus.flushes, bus.transactions, bus.bytes, bus.elided))
+
+    # priority order and coalescing on two expanders
+    log = []
+    machine.I2C.devices[0][SECOND_ADDRESS] = MCP23017Model()
+    first = MCP23017(machine.I2C(0), simulator.MCP_ADDRESS)
+    second = MCP23017(machine.I2C(0), SECOND_ADDRESS)
+    spy(machine.I2C.devices[0][simulator.MCP_ADDRESS], simulator.MCP_ADDRESS, log)
+    spy(machine.I2C.devices[0][SECOND_ADDRESS], SECOND_ADDRESS, log)
+    arbiter = bus_arbiter.BusArbiter()
+    light = arbiter.pin(second, 12, bus_arbiter.PRIO_LOW)
+    step = arbiter.pin(second, 3, bus_arbiter.PRIO_STEP)
+    direction = arbiter.pin(second, 2, bus_arbiter.PRIO_STEP, setup=True)
+    solenoid = arbiter.pin(first, 0, bus_arbiter.PRIO_SOLENOID)
+    del log[:]
+
+    light(1)
+    step(1)
+    solenoid(1)
+    check(arbiter.flush() == 2, "one transaction per expander")
+    check(log[0][0] == simulator.MCP_ADDRESS, "solenoid sent first")
+    check([entry[:2] for entry in log[1:]] == [(SECOND_ADDRESS, 0x14), (SECOND_ADDRESS, 0x15)],
+          "both ports in one write")
+    check(machine.I2C.devices[0][SECOND_ADDRESS].output(12) == 1, "port B pin set")
+
+    step(0)
+    step(1)
+    check(arbiter.flush() == 0 and arbiter.elided == 1, "set and cleared in a tick sends nothing")
+
+    # a direction change leads the step edge it comes with, a direction alone is one write
+    del log[:]
+    direction(1)
+    step(0)
+    check(arbiter.flush() == 2, "direction and step in two writes")
+    check(log == [(SECOND_ADDRESS, 0x14, 0x0C), (SECOND_ADDRESS, 0x14, 0x04)], "direction sent before the step")
+    direction(0)
+    check(arbiter.flush() == 1, "a direction alone in one write")
+
+    # the solenoid's send lands mid flush, as its soft timer callback can, and keeps off the flush's buffer
+    solenoid.send(0)
+    writeto_mem = machine.I2C(0).__class__.writeto_mem
+    nested = []
+
+    def interrupted(i2c, address, reg, buf):
+        if address == SECOND_ADDRESS and not nested:
+            nested.append(bytes(buf))
+            solenoid.send(1)
+            check(bytes(buf) == nested[0], "the flush's buffer kept through the send")
+        writeto_mem(i2c, address, reg, buf)
+    machine.I2C(0).__class__.writeto_mem = interrupted
+    light(0)
+    arbiter.flush()
+    machine.I2C(0).__class__.writeto_mem = writeto_mem
+    check(nested and machine.I2C.devices[0][SECOND_ADDRESS].output(12) == 0, "flush sent after the send")
+    check(machine.I2C.devices[0][simulator.MCP_ADDRESS].output(0) == 1, "solenoid sent")
+    print("priority order, port coalescing, elided writes, direction setup and send buffers checked")
+
+
+if __name__ == "__main__":
+    main()
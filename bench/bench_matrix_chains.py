@@ -0,0 +1,91 @@
+"""
+MAX7219 refresh cost for longer displays split over several chains. Run on the host from the repo root:
+
+    python bench/bench_matrix_chains.py [--baudrate 1000000]
+
+Builds LEDMatrix on the simulated board with each layout below and reports, per chain, the SPI bus time per
+frame (bytes clocked at the bus's baudrate, from the simulator's per-chain counters) for:
+
+    scroll      a banner scrolling across the whole display, sampled evenly over one pass
+    scoreboard  a static label with a counter on the last 8 modules, only that part changes
+    static      the same frame shown again
+
+each with the dirty tracking and with every chain refreshed in full (invalidated before every show). The CS and
+SPI1 pins are examples, not the launcher PCB's.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sim"))
+
+import simulator
+
+simulator.install()
+
+# name -> led_matrix chain specs (bus, sck, mosi, cs, modules)
+LAYOUTS = (
+    ("8 x1", ((0, 18, 19, 17, 8),)),
+    ("16 x1", ((0, 18, 19, 17, 16),)),
+    ("16 as 8+8", ((0, 18, 19, 17, 8), (1, 10, 11, 13, 8))),
+    ("32 as 4x8", ((0, 18, 19, 17, 8), (0, 18, 19, 3, 8), (1, 10, 11, 13, 8), (1, 10, 11, 5, 8))),
+)
+
+FRAMES = 100
+
+
+def run(board, display, draw, full):
+    draw(0)
+    display.display.show()  # the frame before, left on the display by the last scenario
+    board.reset_bus_stats()
+    for frame in range(FRAMES):
+        draw(frame)
+        if full:
+            display.display.invalidate()
+        display.display.show()
+    return [stats["bus_us"] / FRAMES for stats in board.chain_stats()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MAX7219 chains")
+    parser.add_argument("--baudrate", type=int, default=1000000, help="SPI clock, the MAX7219 takes up to 10 MHz")
+    args = parser.parse_args()
+
+    from led_matrix import LEDMatrix
+
+    print("bus us per frame at {:,} Hz, per chain (total)".format(args.baudrate))
+    print("{:12} {:11} {:>40} {:>40}".format("layout", "scenario", "dirty rows only", "full refresh"))
+    for name, chains in LAYOUTS:
+        board = simulator.Board(matrix_chains=[(bus, cs, modules) for bus, _, _, cs, modules in chains])
+        display = LEDMatrix(chains=chains, baudrate=args.baudrate)
+        matrix = display.display
+        width = display.width
+        frame, text_width = display.text_cache.get("Welcome To Tic-Tac-Toe Mortar Launcher!")
+        label, _ = display.text_cache.get("SCORE")
+
+        def scroll(i):
+            matrix.fill(0)
+            matrix.blit(frame, width - i * (width + text_width) // FRAMES, 0)  # spread over one pass
+
+        def scoreboard(i):
+            counter, _ = display.text_cache.get("{:03}".format(i // 10))
+            matrix.fill(0)
+            matrix.blit(label, 0, 0)
+            matrix.blit(counter, width - 20, 0)
+
+        def static(i):
+            matrix.fill(0)
+            matrix.blit(label, 0, 0)
+
+        for scenario, draw in (("scroll", scroll), ("scoreboard", scoreboard), ("static", static)):
+            cells = []
+            for full in (False, True):
+                per_chain = run(board, display, draw, full)
+                cells.append("{} ({:.0f})".format(" ".join("{:.0f}".format(us) for us in per_chain),
+                                                 sum(per_chain)))
+            print("{:12} {:11} {:>40} {:>40}".format(name, scenario, cells[0], cells[1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+SPI cost of the LED matrix flash and fade effects under the simulator. Run on the host from the repo root:
+
+    python bench/bench_matrix_effects.py
+
+Flashes a message through LEDMatrix for 10 s of 1 ms updates and counts the SPI bytes, against the same flash
+done by redrawing the frame and a blank frame, the way LEDMatrix flashed before. Checks on the MAX7219 model
+that the modules blank and come back with their frame intact. Then counts the writes of a fade in and checks
+the intensity lands on the configured brightness. Exits 1 if a check fails.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sim"))
+
+import simulator
+
+simulator.install()
+
+RATE = 250  # ms, as the firmware's flashing messages
+RUN_MS = 10000
+
+
+def check(condition, what):
+    if not condition:
+        print("FAIL:", what)
+        sys.exit(1)
+
+
+def main():
+    from led_matrix import LEDMatrix
+
+    board = simulator.Board()
+    display = LEDMatrix()
+
+    # hardware flash: one shutdown write per half cycle
+    display.disp_flashing_message("BOOM!", RATE)
+    frame = [bytes(d) for d in board.matrix.digits]
+    board.reset_bus_stats()
+    blank_seen = True
+    for ticks in range(RUN_MS):
+        display.update(ticks)
+        if ticks % RATE == RATE // 2:
+            shut = board.matrix.shutdown[0]
+            check(all(s == shut for s in board.matrix.shutdown), "modules flash together")
+            check([bytes(d) for d in board.matrix.digits] == frame, "frame kept through the flash")
+            blank_seen = blank_seen and (shut == (ticks // RATE % 2 == 1))
+    hardware = board.bus_stats()["spi0"]["bytes"]
+    check(blank_seen, "flash alternates lit and blank")
+
+    # redraw flash, for comparison
+    display.reset_disp()
+    display.set_message("BOOM!")
+    board.reset_bus_stats()
+    for half in range(RUN_MS // RATE):
+        if half % 2 == 0:
+            display.draw(display.frame_x)
+        else:
+            display.display.fill(0)
+            display.display.show()
+    redraw = board.bus_stats()["spi0"]["bytes"]
+
+    cycles = RUN_MS // (2 * RATE)
+    print("flash at {} ms: {} SPI bytes a cycle by redrawing, {} with the shutdown register ({:.1%})".format(
+        RATE, redraw // cycles, hardware // cycles, hardware / redraw))
+
+    # fade in over 300 ms
+    display.disp_static_message("P1 GO!")
+    board.reset_bus_stats()
+    display.fade_in(300)
+    writes = 0
+    last = board.matrix.intensity[0]
+    for ticks in range(400):
+        display.update(ticks)
+        if board.matrix.intensity[0] != last:
+            check(board.matrix.intensity[0] > last, "fade in only gets brighter")
+            last = board.matrix.intensity[0]
+            writes += 1
+    fade_bytes = board.bus_stats()["spi0"]["bytes"]
+    check(board.matrix.intensity == [display.brightness] * 8, "fade ends on the configured brightness")
+    print("fade in 0 -> {} over 300 ms: {} intensity writes, {} SPI bytes in total".format(
+        display.brightness, writes + 1, fade_bytes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Shots per minute in rapid fire mode, under the simulator. Run on the host from the repo root:
+
+    python bench/bench_rapid_fire.py [--games 100]
+
+Plays the same rapid fire games (the firmware on both sides, seeded landings as in sim/tournament.py) with the
+pipelining on and off, for a few flight times, and reports shots per minute of virtual play. Off, the next shot
+is planned and aimed only once the last one is scored and the score wait always runs to its timeout, the way
+auto mode plays. The game results must be the same either way, only faster.
+
+Then steps a few shots tick by tick to check that the steppers are already moving to the next shot while the
+last one is scored, that a hit ends the wait, and that a beam still latched from the last ball isn't scored
+against the next shot. Exits 1 if a check fails.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sim"))
+
+import simulator
+import tournament
+
+simulator.install()
+
+FLIGHTS = (200, 400, 800)  # ms from the end of the pulse to the landing
+SEED = 48
+
+
+def check(condition, what):
+    if not condition:
+        sys.stdout = sys.__stdout__
+        print("FAIL:", what)
+        sys.exit(1)
+
+
+def shots_per_min(stats):
+    return stats["shots"] / (stats["play_ms"] / 60000.0)
+
+
+def play(games, flight_ms, serial):
+    options = {"mode": "rapid", "p1": "ai", "p2": "ai", "hit_rate": 0.7, "miss_rate": 0.1,
+               "flight_ms": flight_ms, "serial": serial}
+    return tournament.play_games((SEED, games, options))
+
+
+def stepped(firmware):
+    board = simulator.Board(matrix_model=False)
+    program = board.load_program()
+    program.remote = None
+    program.beam_hold = 3000  # longer than a launch, as it can be configured
+    runner = simulator.Runner(program)
+    runner.run_ms(50)
+    program.game_state = firmware.RAPID_MODE
+    program.current_player = True
+
+    # first shot: the next one is aimed while it is in the air, and the hit ends the wait
+    runner.run_until(lambda: program.game_state == firmware.WAIT_SCORE, 20000)
+    first = program.shot_cell
+    check(program.rapid_cell >= 0 and not program.steppers.at_goal(), "next shot aimed while the last is scored")
+    runner.run_ms(300)
+    for beam in tournament.cell_beams(first):
+        board.break_beam(beam)
+    start = runner.total_ticks
+    runner.run_until(lambda: program.game_state != firmware.WAIT_SCORE, 10000)
+    check(runner.total_ticks - start < 10, "a hit ends the wait")
+    check(program.cur_board[first] == 1, "first shot scored")
+    board.restore_all()
+
+    # the next shot fires with the first ball's beams still latched: they are the first ball's, not this one's
+    runner.run_until(lambda: program.game_state == firmware.WAIT_SCORE, 20000)
+    second = program.shot_cell
+    check(program.beam_states.count(0) == 2, "the first ball's beams still latched")
+    runner.run_until(lambda: program.game_state != firmware.WAIT_SCORE, 10000)
+    check(program.cur_board[second] == 0 and program.cur_board[first] == 1, "a latched beam isn't the next shot")
+    return program.rapid_replans
+
+
+def main():
+    parser = argparse.ArgumentParser(description="rapid fire shots per minute")
+    parser.add_argument("--games", type=int, default=100, help="per flight time and mode")
+    args = parser.parse_args()
+    os.chdir(tempfile.mkdtemp(prefix="launcher-rapid-"))
+
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    rows = []
+    for flight in FLIGHTS:
+        serial = play(args.games, flight, True)
+        pipelined = play(args.games, flight, False)
+        for key in ("p1_wins", "p2_wins", "draws", "shots", "hits"):
+            check(serial[key] == pipelined[key], "same games either way, {} {} against {}".format(
+                key, serial[key], pipelined[key]))
+        check(shots_per_min(pipelined) > shots_per_min(serial), "pipelining is faster")
+        rows.append((flight, serial, pipelined))
+
+    import main as firmware
+    replans = stepped(firmware)
+    sys.stdout = stdout
+
+    print("{} games a row, {} shots, p1 {} p2 {} draws {}".format(
+        args.games, rows[0][1]["shots"], rows[0][1]["p1_wins"], rows[0][1]["p2_wins"], rows[0][1]["draws"]))
+    print("{:>10} {:>12} {:>12} {:>8}".format("flight ms", "serial", "pipelined", "gain"))
+    for flight, serial, pipelined in rows:
+        print("{:10} {:12.1f} {:12.1f} {:7.2f}x".format(
+            flight, shots_per_min(serial), shots_per_min(pipelined), shots_per_min(pipelined) / shots_per_min(serial)))
+    print("shots/min of virtual play. stepped: aim during scoring, early exit and latched beams checked "
+          "({} replans)".format(replans))
+
+
+if __name__ == "__main__":
+    main()
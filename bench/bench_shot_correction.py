@@ -0,0 +1,99 @@
+"""
+Shot correction benchmark. Run on the host from the repo root:
+
+    python bench/bench_shot_correction.py [sequences] [shots]
+
+Fires simulated shot sequences at random cells. The launcher aims with the nominal ballistic model while the
+simulated world uses different launch parameters, a fixed phi misalignment and random scatter. Reports hit
+rate over the start and the end of each sequence, with and without correction, and the update cost.
+"""
+
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ballistics import Ballistics
+from step_convert import deg_to_steps, steps_to_deg
+from shot_correction import ShotCorrector
+
+PHI_MISALIGNMENT = 3.0  # deg
+THETA_SCATTER = 0.3  # deg, standard deviation
+PHI_SCATTER = 0.8  # deg, standard deviation
+
+
+def land(world, theta, phi, rng):
+    # returns the beam mask for a shot fired at theta/phi (degrees)
+    theta += rng.gauss(0, THETA_SCATTER)
+    phi += PHI_MISALIGNMENT + rng.gauss(0, PHI_SCATTER)
+    distance = world.simulate(theta)
+    x = distance * math.cos(math.radians(phi))
+    y = distance * math.sin(math.radians(phi))
+
+    row = round(1 - (x - world.lz_distance) / world.cell_pitch)
+    col = round(y / world.cell_pitch + 1)
+    mask = 0
+    if 0 <= col <= 2:
+        mask |= 1 << (2 - col)
+    if 0 <= row <= 2:
+        mask |= 1 << (3 + 2 - row)
+    return mask
+
+
+def run_sequence(model, world, corrected, shots, rng):
+    theta_per_row = deg_to_steps((model.aim_cell(6)[0] - model.aim_cell(0)[0]) / 2)
+    phi_per_col = deg_to_steps((model.aim_cell(5)[1] - model.aim_cell(3)[1]) / 2)
+    corrector = ShotCorrector(theta_per_row, phi_per_col)
+
+    hits = []
+    for _ in range(shots):
+        cell = rng.randrange(9)
+        theta, phi = model.aim_cell(cell)
+        theta = deg_to_steps(theta)
+        phi = deg_to_steps(phi)
+        if corrected:
+            off_theta, off_phi = corrector.offset(cell)
+            theta += off_theta
+            phi += off_phi
+
+        mask = land(world, steps_to_deg(theta), steps_to_deg(phi), rng)
+        hits.append(corrector.record(cell, mask, theta, phi) == cell)
+    return hits, corrector
+
+
+def main():
+    sequences = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    shots = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    window = max(1, shots // 5)
+
+    model = Ballistics()
+    world = Ballistics(muzzle_velocity=5.15, launch_height=0.32)
+
+    for corrected in (False, True):
+        rng = random.Random(1234)
+        first = 0
+        last = 0
+        total = 0
+        for _ in range(sequences):
+            hits, _ = run_sequence(model, world, corrected, shots, rng)
+            first += sum(hits[:window])
+            last += sum(hits[-window:])
+            total += sum(hits)
+        print("{:12} hit rate: first {} shots {:5.1%}, last {} shots {:5.1%}, overall {:5.1%}".format(
+            "corrected" if corrected else "uncorrected", window, first / (window * sequences),
+            window, last / (window * sequences), total / (shots * sequences)))
+
+    corrector = ShotCorrector(48, 64)
+    n = 100000
+    start = time.perf_counter()
+    for i in range(n):
+        corrector.record(i % 9, 0b100010, 1000, 0)
+    elapsed = time.perf_counter() - start
+    print("estimator update: {:,.0f} updates/s, log {} shots".format(n / elapsed, corrector.log_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Solenoid pulse width against loop load, under the simulator. Run on the host from the repo root:
+
+    python bench/bench_solenoid.py [--shots 20]
+
+Fires manual shots with the loop slowed down by a random extra 0 to N ms of work per pass, the way SPI frames,
+strip sends and prints stack up in one tick on the Pico, and measures each pulse on the expander model (the
+time between the solenoid output's edges). The timed pulse is compared with the pulse the loop used to give,
+switched off by the first pass that saw launch_duration was up (when the LAUNCH state exits). Also checks that
+the width the firmware measured matches the model's and that a reset mid launch cuts the pulse. Exits 1 if a
+check fails.
+
+The simulated timer fires exactly on time, a soft callback on the Pico can be held back by one native call in
+the loop (see solenoid.py), so read the timed column as the best case and the loop column as the real one.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sim"))
+
+import simulator
+
+simulator.install()
+
+LOADS = (0, 2, 5, 10)  # ms of extra work per pass, at most
+DURATIONS = (500, 333)  # ms
+
+
+def check(condition, what):
+    if not condition:
+        sys.stdout = sys.__stdout__
+        print("FAIL:", what)
+        sys.exit(1)
+
+
+def run(firmware, duration, load_ms, shots, rng):
+    board = simulator.Board(matrix_model=False)
+    program = board.load_program()
+    program.remote = None
+    program.launch_duration = duration
+    runner = simulator.Runner(program)
+    runner.run_ms(50)
+
+    update = program.update
+
+    def loaded(ticks):
+        update(ticks)
+        time.sleep_us(rng.randrange(load_ms * 1000 + 1))
+    program.update = loaded
+
+    # when the loop would have switched it off: the LAUNCH exit
+    exits = []
+    enter, tick, leave = program.state_table[firmware.LAUNCH]
+
+    def exit_launch(ticks):
+        exits.append(time.ticks_us())
+        leave(ticks)
+    table = list(program.state_table)
+    table[firmware.LAUNCH] = (enter, tick, exit_launch)
+    program.state_table = tuple(table)
+
+    measured = []
+    for _ in range(shots):
+        program.game_state = firmware.MANUAL_MODE
+        runner.run_ms(rng.randrange(1, 20))  # fire at any point of a tick
+        program.fire(runner.total_ticks)
+        runner.run_until(lambda: program.game_state == firmware.WAIT_SCORE and not program.solenoid.active, 5000)
+        measured.append(program.solenoid.width_us)
+        program.action_timer = 0  # skip the rest of the score wait
+        runner.run_until(lambda: program.game_state == firmware.MANUAL_MODE, 1000)
+
+    ons = [us for us, level in board.solenoid_edges if level]
+    loop = [off - on for on, off in zip(ons, exits)]
+    return board.solenoid_pulses(), measured, loop
+
+
+def spread(widths, duration):
+    errors = [w - duration * 1000 for w in widths]
+    return "{:+7.0f} {:+7.0f}".format(min(errors), max(errors))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="solenoid pulse width")
+    parser.add_argument("--shots", type=int, default=20, help="per load and duration")
+    args = parser.parse_args()
+    os.chdir(tempfile.mkdtemp(prefix="launcher-solenoid-"))
+
+    import log
+    import main as firmware
+    log.set_level(log.ERROR)
+
+    rng = random.Random(46)
+    stdout = sys.stdout
+    rows = []
+    for duration in DURATIONS:
+        for load in LOADS:
+            sys.stdout = open(os.devnull, "w")
+            pulses, measured, loop = run(firmware, duration, load, args.shots, rng)
+            sys.stdout = stdout
+            check(len(pulses) == args.shots, "one pulse per shot")
+            check(pulses == measured, "firmware measures the pulse the expander put out")
+            rows.append((duration, load, spread(pulses, duration), spread(loop, duration)))
+
+    print("pulse error in us, min and max over {} shots".format(args.shots))
+    print("{:>8} {:>10} {:>16} {:>16}".format("ms", "load ms", "timer", "loop"))
+    for duration, load, timed, loop in rows:
+        print("{:8} {:>10} {:>16} {:>16}".format(duration, "0-{}".format(load), timed, loop))
+
+    # a reset mid launch cuts the pulse
+    sys.stdout = open(os.devnull, "w")
+    board = simulator.Board(matrix_model=False)
+    program = board.load_program()
+    runner = simulator.Runner(program)
+    program.game_state = firmware.MANUAL_MODE
+    runner.run_ms(50)
+    program.fire(runner.total_ticks)
+    runner.run_ms(100)
+    check(board.solenoid() == 1, "solenoid on mid launch")
+    program.reset_game()
+    runner.step()
+    check(board.solenoid() == 0 and not program.solenoid.active, "reset cuts the pulse")
+    runner.run_ms(1000)
+    check(board.solenoid_pulses() == [program.solenoid.width_us], "and the timer doesn't fire again")
+    sys.stdout = stdout
+    print("reset mid launch checked")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Step conversion check and benchmark. Run on the host from the repo root:
+
+    python bench/bench_step_convert.py
+
+Compares step_convert.deg_to_steps with the original float conversion for every whole degree in -180..180 at
+every supported microstep setting (and a 0.001 degree sweep for fractional input), then times both.
+Exits non-zero on any mismatch.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from step_convert import MICROSTEPS, deg_to_steps
+
+
+def float_deg_to_steps(deg, microstep=8):
+    # the conversion StepperController.write_theta/write_phi used before step_convert
+    return round(deg * (1/(1.8 / microstep)))*2
+
+
+def main():
+    mismatches = 0
+    checked = 0
+    for microstep in MICROSTEPS:
+        for deg in range(-180, 181):
+            checked += 1
+            if deg_to_steps(deg, microstep) != float_deg_to_steps(deg, microstep):
+                mismatches += 1
+                print("mismatch: {} deg at 1/{}: {} != {}".format(
+                    deg, microstep, deg_to_steps(deg, microstep), float_deg_to_steps(deg, microstep)))
+        for i in range(-180000, 180001):
+            deg = i / 1000
+            checked += 1
+            if deg_to_steps(deg, microstep) != float_deg_to_steps(deg, microstep):
+                mismatches += 1
+                print("mismatch: {} deg at 1/{}".format(deg, microstep))
+    print("checked {:,} conversions, {} mismatches".format(checked, mismatches))
+
+    n = 200000
+    for name, fn in (("fixed point", deg_to_steps), ("float", float_deg_to_steps)):
+        start = time.perf_counter()
+        for i in range(n):
+            fn(i % 361 - 180)
+        elapsed = time.perf_counter() - start
+        print("{:12} {:,.0f} conversions/s".format(name, n / elapsed))
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
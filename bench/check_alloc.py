@@ -0,0 +1,193 @@
+"""
+Checks that the main loop doesn't allocate in steady state. Run on the host from the repo root:
+
+    python bench/check_alloc.py
+
+Drives the firmware through every game state under the simulator and traces each update with
+sim/alloc_trace.py. Ticks that change state, the few ticks after an input event (the AI's move, a score being
+written to flash) and ticks that print buffered log records are allowed to allocate; every other tick must
+not. Prints the allocation sites found per state and exits 1 if there are any.
+
+Garbage collection is taken over as main.py does at boot. The deferred boot work allocates freely, so it must
+run with automatic collection back on, else the Pico raises MemoryError; that is checked too.
+"""
+
+import gc
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sim"))
+
+import simulator
+from alloc_trace import AllocTracer
+
+simulator.install()
+
+
+class Checker:
+
+    def __init__(self, board, program):
+        self.board = board
+        self.program = program
+        self.runner = simulator.Runner(program)
+        self.tracer = AllocTracer()
+        self.results = {}
+
+    def settle(self, ms):
+        self.runner.run_ms(ms)
+
+    def steady(self, ms):
+        """
+        Trace `ms` worth of ticks, counting allocations in every tick that starts and ends in the same state.
+        """
+        import log
+        import main
+        program = self.program
+        end = self.runner.total_ticks + ms
+        while self.runner.total_ticks < end:
+            state = program.game_state
+            settled = state == program.active_state and not log.pending()
+            self.tracer.reset()
+            with self.tracer:
+                self.runner.step()
+            if settled and program.game_state == state and program.active_state == state:
+                sites, ticks = self.results.get(main.STATE_NAMES[state], ({}, 0))
+                for key, count in self.tracer.sites.items():
+                    sites[key] = sites.get(key, 0) + count
+                self.results[main.STATE_NAMES[state]] = (sites, ticks + 1)
+
+
+def main():
+    os.chdir(tempfile.mkdtemp(prefix="launcher-alloc-"))
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+
+    import main as firmware
+
+    board = simulator.Board()
+    program = board.load_program()
+    if firmware.GC_MANUAL:
+        program.take_over_gc()
+    check = Checker(board, program)
+    runner = check.runner
+
+    gc_on = []  # automatic collection on in each aim model build
+    build_aim_model = program.build_aim_model
+
+    def traced_build():
+        gc_on.append(gc.isenabled())
+        build_aim_model()
+    program.build_aim_model = traced_build
+
+    # menu: attract gradient, banner scrolling. the deferred aim model build runs in the first LED ticks.
+    check.settle(1000)
+    deferred_gc = gc_on == [True] and gc.isenabled() != program.gc_manual
+    check.steady(1000)
+    board.press(0)  # a button held into the reset
+    check.steady(400)
+    board.release(0)
+    check.steady(100)
+
+    # mode select: the select banner, then the selection banner counting down to manual mode
+    board.press(4)
+    check.settle(60)
+    board.release(4)
+    check.settle(60)
+    check.steady(500)
+    board.press(7)
+    check.settle(60)
+    board.release(7)
+    check.settle(60)
+    check.steady(1000)
+    runner.run_until(lambda: program.game_state == firmware.MANUAL_MODE, 10000)
+
+    # manual: idle, then aiming up (theta steppers on gpio) and right (phi stepper through the expander).
+    # buttons are let go before the 250 ms reset hold.
+    check.settle(50)
+    check.steady(500)
+    board.press(1)
+    check.settle(30)
+    check.steady(200)
+    board.release(1)
+    board.press(5)
+    check.settle(30)
+    check.steady(200)
+    board.release(5)
+    check.steady(500)
+
+    # launch and wait for score, landing in the centre cell
+    board.press(4)
+    runner.run_until(lambda: program.game_state == firmware.LAUNCH, 100)
+    board.release(4)
+    check.steady(600)
+    runner.run_until(lambda: program.game_state == firmware.WAIT_SCORE, 1000)
+    check.steady(500)
+    board.break_beam(1)
+    board.break_beam(4)
+    check.settle(5)  # the hit tick records the calibration
+    check.steady(20)
+    board.restore_all()
+    check.steady(1000)
+    runner.run_until(lambda: program.game_state != firmware.WAIT_SCORE, 10000)
+
+    # auto: player 1 to move, then the computer aiming (steppers moving) until it fires
+    program.game_state = firmware.AUTO_MODE
+    program.current_player = True
+    check.settle(50)
+    check.steady(500)
+    program.current_player = False
+    program.auto_cell = -1
+    check.settle(5)  # the move is picked and aimed
+    check.steady(3000)
+
+    # game over: the winner flashing
+    runner.run_until(lambda: program.game_state == firmware.WAIT_SCORE, 10000)
+    program.cur_board = [1, 1, 1, 0, 0, 0, 0, 0, 0]
+    runner.run_until(lambda: program.game_state == firmware.GAME_OVER, 10000)
+    check.settle(5)
+    check.steady(1000)
+
+    # rapid fire: the computer aiming and firing for player 1, then aiming player 2's shot while it is scored
+    # (landing off the planned cell, so the plan for player 2 is thrown away and made again)
+    program.reset_game()
+    program.steppers.override_theta(0)
+    program.steppers.override_phi(0)
+    program.game_state = firmware.RAPID_MODE
+    program.current_player = True
+    check.settle(5)  # the move is picked and aimed
+    check.steady(2000)
+    runner.run_until(lambda: program.game_state == firmware.WAIT_SCORE, 10000)
+    check.steady(300)
+    beams = (0, 3) if program.shot_cell != 8 else (2, 5)
+    board.break_beam(beams[0])
+    board.break_beam(beams[1])
+    check.settle(5)
+    board.restore_all()
+    runner.run_until(lambda: program.game_state == firmware.RAPID_MODE, 1000)
+    check.settle(5)  # the plan is made again
+    check.steady(1000)
+
+    gc.enable()
+    sys.stdout = stdout
+    failed = False
+    for name in firmware.STATE_NAMES:
+        sites, ticks = check.results.get(name, ({}, 0))
+        total = sum(sites.values())
+        print("{:12} {:6} steady ticks {:6} allocations".format(name, ticks, total))
+        for (filename, line, what), count in sorted(sites.items()):
+            print("    {}:{} {} x{}".format(filename, line, what, count))
+        failed |= total > 0 or ticks == 0
+
+    print("deferred boot work {} automatic collection".format("with" if deferred_gc else "WITHOUT"))
+
+    if failed:
+        print("FAIL: steady state ticks allocate (or a state was never reached)")
+        sys.exit(1)
+    if not deferred_gc:
+        print("FAIL: the aim model was built with automatic collection off, or it was left on after")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
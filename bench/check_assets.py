@@ -0,0 +1,178 @@
+"""
+Checks the asset pack under the simulator. Run on the host from the repo root, after `python assets.py`:
+
+    python bench/check_assets.py
+
+Checks that:
+
+    - every message main.py shows is in the pack, and a game shows them without rendering any
+    - a message read from the pack draws the same frame as the rendered one, wherever it is scrolled to
+    - the menu animation's frames are the gradients the compositor computes
+    - the board runs the same with and without the pack, matrix and strips alike
+    - with a pack of many more assets, opening it still reads the header only, lookups read a few index entries
+      and the buffers stay the same size
+
+Prints the pack's size and the reads per lookup. Exits 1 on a failed check.
+"""
+
+import os
+import sys
+import tempfile
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(REPO_DIR, "sim"))
+
+import simulator
+
+simulator.install()
+
+EXTRA = 2000  # messages added for the big pack
+
+
+def check(condition, what):
+    if not condition:
+        sys.stdout = sys.__stdout__
+        print("FAIL:", what)
+        sys.exit(1)
+
+
+class CountingFile:
+    # a pack's file, counting the reads through it
+
+    def __init__(self, f):
+        self.f = f
+        self.calls = 0
+
+    def seek(self, offset):
+        return self.f.seek(offset)
+
+    def readinto(self, buf):
+        self.calls += 1
+        return self.f.readinto(buf)
+
+
+def play(firmware, assets):
+    # (matrix buffers, strip pixels) every 50 ms through the menu and into a manual game
+    board = simulator.Board(matrix_model=False)
+    program = board.load_program(assets=assets)
+    program.remote = None
+    runner = simulator.Runner(program)
+    frames = []
+
+    def sample(ms):
+        for _ in range(ms // 50):
+            runner.run_ms(50)
+            frames.append((bytes(program.led_matrix.display.buffer), list(program.ctrl_leds.pixels),
+                           list(program.lz_leds.pixels)))
+
+    sample(3000)
+    board.press(4)
+    sample(200)
+    board.release(4)
+    sample(1000)
+    board.press(7)
+    sample(100)
+    board.release(7)
+    runner.run_until(lambda: program.game_state == firmware.MANUAL_MODE, 10000)
+    sample(1000)
+    return program, frames
+
+
+def main():
+    repo = os.path.abspath(REPO_DIR)
+    os.chdir(tempfile.mkdtemp(prefix="launcher-assets-"))
+    check(os.path.exists(os.path.join(repo, "assets.bin")), "assets.bin built, run python assets.py")
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+
+    import assets
+    import font
+    import random
+    from led_compositor import Compositor, LAYER_BACKGROUND, PRIMARIES
+    import main as firmware
+
+    # the pack has every message main.py shows
+    pack = assets.AssetPack(os.path.join(repo, "assets.bin"))
+    texts = assets.messages([os.path.join(repo, "main.py")])
+    for text in texts:
+        check(pack.locate(text, assets.KIND_TEXT) >= 0, "{!r} in the pack".format(text))
+    check(pack.locate("NOT A MESSAGE", assets.KIND_TEXT) < 0, "a message that isn't there")
+    check(pack.locate(texts[0], assets.KIND_FRAMES) < 0, "a message isn't an animation")
+
+    # pack frames draw as the rendered ones, at any scroll position
+    random.seed(50)
+    program = simulator.Board(matrix_model=False).load_program()
+    matrix = program.led_matrix
+    rendered = font.TextCache()
+    for text in texts:
+        matrix.set_message(text)
+        check(matrix.frame is matrix.asset_frame, "{!r} read from the pack".format(text))
+        frame, width = rendered.get(text)
+        check(matrix.frame_width == width, "{!r} width".format(text))
+        for x in (matrix.frame_x, matrix.buf_start, 5, 0, -3, -width // 2, -width + 1):
+            matrix.draw(x)
+            drawn = bytes(matrix.display.buffer)
+            matrix.display.fill(0)
+            matrix.display.blit(frame, x, 0)
+            check(drawn == bytes(matrix.display.buffer), "{!r} drawn at {}".format(text, x))
+
+    # the menu frames are the computed gradients
+    offset = pack.locate(assets.MENU_GRADIENT, assets.KIND_FRAMES)
+    check(offset >= 0 and pack.width == assets.MENU_LEDS, "menu animation in the pack")
+
+    class Strip:
+        num_leds = assets.MENU_LEDS
+
+    loaded, computed = Compositor(Strip()), Compositor(Strip())
+    for frame in range(64):
+        loaded.load(LAYER_BACKGROUND, pack, offset + frame * 4 * assets.MENU_LEDS)
+        computed.gradient(LAYER_BACKGROUND, 0, assets.MENU_LEDS - 1, PRIMARIES[frame >> 3], PRIMARIES[frame & 7])
+        check(list(loaded.colors) == list(computed.colors), "menu frame {}".format(frame))
+
+    # the same board with and without the pack
+    random.seed(50)
+    with_pack, frames = play(firmware, True)
+    random.seed(50)
+    without, frames_without = play(firmware, False)
+    check(with_pack.menu_frames >= 0 and without.menu_frames < 0, "menu frames from the pack only when it's there")
+    check(with_pack.led_matrix.text_cache.renders == 0, "nothing rendered with the pack, {} renders".format(
+        with_pack.led_matrix.text_cache.renders))
+    check(without.led_matrix.text_cache.renders > 0, "rendered without the pack")
+    check(frames == frames_without, "same matrix and strips with and without the pack")
+
+    # a pack of many more assets: same buffers, same startup, lookups a few entries more
+    source = "extra.py"
+    with open(source, "w") as f:
+        f.write("def extra(matrix):\n")
+        for i in range(EXTRA):
+            f.write("    matrix.disp_static_message({!r})\n".format("MSG {}".format(i)))
+    assets.build("big.bin", [os.path.join(repo, "main.py"), source])
+    sizes = []
+    for path in (os.path.join(repo, "assets.bin"), "big.bin"):
+        opened = assets.AssetPack(path)
+        check(opened.file is not None, "{} opens".format(path))
+        check(opened.file.tell() == assets.HEADER_SIZE, "{} opened reading the header only".format(path))
+        counted = opened.file = CountingFile(opened.file)
+        worst = 0
+        for text in texts:
+            calls = counted.calls
+            check(opened.locate(text, assets.KIND_TEXT) >= 0, "{!r} in {}".format(text, path))
+            worst = max(worst, counted.calls - calls)
+        sizes.append((os.path.getsize(path), opened.count, opened.max_columns, len(opened.name), len(opened.entry),
+                      worst))
+    (size, count, columns, name, entry, worst), (big_size, big_count, big_columns, big_name, big_entry, big_worst) \
+        = sizes
+    check(big_count == count + EXTRA, "extra messages packed")
+    check((columns, name, entry) == (big_columns, big_name, big_entry), "buffers don't grow with the assets")
+    check(big_worst <= big_count.bit_length() + 1, "a lookup reads {} times".format(big_worst))
+    sys.stdout = stdout
+
+    print("{:10} {:>7} {:>7} {:>13} {:>16}".format("pack", "assets", "bytes", "buffer bytes", "reads per lookup"))
+    print("{:10} {:7} {:7} {:13} {:16}".format("assets.bin", count, size, columns + name + entry, worst))
+    print("{:10} {:7} {:7} {:13} {:16}".format("big", big_count, big_size, big_columns + big_name + big_entry,
+                                               big_worst))
+    print("asset pack checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Checks the config store under the simulator, on a temp dir standing in for the Pico filesystem. Run on the host
+from the repo root:
+
+    python bench/check_config.py
+
+Boots MainProgram with no config file, tunes values through the serial remote handler the way a host would
+during live tuning, and checks that:
+
+    - a burst of changes is written once, only after it settles, and not during a shot
+    - a value tuned back to what is on flash is not written
+    - the write leaves no temp file, and the next boot loads and applies the values
+    - a short file, out of range values and a stale temp file from a cut write fall back cleanly
+    - a hit's aim calibration isn't written to flash while the shot is scored either
+
+Prints the host time per commit, exits 1 on the first failed check.
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sim"))
+
+import simulator
+
+simulator.install()
+
+
+def check(condition, what):
+    if not condition:
+        sys.stdout = sys.__stdout__
+        print("FAIL:", what)
+        sys.exit(1)
+
+
+def set_value(program, key, value):
+    import remote
+    data = bytearray((key, value & 0xFF, value >> 8))
+    return program.remote_command(remote.CMD_CONFIG, data, 3)
+
+
+def boot():
+    board = simulator.Board()
+    program = board.load_program()
+    program.remote = None  # commands are fed straight to the handler
+    runner = simulator.Runner(program)
+    runner.run_ms(50)
+    return board, program, runner
+
+
+def main():
+    os.chdir(tempfile.mkdtemp(prefix="launcher-config-"))
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+
+    import config
+    import main as firmware
+
+    # first boot: defaults, nothing written
+    board, program, runner = boot()
+    check(not os.path.exists(config.CONFIG_FILE), "no config file before any tuning")
+    check(program.launch_duration == config.DEFAULTS[config.LAUNCH_DURATION], "defaults applied")
+
+    # a burst of tuning, 20 sets 10 ms apart: applied at once, one write once it settles
+    for i in range(20):
+        check(set_value(program, config.LAUNCH_DURATION, 300 + i * 10) == 0, "set accepted")
+        runner.run_ms(10)
+    check(program.launch_duration == 490, "set applied without waiting for the write")
+    check(program.config.writes == 0, "nothing written while tuning")
+    runner.run_ms(config.COMMIT_DELAY + 200)
+    check(program.config.writes == 1, "one write for the burst, got {}".format(program.config.writes))
+    check(not os.path.exists(config.CONFIG_FILE + ".tmp"), "temp file renamed away")
+
+    # out of range values and unknown keys are rejected
+    check(set_value(program, config.MATRIX_BRIGHTNESS, 16) != 0, "matrix brightness over 15 rejected")
+    check(set_value(program, config.NUM_KEYS, 1) != 0, "unknown key rejected")
+
+    # tuned away and back again before it settles: no write
+    set_value(program, config.SCORE_TIMEOUT, 3000)
+    runner.run_ms(100)
+    set_value(program, config.SCORE_TIMEOUT, config.DEFAULTS[config.SCORE_TIMEOUT])
+    runner.run_ms(config.COMMIT_DELAY + 200)
+    check(program.config.writes == 1, "no write for a value tuned back")
+
+    # no write while a shot is timed, it goes out once the shot is over
+    set_value(program, config.BTN_DEBOUNCE, 30)
+    set_value(program, config.SCROLL_SPEED, 20)
+    set_value(program, config.MATRIX_BRIGHTNESS, 4)
+    program.game_state = firmware.MANUAL_MODE
+    runner.run_ms(50)
+    program.fire(runner.total_ticks)
+    runner.run_until(lambda: program.game_state == firmware.WAIT_SCORE, 2000)
+    runner.run_ms(config.COMMIT_DELAY)
+    check(program.game_state == firmware.WAIT_SCORE and program.config.writes == 1, "no write during a shot")
+    runner.run_until(lambda: program.game_state != firmware.WAIT_SCORE, 10000)
+    runner.run_ms(400)  # past the player prompt's fade in
+    check(program.config.writes == 2, "written after the shot")
+    check(board.matrix.intensity == [4] * 8, "matrix brightness sent")
+
+    # a hit recalibrates the cell, on flash only once the shot is scored
+    import aim_table
+    program.fire(runner.total_ticks)
+    runner.run_until(lambda: program.game_state == firmware.WAIT_SCORE, 2000)
+    board.break_beam(1)
+    board.break_beam(4)
+    runner.run_ms(100)
+    board.restore_all()
+    cell = next(i for i in range(9) if program.cur_board[i])
+    check(program.aim_table.get(cell) is not None, "hit recorded")
+    check(program.game_state == firmware.WAIT_SCORE and program.aim_table.writes == 0
+          and not os.path.exists(aim_table.AIM_FILE), "no aim write during a shot")
+    runner.run_until(lambda: program.game_state != firmware.WAIT_SCORE, 10000)
+    runner.run_ms(200)
+    check(program.aim_table.writes == 1, "aim written after the shot")
+    check(aim_table.AimTable().get(cell) == program.aim_table.get(cell), "aim on flash")
+
+    # next boot loads and applies them
+    board, program, runner = boot()
+    check(program.launch_duration == 490, "launch duration loaded")
+    check(program.btn_debounce_delay == 30, "debounce loaded")
+    check(program.led_matrix.default_scroll_speed == 20, "scroll speed loaded")
+    check(program.led_matrix.brightness == 4, "matrix brightness loaded")
+
+    # a file from a firmware with fewer keys, with an out of range value, and a stale temp file
+    with open(config.CONFIG_FILE, "wb") as f:
+        f.write(struct.pack("<3H", 700, 60000, 25))
+    with open(config.CONFIG_FILE + ".tmp", "wb") as f:
+        f.write(b"\x01")
+    board, program, runner = boot()
+    check(program.launch_duration == 700, "short file loaded")
+    check(program.score_timeout == config.DEFAULTS[config.SCORE_TIMEOUT], "out of range value reset")
+    check(program.btn_debounce_delay == 25, "short file loaded")
+    check(program.beam_hold == config.DEFAULTS[config.BEAM_HOLD], "missing key at its default")
+    set_value(program, config.BEAM_HOLD, 400)
+    program.config.commit(runner.total_ticks, force=True)
+    check(os.path.getsize(config.CONFIG_FILE) == 2 * config.NUM_KEYS, "rewritten in full")
+    check(not os.path.exists(config.CONFIG_FILE + ".tmp"), "stale temp file replaced")
+
+    # host time per commit
+    store = program.config
+    runs = 200
+    start = time.perf_counter()
+    for i in range(runs):
+        store.set(config.LAUNCH_DURATION, 300 + i % 2, 0)
+        store.commit(0, force=True)
+    commit_us = (time.perf_counter() - start) / runs * 1e6
+
+    sys.stdout = stdout
+    print("config checks passed, {:.0f} us host time per commit".format(commit_us))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Checks the LED compositors under the simulator. Run on the host from the repo root:
+
+    python bench/check_led_layers.py
+
+Plays the menu and a manual game and checks on the strips' buffers that:
+
+    - the red button's hint stays lit over the menu animation
+    - the mode's hints go over the cleared control pad
+    - a scored cell stays marked on the landing zone, and a reset clears it back to the background
+    - a board set over the remote replaces every mark on the landing zone
+    - a brightness change re-renders every pixel
+    - the computer's target is the one blue pixel on the pad, in auto and rapid fire, and goes when it fires
+    - gradients, the compositor's and the strip's, round the exact colour as round() does, halves to even
+
+Then counts the pixels composited and the strip words sent per LED tick in the menu, where the background
+animates every tick, and in a game, where it doesn't. Exits 1 on a failed check.
+"""
+
+import os
+import random
+import sys
+import tempfile
+from fractions import Fraction
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sim"))
+
+import simulator
+
+simulator.install()
+
+
+def check(condition, what):
+    if not condition:
+        sys.stdout = sys.__stdout__
+        print("FAIL:", what)
+        sys.exit(1)
+
+
+def packed(leds, rgb):
+    return leds.pixel_value(rgb[0], rgb[1], rgb[2])
+
+
+def per_tick(program, runner, sm, ms):
+    # (pixels composited, words sent) per LED tick over ms
+    ctrl, lz = program.ctrl_layers, program.lz_layers
+    pixels = ctrl.pixels_rendered + lz.pixels_rendered
+    words = sm.words
+    runner.run_ms(ms)
+    ticks = ms / 100.0
+    return (ctrl.pixels_rendered + lz.pixels_rendered - pixels) / ticks, (sm.words - words) / ticks
+
+
+def targets(firmware, program, runner, mode, shots):
+    # play shots in mode, the highlight layer holds at most the computer's target, and none once it fired
+    import led_compositor
+    ctrl = program.ctrl_layers
+    program.reset_game()
+    runner.run_ms(10)
+    program.clear_ctrl_leds()
+    program.game_state = mode
+    program.current_player = mode == firmware.RAPID_MODE
+    fired = 0
+    while fired < shots:
+        check(program.game_state != firmware.GAME_OVER, "{} game went on".format(firmware.STATE_NAMES[mode]))
+        if program.game_state == mode and program.current_player and mode == firmware.AUTO_MODE:
+            program.fire(runner.total_ticks)  # the player's shot, nothing is shown for it
+        state = program.game_state
+        runner.step()
+        highlight = ctrl.masks[led_compositor.LAYER_HIGHLIGHT]
+        check(highlight & (highlight - 1) == 0, "{}: one target at most".format(firmware.STATE_NAMES[mode]))
+        if highlight:
+            check(highlight == 1 << program.target_led, "the target is the pixel shown")
+        if state != firmware.LAUNCH and program.game_state == firmware.LAUNCH:
+            fired += 1
+            check(program.target_led < 0 and highlight == 0, "{}: the target goes when it fires".format(
+                firmware.STATE_NAMES[mode]))
+    return fired
+
+
+def exact_gradient(left, right, span):
+    return [tuple(round(Fraction(left[c] * span + (right[c] - left[c]) * i, span)) for c in range(3))
+            for i in range(span + 1)]
+
+
+def gradients(program):
+    # random colour pairs over every span of the pad, against the exact maths
+    import led_compositor
+    rng = random.Random(38)
+    layers = program.ctrl_layers
+    leds = program.ctrl_leds
+    for _ in range(500):
+        left = tuple(rng.randrange(256) for _ in range(3))
+        right = tuple(rng.randrange(256) for _ in range(3))
+        span = rng.randrange(1, leds.num_leds)
+        want = exact_gradient(left, right, span)
+        layers.gradient(led_compositor.LAYER_BACKGROUND, 0, span, left, right)
+        got = [(c >> 16, c >> 8 & 0xFF, c & 0xFF) for c in layers.colors[:span + 1]]
+        check(got == want, "compositor gradient {} to {} over {}".format(left, right, span))
+        leds.set_pixel_line_gradient(0, span, left, right)
+        check(list(leds.pixels[:span + 1]) == [packed(leds, rgb) for rgb in want],
+              "strip gradient {} to {} over {}".format(left, right, span))
+
+
+def main():
+    os.chdir(tempfile.mkdtemp(prefix="launcher-leds-"))
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+
+    import rp2
+    import config
+    import led_compositor
+    import main as firmware
+
+    board = simulator.Board(matrix_model=False)
+    program = board.load_program()
+    program.remote = None
+    runner = simulator.Runner(program)
+    ctrl, lz = program.ctrl_leds, program.lz_leds
+    sm = rp2.StateMachine.machines[0]
+
+    # menu: the animation runs under the hint
+    runner.run_ms(100)
+    for _ in range(10):
+        runner.run_ms(100)
+        check(ctrl.pixels[4] == packed(ctrl, firmware.RED), "red button hint over the animation")
+    menu = per_tick(program, runner, sm, 2000)
+
+    # into a manual game
+    board.press(4)
+    runner.run_until(lambda: program.game_state == firmware.SELECT_MODE, 1000)
+    board.release(4)
+    runner.run_ms(200)
+    check(list(lz.pixels) == [packed(lz, firmware.WHITE)] * 9, "landing zone white for the game")
+    check(ctrl.pixels[1] == packed(ctrl, firmware.RED) and ctrl.pixels[3] == packed(ctrl, firmware.BLUE),
+          "mode select hints")
+    board.press(7)
+    runner.run_ms(60)
+    board.release(7)
+    runner.run_until(lambda: program.game_state == firmware.MANUAL_MODE, 10000)
+    runner.run_ms(200)
+    check(ctrl.pixels[0] == 0 and ctrl.pixels[4] == packed(ctrl, firmware.RED)
+          and ctrl.pixels[5] == packed(ctrl, firmware.WHITE), "manual hints over a dark pad")
+
+    # a shot into the centre cell stays marked
+    program.fire(runner.total_ticks)
+    runner.run_until(lambda: program.game_state == firmware.WAIT_SCORE, 2000)
+    board.break_beam(1)
+    board.break_beam(4)
+    runner.run_ms(30)
+    board.restore_all()
+    runner.run_until(lambda: program.game_state == firmware.MANUAL_MODE, 10000)
+    mark = packed(lz, firmware.RED)
+    check(lz.pixels[4] == mark, "centre cell marked")
+    game = per_tick(program, runner, sm, 2000)
+    check(lz.pixels[4] == mark and lz.pixels[0] == packed(lz, firmware.WHITE), "mark kept over the background")
+
+    # brightness re-renders everything
+    rendered = program.lz_layers.pixels_rendered
+    program.config.set(config.LZ_BRIGHTNESS, 40, runner.total_ticks)
+    program.apply_config()
+    runner.run_ms(200)
+    check(program.lz_layers.pixels_rendered - rendered == 9 and lz.pixels[4] == packed(lz, firmware.RED),
+          "brightness change re-renders")
+
+    # a board set over the remote replaces the marks, the centre's included
+    import remote
+    cells = (2, 0, 1, 0, 0, 0, 0, 1, 0)
+    check(program.remote_command(remote.CMD_BOARD, bytearray(cells + (1,)), 10) == remote.STATUS_OK, "board set")
+    runner.run_ms(200)
+    colours = {0: firmware.WHITE, 1: firmware.RED, 2: firmware.GREEN}
+    check(list(lz.pixels) == [packed(lz, colours[cells[firmware.SCORE_CELLS[i]]]) for i in range(9)],
+          "remote board shown on the landing zone")
+
+    # a reset takes the marks off
+    program.reset_game()
+    runner.run_ms(1)
+    check(program.lz_layers.masks[led_compositor.LAYER_BOARD] == 0, "reset clears the board layer")
+
+    gradients(program)
+
+    # the computer's target on the pad
+    program.steppers.feed_rate = 1
+    targets(firmware, program, runner, firmware.AUTO_MODE, 6)
+    targets(firmware, program, runner, firmware.RAPID_MODE, 6)
+    sys.stdout = stdout
+
+    print("per LED tick: {:>10} {:>12}".format("composited", "words sent"))
+    print("{:13} {:10.1f} {:12.1f}".format("menu", menu[0], menu[1]))
+    print("{:13} {:10.1f} {:12.1f}".format("manual game", game[0], game[1]))
+    print("led layer checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Checks the main loop's load shedding under the simulator. Run on the host from the repo root:
+
+    python bench/check_load_shedding.py
+
+Runs the board with SPI and I2C transfers taking their bus time off the virtual clock (Board(bus_time=True)),
+so a pass costs what its bus traffic costs. Checks that:
+
+    - the menu and a manual game at the normal matrix clock never shed
+    - with the matrix clocked down until every scroll step takes several ms, and telemetry streaming, the steppers
+      keep close to their 1 ms feed while shedding, and much faster than with shedding turned off
+    - the put off tasks still run, at least once per their max_defer
+    - a shot lands and scores while overloaded
+
+Prints steps, loop passes and per task deferred counts with and without shedding. Exits 1 on a failed check.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sim"))
+
+import simulator
+
+simulator.install()
+
+SLOW_BAUDRATE = 200000  # a scroll step is ~4.5 ms of SPI
+RUN_MS = 2000
+BANNER = "Welcome To Tic-Tac-Toe Mortar Launcher! PRESS RED BUTTON TO CONTINUE!"
+
+
+def check(condition, what):
+    if not condition:
+        sys.stdout = sys.__stdout__
+        print("FAIL:", what)
+        sys.exit(1)
+
+
+def boot(firmware):
+    board = simulator.Board(matrix_model=False, bus_time=True)
+    program = board.load_program()
+    runner = simulator.Runner(program)
+    runner.run_ms(50)
+    return board, program, runner
+
+
+def overload(firmware, program, runner):
+    import remote
+    program.game_state = firmware.MANUAL_MODE
+    runner.run_ms(10)
+    for chain in program.led_matrix.display.chains:
+        chain.spi.baudrate = SLOW_BAUDRATE
+    program.led_matrix.disp_scrolling_message(BANNER, 1)
+    program.remote_command(remote.CMD_TELEMETRY, bytearray((1, 0)), 2)  # a frame every ms
+
+
+def sweep(program, runner):
+    # theta swept end to end, fed every pass. returns (steps, passes, matrix steps) over RUN_MS
+    steppers = program.steppers
+    steppers.feed_rate = 1
+    steppers.override_theta(0)
+    matrix = program.led_matrix
+    loops = runner.loops
+    steps = 0
+    moves = 0
+    last_x = matrix.buf_x
+    end = runner.total_ticks + RUN_MS
+    while runner.total_ticks < end:
+        if steppers.at_goal():
+            steppers.write_theta_steps(steppers.theta_max_steps if steppers.theta_pos == 0 else 0)
+        pos = steppers.theta_pos
+        runner.step()
+        steps += abs(steppers.theta_pos - pos)
+        if matrix.buf_x != last_x:
+            moves += 1
+            last_x = matrix.buf_x
+    return steps, runner.loops - loops, moves
+
+
+def main():
+    os.chdir(tempfile.mkdtemp(prefix="launcher-shed-"))
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+
+    import load_budget
+    import main as firmware
+
+    # normal load: the menu banner and a manual game never shed
+    board, program, runner = boot(firmware)
+    runner.run_ms(3000)
+    program.game_state = firmware.MANUAL_MODE
+    runner.run_ms(100)
+    sweep(program, runner)
+    check(program.budget.episodes == 0, "no shedding at the normal matrix clock, avg {} us".format(
+        program.budget.avg_us))
+
+    # overloaded, with and without shedding
+    results = []
+    for shed in (False, True):  # the shedding run last, the shot below goes on from it
+        board, program, runner = boot(firmware)
+        if not shed:
+            program.budget.budget_us = 1 << 30
+        overload(firmware, program, runner)
+        program.budget.reset()
+        steps, passes, moves = sweep(program, runner)
+        budget = program.budget
+        results.append((steps, passes, moves, budget.shed_ticks, list(budget.deferred)))
+    (steps_off, passes_off, moves_off, _, _), (steps, passes, moves, shed_ticks, deferred) = results
+    check(budget.episodes > 0 and shed_ticks > passes // 2, "overload sheds")
+    check(steps > 2 * steps_off, "steppers faster with shedding, {} against {} steps".format(steps, steps_off))
+    check(steps >= RUN_MS // 2, "steppers keep at least half their feed, {} steps in {} ms".format(steps, RUN_MS))
+    check(moves >= RUN_MS // load_budget.MAX_DEFER[load_budget.TASK_MATRIX] // 2,
+          "matrix still scrolls, {} steps".format(moves))
+    for task in range(load_budget.NUM_TASKS):
+        check(deferred[task] > 0, "{} put off".format(load_budget.TASK_NAMES[task]))
+
+    # a shot scores while overloaded
+    program.steppers.override_theta(0)
+    program.fire(runner.total_ticks)
+    runner.run_until(lambda: program.game_state == firmware.WAIT_SCORE, 2000)
+    program.led_matrix.disp_scrolling_message(BANNER, 1)
+    runner.run_ms(300)
+    board.break_beam(1)
+    board.break_beam(4)
+    runner.run_ms(30)
+    board.restore_all()
+    check(program.cur_board[4] == 1, "beam captured while shedding")
+    check(program.budget.shedding, "still shedding when it landed")
+
+    sys.stdout = stdout
+    print("{} ms overloaded: {:>6} {:>7} {:>13}".format(RUN_MS, "steps", "passes", "matrix steps"))
+    print("{:22} {:6} {:7} {:13}".format("shedding", steps, passes, moves))
+    print("{:22} {:6} {:7} {:13}".format("no shedding", steps_off, passes_off, moves_off))
+    print("shedding: shed {} passes, deferred {}, worst pass {} us".format(shed_ticks, ", ".join(
+        "{} {}".format(load_budget.TASK_NAMES[t], deferred[t]) for t in range(load_budget.NUM_TASKS)),
+        budget.worst_us))
+    print("load shedding checks passed")
+
+
+if __name__ == "__main__":
+    main()
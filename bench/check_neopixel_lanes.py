@@ -0,0 +1,91 @@
+"""
+Checks the parallel WS2812 output under the simulator. Run on the host from the repo root:
+
+    python bench/check_neopixel_lanes.py
+
+For 2, 4 and 8 lanes, fills every lane with random colours, shows them through ParallelStrips and decodes the
+words pushed into the state machine back into one bit stream per output pin, the way the PIO program clocks
+them out. Checks that each pin carries its lane's pixels, most significant bit first, that a show with nothing
+changed pushes nothing, and that changing one lane resends all of them. Prints the line time of one show against
+sending the lanes one after the other. Exits 1 on the first failed check.
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sim"))
+
+import simulator
+
+simulator.install()
+
+NUM_LEDS = 9
+BIT_US = 1.25  # WS2812 bit period at 800 kHz
+
+
+def check(condition, what):
+    if not condition:
+        print("FAIL:", what)
+        sys.exit(1)
+
+
+def decode(words, lanes, num_leds):
+    # each FIFO word holds 16 // lanes planes of `lanes` bits in its top half, out() takes them from the top
+    per_word = 16 // lanes
+    mask = (1 << lanes) - 1
+    planes = []
+    for word in words:
+        for k in range(per_word):
+            planes.append((word >> (32 - lanes * (k + 1))) & mask)
+    streams = []
+    for lane in range(lanes):
+        pixels = []
+        for p in range(num_leds):
+            value = 0
+            for plane in planes[24 * p:24 * (p + 1)]:
+                value = (value << 1) | ((plane >> lane) & 1)
+            pixels.append(value)
+        streams.append(pixels)
+    return streams
+
+
+def main():
+    import neopixel
+    import rp2
+
+    simulator.Board()
+    rng = random.Random(44)
+    for lanes in (2, 4, 8):
+        strips = neopixel.ParallelStrips(0, 15, lanes, NUM_LEDS, "GRB")
+        sm = rp2.StateMachine.machines[0]
+        for lane in strips.strips:
+            lane.brightness(rng.randrange(1, 256))
+            for i in range(NUM_LEDS):
+                lane.set_pixel(i, (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+
+        sm.frame = []
+        strips.show()
+        words = len(sm.frame)
+        check(words == NUM_LEDS * 24 * lanes // 16, "{} lanes: {} words pushed".format(lanes, words))
+        for i, pixels in enumerate(decode(sm.frame, lanes, NUM_LEDS)):
+            check(pixels == list(strips.lane(i).pixels), "{} lanes: lane {} on its pin".format(lanes, i))
+
+        sm.frame = []
+        strips.show()
+        check(not sm.frame, "{} lanes: unchanged show skipped".format(lanes))
+
+        strips.lane(lanes - 1).set_pixel(0, (1, 2, 3))
+        strips.lane(lanes - 1).show()
+        check(len(sm.frame) == words, "{} lanes: a change in one lane resends the frame".format(lanes))
+        check(decode(sm.frame, lanes, NUM_LEDS)[lanes - 1] == list(strips.lane(lanes - 1).pixels),
+              "{} lanes: changed lane sent".format(lanes))
+
+        line_us = NUM_LEDS * 24 * BIT_US
+        print("{} lanes of {} LEDs: {} words, {:.0f} us on the line, {:.0f} us one strip after the other".format(
+            lanes, NUM_LEDS, words, line_us, lanes * line_us))
+    print("parallel strip checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Driver and game loop benchmarks under the simulator. Run on the host from the repo root:
+
+    python bench/run_benchmarks.py [-o results.json] [--compare baseline.json] [--threshold 0.25]
+
+Every benchmark reports calls per second on the host, simulated bus transactions and bytes per call (I2C, SPI
+and PIO words) and the heap allocations per call the firmware would make on the Pico (sim/alloc_trace.py, the
+same tracer as check_alloc; CPython's own allocations are noise). Results are written as JSON. With --compare, any benchmark that got slower than the threshold, or
+that moves more bus traffic or allocates more than the baseline, is reported and the exit code is 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sim"))
+
+import simulator
+
+clock = simulator.install()
+
+from alloc_trace import AllocTracer
+
+MIN_TIME = 0.2  # s per benchmark
+ALLOC_CALLS = 5  # traced calls per benchmark, tracing is slow
+
+
+def measure(board, fn, calls=None):
+    for _ in range(5):
+        fn()
+
+    # bus traffic is deterministic, one pass is enough
+    board.reset_bus_stats()
+    n = calls or 200
+    for _ in range(n):
+        fn()
+    traffic = {}
+    for name, stats in board.bus_stats().items():
+        for key, value in stats.items():
+            if value:
+                traffic["{}_{}".format(name, key)] = value / n
+
+    # time until MIN_TIME has passed
+    total = 0
+    elapsed = 0
+    while elapsed < MIN_TIME:
+        start = time.perf_counter()
+        for _ in range(n):
+            fn()
+        elapsed += time.perf_counter() - start
+        total += n
+
+    # allocations per call, counted as they would be made on the Pico
+    tracer = AllocTracer()
+    with tracer:
+        for _ in range(ALLOC_CALLS):
+            fn()
+
+    return {
+        "calls_per_s": round(total / elapsed, 1),
+        "bus_per_call": traffic,
+        "allocs_per_call": tracer.total() / ALLOC_CALLS,
+    }
+
+
+# ----------------------------------------- DRIVERS ----------------------------------------- #
+
+def driver_benchmarks(board):
+    import neopixel
+    import max7219
+    from led_matrix import LEDMatrix
+    from mcp23017 import MCP23017
+    from bus_arbiter import BusArbiter, PRIO_SOLENOID
+    from led_compositor import Compositor, LAYER_BACKGROUND, LAYER_BOARD
+    from stepper import StepperController
+    from machine import Pin, I2C, SPI
+
+    results = {}
+
+    strip = neopixel.Neopixel(9, 0, 15, "GRB")
+    results["neopixel.set_pixel"] = measure(board, lambda: strip.set_pixel(4, (255, 0, 0)))
+    results["neopixel.fill"] = measure(board, lambda: strip.fill((255, 255, 255)))
+    results["neopixel.gradient"] = measure(
+        board, lambda: strip.set_pixel_line_gradient(0, 8, (255, 0, 0), (0, 0, 255)))
+    results["neopixel.clear"] = measure(board, strip.clear)
+    results["neopixel.show"] = measure(board, strip.show)
+
+    layers = Compositor(strip)
+    layers.set_pixel(LAYER_BOARD, 4, (0, 255, 0))
+
+    def animate():
+        layers.gradient(LAYER_BACKGROUND, 0, 8, (255, 0, 0), (0, 0, 255))
+        layers.render()
+    results["led_compositor.gradient_render"] = measure(board, animate)
+
+    def mark():
+        layers.set_pixel(LAYER_BOARD, 4, (0, 255, 0))
+        layers.render()
+    results["led_compositor.mark_render"] = measure(board, mark)
+    results["led_compositor.render_idle"] = measure(board, layers.render)
+
+    matrix = max7219.Matrix8x8(SPI(0, sck=Pin(18), mosi=Pin(19)), Pin(simulator.MATRIX_CS_PIN, Pin.OUT), 8)
+    results["max7219.show"] = measure(board, matrix.show)
+    results["max7219.brightness"] = measure(board, lambda: matrix.brightness(10))
+
+    def text_frame():
+        matrix.fill(0)
+        matrix.text("P1 GO!", 0, 0, 1)
+        matrix.show()
+    results["max7219.text_frame"] = measure(board, text_frame)
+
+    display = LEDMatrix()
+    display.disp_scrolling_message("Welcome To Tic-Tac-Toe Mortar Launcher! PRESS RED BUTTON TO CONTINUE!")
+    ticks = [0]
+
+    def scroll_step():
+        ticks[0] += display.scroll_speed
+        display.update(ticks[0])
+    results["led_matrix.scroll_step"] = measure(board, scroll_step)
+
+    messages = ["P1 GO!", "P2 GO!"]
+
+    def static_message():
+        messages.reverse()
+        display.disp_static_message(messages[0])
+    results["led_matrix.static_message"] = measure(board, static_message)
+
+    mcp = MCP23017(I2C(0, scl=Pin(1), sda=Pin(0)), simulator.MCP_ADDRESS)
+    results["mcp23017.pin_read"] = measure(board, lambda: mcp.pin(3))
+    results["mcp23017.virtual_pin_output"] = measure(board, lambda: mcp[0].output(1))
+    results["mcp23017.gpio_read"] = measure(board, lambda: mcp.gpio)
+
+    bus = BusArbiter()
+    solenoid = bus.pin(mcp, 0, PRIO_SOLENOID)
+    level = [0]
+
+    def solenoid_toggle():
+        level[0] ^= 1
+        solenoid(level[0])
+        bus.flush()
+    results["bus_arbiter.pin_write_flush"] = measure(board, solenoid_toggle)
+    results["bus_arbiter.flush_idle"] = measure(board, bus.flush)
+
+    steppers = StepperController(mcp, bus)
+    steppers.feed_rate = 1
+    goal = [0]
+
+    def stepper_move():
+        if steppers.at_goal():
+            goal[0] = 0 if goal[0] else 1600
+            steppers.write_theta_steps(goal[0])
+            steppers.write_phi_steps(goal[0] // 2)
+        steppers.update_steppers()
+        bus.flush()
+    results["stepper.update_moving"] = measure(board, stepper_move)
+    steppers.override_theta(0)
+    steppers.override_phi(0)
+    results["stepper.update_idle"] = measure(board, steppers.update_steppers)
+    results["stepper.write_theta"] = measure(board, lambda: steppers.write_theta(45))
+
+    return results
+
+
+# ----------------------------------------- GAME SCENARIOS ----------------------------------------- #
+
+def press_for(board, runner, button, ms=30):
+    board.press(button)
+    runner.run_ms(ms)
+    board.release(button)
+    runner.run_ms(ms)
+
+
+def scenario_benchmarks(board):
+    import main
+
+    results = {}
+
+    # menu idle: attract gradient and banner, nobody touching anything
+    program = board.load_program()
+    runner = simulator.Runner(program)
+    results["game.menu_idle"] = measure(board, runner.step)
+
+    # scrolling banner in mode select
+    program = board.load_program()
+    runner = simulator.Runner(program)
+    press_for(board, runner, 4)
+    assert program.game_state == main.SELECT_MODE
+    results["game.scrolling_banner"] = measure(board, runner.step)
+
+    # aiming sweep, aim up held in manual mode
+    program = board.load_program()
+    runner = simulator.Runner(program)
+    program.game_state = main.MANUAL_MODE
+    runner.run_ms(10)
+    board.press(1)
+    runner.run_ms(30)
+
+    def aim_tick():
+        if program.manual_theta > 170:
+            program.manual_theta = 0
+        runner.step()
+    results["game.aiming_sweep"] = measure(board, aim_tick)
+    board.release(1)
+
+    # launch to score: fire, land in the centre cell, wait out the score timeout
+    program = board.load_program()
+    runner = simulator.Runner(program)
+    program.game_state = main.MANUAL_MODE
+    runner.run_ms(10)
+
+    def launch_to_score():
+        board.press(4)
+        runner.run_until(lambda: program.game_state == main.LAUNCH, 100)
+        board.release(4)
+        runner.run_until(lambda: program.game_state == main.WAIT_SCORE, 2000)
+        board.break_beam(1)
+        board.break_beam(4)
+        runner.run_ms(20)
+        board.restore_all()
+        runner.run_until(lambda: program.game_state == main.MANUAL_MODE, 10000)
+        program.cur_board = [0] * 9
+        return runner.loops
+
+    loops_before = runner.loops
+    launch_to_score()
+    loops = runner.loops - loops_before
+    result = measure(board, launch_to_score, calls=5)
+    result["ticks_per_call"] = loops
+    results["game.launch_to_score"] = result
+
+    return results
+
+
+# ----------------------------------------- REPORT ----------------------------------------- #
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            continue
+        if result["calls_per_s"] < old["calls_per_s"] * (1 - threshold):
+            regressions.append("{}: {:.0f} calls/s, was {:.0f}".format(
+                name, result["calls_per_s"], old["calls_per_s"]))
+        for key, value in result["bus_per_call"].items():
+            if value > old["bus_per_call"].get(key, 0) + 1e-9:
+                regressions.append("{}: {} {:.2f} per call, was {:.2f}".format(
+                    name, key, value, old["bus_per_call"].get(key, 0)))
+        # a baseline from before allocations were traced has no count to compare with
+        if result["allocs_per_call"] > old.get("allocs_per_call", result["allocs_per_call"]) + 1e-9:
+            regressions.append("{}: {:.1f} allocations per call, was {:.1f}".format(
+                name, result["allocs_per_call"], old["allocs_per_call"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output", default="bench_results.json")
+    parser.add_argument("--compare", help="baseline results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed calls/s slowdown")
+    args = parser.parse_args()
+    output = os.path.abspath(args.output)
+
+    # keep anything the firmware writes to flash (aim.bin etc.) out of the working tree
+    workdir = tempfile.mkdtemp(prefix="launcher-bench-")
+    os.chdir(workdir)
+
+    import log
+    log.set_level(log.ERROR)
+
+    board = simulator.Board()
+    results = {}
+    results.update(driver_benchmarks(board))
+    results.update(scenario_benchmarks(board))
+
+    for name, result in results.items():
+        traffic = ", ".join("{} {:.1f}".format(k, v) for k, v in sorted(result["bus_per_call"].items()))
+        print("{:32} {:>12,.0f} calls/s {:>7.1f} allocs  {}".format(
+            name, result["calls_per_s"], result["allocs_per_call"], traffic))
+
+    with open(output, "w") as f:
+        json.dump({"python": platform.python_implementation() + " " + platform.python_version(),
+                   "results": results}, f, indent=2, sort_keys=True)
+    print("wrote", output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
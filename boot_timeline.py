@@ -0,0 +1,33 @@
+"""
+Boot timeline.
+
+Call stage(name) at the end of each boot stage, the stage is timed from the end of the previous one. The first
+stage is timed from tick 0, which on the Pico is the reset, so it covers the interpreter start and the imports.
+"""
+
+import time
+
+
+class BootTimeline:
+
+    def __init__(self, max_stages=16):
+        self.names = []
+        self.ends = [0] * max_stages  # ticks_us at the end of each stage
+
+    def stage(self, name):
+        n = len(self.names)
+        if n < len(self.ends):
+            self.ends[n] = time.ticks_us()
+            self.names.append(name)
+
+    def duration_us(self, i):
+        return time.ticks_diff(self.ends[i], self.ends[i - 1] if i else 0)
+
+    def total_us(self):
+        return self.ends[len(self.names) - 1] if self.names else 0
+
+    def report(self):
+        print("boot stage       us")
+        for i in range(len(self.names)):
+            print("{:12} {:8}".format(self.names[i], self.duration_us(i)))
+        print("{:12} {:8}".format("total", self.total_us()))
@@ -0,0 +1,210 @@
+"""
+Output writes to the MCP23017 expanders, queued per tick and sent in one pass.
+
+Driving an expander pin through mcp23017.VirtualPin is a read-modify-write of IODIR and GPIO, four transactions
+for one bit, and the solenoid, the phi step and dir pins each do that on their own. BusArbiter keeps a copy of
+each port's output latch (OLAT) instead: a pin write only changes the copy and queues the port, reading an
+output pin back reads the copy. flush() then writes every queued port once, most urgent first, so any number
+of pin writes to a port in a tick cost one transaction, a pin set and cleared again in the same tick costs
+none, and both ports of an expander go out in one two byte transaction when they are both queued.
+
+A pin made with setup=True, a stepper driver's DIR, has to settle before the port's other pins change with it:
+the driver samples DIR on the STEP edge, a few hundred ns of setup time, and one OLAT write switches every bit of
+the port at once. When such a pin changes along with others, its new level is sent in a write of its own first
+and the rest follow in the next, one transaction later.
+
+    bus = BusArbiter()
+    solenoid = bus.pin(mcp, 0, PRIO_SOLENOID)
+    solenoid(1)
+    bus.flush()  # once a tick, after everything that writes pins
+
+LatchPin.send() writes a pin and sends its port at once, for edges timed outside the loop, through buffers of
+its own: the solenoid's timer callback can run in the middle of a flush. Pins handed out are set as outputs
+once, here. Anything else driving the same ports directly is overwritten by the next flush. The
+counters can be read at any time and wrap like the rest of the firmware's.
+"""
+
+from micropython import const
+
+# most urgent first, flush sends ports in this order
+PRIO_SOLENOID = const(0)
+PRIO_STEP = const(1)
+PRIO_LOW = const(2)
+NUM_PRIOS = const(3)
+
+_MCP_OLAT = const(0x0a)
+
+
+class Latch:
+    # one port's output latch, as last sent and as it should be
+
+    def __init__(self, mcp, port):
+        self.mcp = mcp
+        self.port = port
+        self.reg = port._which_reg(_MCP_OLAT)
+        self.value = port.output_latch
+        self.sent = self.value
+        self.priority = NUM_PRIOS  # most urgent write queued since the last flush, NUM_PRIOS if none
+        self.setup = 0  # bits of the pins that go out ahead of the rest when they change
+        self.other = None  # the expander's other port, once it has a latch
+
+
+class LatchPin:
+
+    def __init__(self, bus, latch, bit, priority):
+        self._bus = bus
+        self._latch = latch
+        self._bit = bit
+        self._priority = priority
+
+    def __call__(self, val=None):
+        return self.value(val)
+
+    def value(self, val=None):
+        # if val, queue a write, else the level the pin is (or will be after the next flush) driven to
+        if val is None:
+            return 1 if self._latch.value & self._bit else 0
+        self._bus.write(self._latch, self._bit, val, self._priority)
+
+    def on(self):
+        self._bus.write(self._latch, self._bit, 1, self._priority)
+
+    def off(self):
+        self._bus.write(self._latch, self._bit, 0, self._priority)
+
+    def send(self, val):
+        # write and send the port at once, for an edge that can't wait for the next flush
+        self._bus.write(self._latch, self._bit, val, self._priority)
+        self._bus.send_now(self._latch)
+
+
+class BusArbiter:
+
+    def __init__(self):
+        self.latches = []
+        self._buf1 = bytearray(1)  # preallocated, a flush doesn't allocate
+        self._buf2 = bytearray(2)
+        self._now1 = bytearray(1)  # send_now's, a timer callback's send can't overwrite a flush's buffer
+        self._now2 = bytearray(2)
+
+        self.writes = 0  # pin writes queued
+        self.flushes = 0  # flushes that sent something
+        self.transactions = 0
+        self.bytes = 0  # on the wire, device address and register included
+        self.elided = 0  # ports queued but left as they were, e.g. a pin set and cleared in one tick
+
+    def pin(self, mcp, pin, priority=PRIO_LOW, setup=False):
+        """
+        Make an expander pin an output driven through the arbiter.
+
+        :param mcp: mcp23017.MCP23017 the pin is on
+        :param pin: 0-15
+        :param priority: PRIO_SOLENOID, PRIO_STEP or PRIO_LOW, the port takes the most urgent of its queued writes
+        :param setup: True if a change must reach the expander before the port's other pins change, e.g. a DIR
+        :return: LatchPin, callable like machine.Pin
+        """
+        port = mcp.portb if pin // 8 else mcp.porta
+        mcp.pin(pin, mode=0)
+        latch = self._latch(mcp, port)
+        bit = 1 << (pin % 8)
+        if setup:
+            latch.setup |= bit
+        return LatchPin(self, latch, bit, priority)
+
+    def _latch(self, mcp, port):
+        for latch in self.latches:
+            if latch.port is port:
+                return latch
+        latch = Latch(mcp, port)
+        for other in self.latches:
+            if other.mcp is mcp:
+                other.other = latch
+                latch.other = other
+        self.latches.append(latch)
+        return latch
+
+    def write(self, latch, mask, level, priority):
+        # read and store in one statement, a scheduled callback (see solenoid.py) can't run in between
+        if level:
+            latch.value |= mask
+        else:
+            latch.value &= 0xFF ^ mask
+        if priority < latch.priority:
+            latch.priority = priority
+        self.writes = (self.writes + 1) & 0x3FFFFFFF
+
+    def pending(self):
+        for latch in self.latches:
+            if latch.priority < NUM_PRIOS:
+                return True
+        return False
+
+    def send_now(self, latch):
+        """
+        Send one port ahead of the flush, with whatever else is queued on it.
+
+        :return: transactions sent
+        """
+        sent = self._send(latch, self._now1, self._now2)
+        if sent:
+            self.transactions = (self.transactions + sent) & 0x3FFFFFFF
+        return sent
+
+    def flush(self):
+        """
+        Send every queued port, most urgent first.
+
+        :return: transactions sent
+        """
+        sent = 0
+        for priority in range(NUM_PRIOS):
+            for latch in self.latches:
+                if latch.priority == priority:
+                    sent += self._send(latch, self._buf1, self._buf2)
+        if sent:
+            self.flushes = (self.flushes + 1) & 0x3FFFFFFF
+            self.transactions = (self.transactions + sent) & 0x3FFFFFFF
+        return sent
+
+    def _send(self, latch, buf1, buf2):
+        latch.priority = NUM_PRIOS
+        other = latch.other
+        if latch.value == latch.sent:
+            self.elided = (self.elided + 1) & 0x3FFFFFFF
+            return 0
+
+        mcp = latch.mcp
+        sent = self._settle(latch, buf1)
+        # in bank 0 with sequential addressing OLATB follows OLATA, a queued other port goes in the same write
+        if other is not None and other.priority < NUM_PRIOS and other.value != other.sent \
+                and mcp._config & 0xA0 == 0:
+            other.priority = NUM_PRIOS
+            sent += self._settle(other, buf1)
+            if latch.reg > other.reg:
+                latch, other = other, latch
+            buf2[0] = latch.value
+            buf2[1] = other.value
+            mcp._i2c.writeto_mem(mcp._address, latch.reg, buf2)
+            latch.sent = latch.value
+            other.sent = other.value
+            self.bytes = (self.bytes + 4) & 0x3FFFFFFF
+            return sent + 1
+
+        buf1[0] = latch.value
+        mcp._i2c.writeto_mem(mcp._address, latch.reg, buf1)
+        latch.sent = latch.value
+        self.bytes = (self.bytes + 3) & 0x3FFFFFFF
+        return sent + 1
+
+    def _settle(self, latch, buf1):
+        # send the changed setup pins alone, if other pins of the port change too, so they lead the others
+        changed = latch.value ^ latch.sent
+        if changed & latch.setup == 0 or changed & ~latch.setup == 0:
+            return 0
+        value = latch.sent ^ (changed & latch.setup)
+        buf1[0] = value
+        mcp = latch.mcp
+        mcp._i2c.writeto_mem(mcp._address, latch.reg, buf1)
+        latch.sent = value
+        self.bytes = (self.bytes + 3) & 0x3FFFFFFF
+        return 1
@@ -0,0 +1,114 @@
+"""
+Tuning values kept on flash.
+
+The file is one little-endian uint16 per key, in key order (2 bytes a key), read once at boot into `values`. A
+shorter file, from a firmware with fewer keys, leaves the missing keys at their defaults; a value outside its
+key's limits is replaced by the default.
+
+set() only changes the value in RAM. commit(), called from the main loop, writes the values once no set() has
+come in for `commit_delay` ms, so a burst of live tuning over serial costs one flash write, and a value tuned
+back to what is already on flash costs none. The values are written to a temp file which is then renamed over
+the config file, so a power cut during a write leaves the old file in place.
+"""
+
+import array
+import os
+
+CONFIG_FILE = "config.bin"
+
+COMMIT_DELAY = 2000  # ms without changes before they are written
+
+# keys
+LAUNCH_DURATION = 0  # solenoid power on time, ms
+SCORE_TIMEOUT = 1  # how long to wait for the beams before a shot is a miss, ms
+BTN_DEBOUNCE = 2  # ms
+BEAM_HOLD = 3  # how long a broken beam stays latched, ms
+FEED_RATE = 4  # loop passes per stepper step
+SCROLL_SPEED = 5  # ms per column of scrolling text
+MATRIX_BRIGHTNESS = 6  # MAX7219 intensity 0..15
+CTRL_BRIGHTNESS = 7  # control pad strip 1..255
+LZ_BRIGHTNESS = 8  # landing zone strip 1..255
+
+NUM_KEYS = 9
+
+NAMES = ("launch_duration", "score_timeout", "btn_debounce", "beam_hold", "feed_rate", "scroll_speed",
+         "matrix_brightness", "ctrl_brightness", "lz_brightness")
+DEFAULTS = (500, 5000, 20, 500, 1, 10, 10, 5, 255)
+LIMITS_MIN = (50, 500, 1, 50, 1, 1, 0, 1, 1)
+LIMITS_MAX = (2000, 30000, 200, 5000, 50, 200, 15, 255, 255)
+
+
+class Config:
+
+    def __init__(self, path=CONFIG_FILE, commit_delay=COMMIT_DELAY):
+        self.path = path
+        self.temp_path = path + ".tmp"
+        self.commit_delay = commit_delay
+
+        self.values = array.array("H", DEFAULTS)
+        self.saved = array.array("H", DEFAULTS)  # what is on flash
+        self.dirty = False
+        self.changed = 0  # tick of the last set()
+        self.writes = 0
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "rb") as f:
+                f.readinto(self.values)
+        except OSError:
+            pass  # never tuned, keep the defaults
+
+        for key in range(NUM_KEYS):
+            if not LIMITS_MIN[key] <= self.values[key] <= LIMITS_MAX[key]:
+                self.values[key] = DEFAULTS[key]
+            self.saved[key] = self.values[key]
+
+    def get(self, key):
+        return self.values[key]
+
+    def set(self, key, value, ticks_elapsed):
+        """
+        Change a value in RAM, it is written to flash by a later commit().
+
+        :return: False if the key or value is out of range
+        """
+        if key >= NUM_KEYS or not LIMITS_MIN[key] <= value <= LIMITS_MAX[key]:
+            return False
+        if self.values[key] != value:
+            self.values[key] = value
+            self.dirty = True
+            self.changed = ticks_elapsed
+        return True
+
+    def commit(self, ticks_elapsed, force=False):
+        """
+        Write the values out if they changed and have been left alone for commit_delay ms.
+
+        :param force: write now, regardless of the delay
+        :return: True if the file was written
+        """
+        if not self.dirty or (not force and ticks_elapsed - self.changed < self.commit_delay):
+            return False
+        self.dirty = False
+
+        same = True
+        for key in range(NUM_KEYS):
+            if self.values[key] != self.saved[key]:
+                same = False
+        if same:
+            return False
+
+        with open(self.temp_path, "wb") as f:
+            f.write(self.values)
+        try:
+            os.rename(self.temp_path, self.path)
+        except OSError:
+            # FAT won't rename over an existing file, littlefs does
+            os.remove(self.path)
+            os.rename(self.temp_path, self.path)
+
+        for key in range(NUM_KEYS):
+            self.saved[key] = self.values[key]
+        self.writes += 1
+        return True
@@ -0,0 +1,123 @@
+"""
+Proportional font for the LED matrix, 7 pixels high, for ASCII 32..126.
+
+Glyphs are packed column bytes, bit 0 the top row - the layout of a MONO_VLSB frame buffer 8 pixels high - so
+rendering text is copying column bytes, and the result goes onto the display with framebuf's blit. Each glyph is
+only as wide as its ink, 1 to 5 columns with one blank column after it, so text takes about two thirds of the
+columns of framebuf's fixed 8x8 font.
+
+    cache = TextCache()
+    frame, width = cache.get("P1 GO!")
+    display.blit(frame, x, 0)
+"""
+
+import array
+import framebuf
+
+FIRST = 32
+LAST = 126
+HEIGHT = 8
+GAP = 1  # blank columns between glyphs
+
+_WIDTHS = (
+    b"\x02\x01\x03\x05\x05\x05\x05\x02\x03\x03\x05\x05\x02\x05\x02\x05\x05\x03\x05\x05\x05\x05\x05\x05\x05\x05\x02\x02\x04\x05\x04\x05"
+    b"\x05\x05\x05\x05\x05\x05\x05\x05\x05\x03\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x03\x05\x03\x05\x05"
+    b"\x03\x05\x05\x05\x05\x05\x05\x05\x05\x03\x04\x04\x03\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x03\x01\x03\x05"
+)
+
+_COLUMNS = (
+    b"\x00\x00\x5f\x07\x00\x07\x14\x7f\x14\x7f\x14\x24\x2a\x7f\x2a\x12\x23\x13\x08\x64\x62\x36\x49\x55"
+    b"\x22\x50\x05\x03\x1c\x22\x41\x41\x22\x1c\x14\x08\x3e\x08\x14\x08\x08\x3e\x08\x08\x50\x30\x08\x08"
+    b"\x08\x08\x08\x60\x60\x20\x10\x08\x04\x02\x3e\x51\x49\x45\x3e\x42\x7f\x40\x42\x61\x51\x49\x46\x21"
+    b"\x41\x45\x4b\x31\x18\x14\x12\x7f\x10\x27\x45\x45\x45\x39\x3c\x4a\x49\x49\x30\x01\x71\x09\x05\x03"
+    b"\x36\x49\x49\x49\x36\x06\x49\x49\x29\x1e\x36\x36\x56\x36\x08\x14\x22\x41\x14\x14\x14\x14\x14\x41"
+    b"\x22\x14\x08\x02\x01\x51\x09\x06\x32\x49\x79\x41\x3e\x7e\x11\x11\x11\x7e\x7f\x49\x49\x49\x36\x3e"
+    b"\x41\x41\x41\x22\x7f\x41\x41\x22\x1c\x7f\x49\x49\x49\x41\x7f\x09\x09\x01\x01\x3e\x41\x41\x51\x32"
+    b"\x7f\x08\x08\x08\x7f\x41\x7f\x41\x20\x40\x41\x3f\x01\x7f\x08\x14\x22\x41\x7f\x40\x40\x40\x40\x7f"
+    b"\x02\x04\x02\x7f\x7f\x04\x08\x10\x7f\x3e\x41\x41\x41\x3e\x7f\x09\x09\x09\x06\x3e\x41\x51\x21\x5e"
+    b"\x7f\x09\x19\x29\x46\x46\x49\x49\x49\x31\x01\x01\x7f\x01\x01\x3f\x40\x40\x40\x3f\x1f\x20\x40\x20"
+    b"\x1f\x7f\x20\x18\x20\x7f\x63\x14\x08\x14\x63\x03\x04\x78\x04\x03\x61\x51\x49\x45\x43\x7f\x41\x41"
+    b"\x02\x04\x08\x10\x20\x41\x41\x7f\x04\x02\x01\x02\x04\x40\x40\x40\x40\x40\x01\x02\x04\x20\x54\x54"
+    b"\x54\x78\x7f\x48\x44\x44\x38\x38\x44\x44\x44\x20\x38\x44\x44\x48\x7f\x38\x54\x54\x54\x18\x08\x7e"
+    b"\x09\x01\x02\x08\x14\x54\x54\x3c\x7f\x08\x04\x04\x78\x44\x7d\x40\x20\x40\x44\x3d\x7f\x10\x28\x44"
+    b"\x41\x7f\x40\x7c\x04\x18\x04\x78\x7c\x08\x04\x04\x78\x38\x44\x44\x44\x38\x7c\x14\x14\x14\x08\x08"
+    b"\x14\x14\x18\x7c\x7c\x08\x04\x04\x08\x48\x54\x54\x54\x20\x04\x3f\x44\x40\x20\x3c\x40\x40\x20\x7c"
+    b"\x1c\x20\x40\x20\x1c\x3c\x40\x30\x40\x3c\x44\x28\x10\x28\x44\x0c\x50\x50\x50\x3c\x44\x64\x54\x4c"
+    b"\x44\x08\x36\x41\x7f\x41\x36\x08\x08\x04\x08\x10\x08"
+)
+
+# first column of each glyph in _COLUMNS
+_START = array.array("H", [0] * (LAST - FIRST + 2))
+for _i in range(LAST - FIRST + 1):
+    _START[_i + 1] = _START[_i] + _WIDTHS[_i]
+
+
+def _index(code):
+    return code - FIRST if FIRST <= code <= LAST else ord("?") - FIRST
+
+
+def text_width(text):
+    """
+    :return: columns the text takes, without a gap after the last glyph
+    """
+    width = 0
+    for ch in text:
+        width += _WIDTHS[_index(ord(ch))] + GAP
+    return width - GAP if width else 0
+
+
+def render(text, buf):
+    """
+    Write the text's columns into buf, which must hold text_width(text) bytes.
+
+    :return: columns written
+    """
+    x = 0
+    for ch in text:
+        i = _index(ord(ch))
+        start = _START[i]
+        for col in range(_WIDTHS[i]):
+            buf[x] = _COLUMNS[start + col]
+            x += 1
+        for _ in range(GAP):
+            if x < len(buf):  # no gap after the last glyph
+                buf[x] = 0
+                x += 1
+    return x
+
+
+class TextCache:
+
+    def __init__(self, size=6):
+        """
+        :param size: texts kept rendered, the least recently used one is replaced
+        """
+        self.texts = [None] * size
+        self.frames = [None] * size
+        self.widths = [0] * size
+        self.used = [0] * size
+        self.clock = 0
+        self.renders = 0
+
+    def get(self, text):
+        """
+        :return: (MONO_VLSB frame buffer of the rendered text, width in columns)
+        """
+        self.clock += 1
+        oldest = 0
+        for i in range(len(self.texts)):
+            if self.texts[i] == text:
+                self.used[i] = self.clock
+                return self.frames[i], self.widths[i]
+            if self.used[i] < self.used[oldest]:
+                oldest = i
+
+        width = text_width(text)
+        buf = bytearray(max(width, 1))
+        render(text, buf)
+        self.texts[oldest] = text
+        self.frames[oldest] = framebuf.FrameBuffer(buf, len(buf), HEIGHT, framebuf.MONO_VLSB)
+        self.widths[oldest] = width
+        self.used[oldest] = self.clock
+        self.renders += 1
+        return self.frames[oldest], width
@@ -0,0 +1,160 @@
+"""
+Input trace recording.
+
+Records, for every pass of MainProgram.update, the tick it ran at and the debounced inputs it saw (the 9
+button states and the 6 latched beam states, packed into a 15-bit word). Replaying those into update gives
+the same run of the state machine.
+
+Passes are stored as a byte stream, most of which are runs of 1 ms passes with no input change:
+
+    0x00-0x7F               run of (n + 1) passes, each 1 ms after the last, inputs unchanged
+    0x80 <delta>            one pass, `delta` ms after the last (varint), inputs unchanged
+    0x81 <delta> <lo> <hi>  one pass, `delta` ms after the last (varint), new input word
+
+RAM use is the fixed write buffer, it is appended to the trace file whenever it fills up. Recording stops once
+the file reaches max_bytes, so a forgotten recorder can't fill the flash.
+"""
+
+MAGIC = b"TTT1"
+
+RUN_MAX = 128
+TAG_DELTA = 0x80
+TAG_INPUT = 0x81
+RECORD_MAX = 10  # most bytes one record() call can add: a finished run, then a tag, a 5 byte delta and a word
+
+INPUTS_IDLE = 0x7FFF  # everything released, no beam broken
+
+
+def pack_inputs(btn_states, beam_states):
+    word = 0
+    for i in range(len(btn_states)):
+        if btn_states[i]:
+            word |= 1 << i
+    for i in range(len(beam_states)):
+        if beam_states[i]:
+            word |= 1 << (9 + i)
+    return word
+
+
+def unpack_inputs(word, btn_states, beam_states):
+    # in place, so nothing is allocated
+    for i in range(len(btn_states)):
+        btn_states[i] = (word >> i) & 1
+    for i in range(len(beam_states)):
+        beam_states[i] = (word >> (9 + i)) & 1
+
+
+class TraceRecorder:
+
+    def __init__(self, path="trace.bin", buf_size=256, max_bytes=64 * 1024):
+        """
+        :param path: trace file, overwritten
+        :param buf_size: bytes buffered in RAM between flash writes
+        :param max_bytes: file size at which recording stops
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.full = False
+        self.buf = bytearray(buf_size)
+        self.buf_len = 0
+        self.last_ticks = 0
+        self.last_word = INPUTS_IDLE
+        self.run = 0  # pending passes in the current run
+        self.passes = 0
+        self.bytes_written = len(MAGIC)
+
+        with open(self.path, "wb") as f:
+            f.write(MAGIC)
+
+    def _put(self, byte):
+        self.buf[self.buf_len] = byte
+        self.buf_len += 1
+
+    def _put_varint(self, value):
+        while value >= 0x80:
+            self._put((value & 0x7F) | 0x80)
+            value >>= 7
+        self._put(value)
+
+    def _end_run(self):
+        if self.run:
+            self._put(self.run - 1)
+            self.run = 0
+
+    def record(self, ticks_elapsed, btn_states, beam_states):
+        if self.full:
+            return
+        if self.buf_len + RECORD_MAX > len(self.buf):
+            self.flush()  # only between records, so a trace cut short by max_bytes still decodes
+        word = pack_inputs(btn_states, beam_states)
+        delta = ticks_elapsed - self.last_ticks
+        self.last_ticks = ticks_elapsed
+        self.passes += 1
+
+        if word == self.last_word and delta == 1:
+            self.run += 1
+            if self.run == RUN_MAX:
+                self._end_run()
+            return
+
+        self._end_run()
+        if word == self.last_word:
+            self._put(TAG_DELTA)
+            self._put_varint(delta)
+        else:
+            self._put(TAG_INPUT)
+            self._put_varint(delta)
+            self._put(word & 0xFF)
+            self._put(word >> 8)
+            self.last_word = word
+
+    def flush(self):
+        if self.buf_len and not self.full:
+            with open(self.path, "ab") as f:
+                f.write(memoryview(self.buf)[:self.buf_len])
+            self.bytes_written += self.buf_len
+            if self.bytes_written + len(self.buf) > self.max_bytes:
+                self.full = True
+        self.buf_len = 0
+
+    def close(self):
+        self._end_run()
+        self.flush()
+
+
+def read_trace(data):
+    """
+    Decode a trace.
+
+    :param data: trace file contents
+    :return: generator of (ticks, input word) per recorded pass
+    """
+    if data[:4] != MAGIC:
+        raise ValueError("not a trace file")
+
+    ticks = 0
+    word = INPUTS_IDLE
+    i = 4
+    while i < len(data):
+        tag = data[i]
+        i += 1
+        if tag < TAG_DELTA:
+            for _ in range(tag + 1):
+                ticks += 1
+                yield ticks, word
+            continue
+
+        delta = 0
+        shift = 0
+        while True:
+            byte = data[i]
+            i += 1
+            delta |= (byte & 0x7F) << shift
+            shift += 7
+            if byte < 0x80:
+                break
+        if tag == TAG_INPUT:
+            word = data[i] | (data[i + 1] << 8)
+            i += 2
+        ticks += delta
+        yield ticks, word
@@ -0,0 +1,157 @@
+"""
+Layered colours for an LED strip.
+
+The menu animation, the board marks, the button hints and the transitions used to write the strip's pixels
+straight, so whichever came last won: a gradient tick wiped the marks, a fill wiped the hints. A Compositor keeps
+three fixed layers per strip, bottom to top LAYER_BACKGROUND (fills and the menu animation), LAYER_BOARD (cells
+scored) and LAYER_HIGHLIGHT (button hints, the computer's target). Each is a compact array of 0xRRGGBB colours
+and a bitmask of the pixels it covers, a pixel shows the topmost layer covering it, or off if none does.
+
+Writes only mark pixels dirty. render() composites the dirty pixels into the strip's buffer, brightness applied,
+and does nothing when none are, so a tick's work is bounded by what changed rather than the whole strip:
+
+    lz = Compositor(lz_leds)
+    lz.fill(LAYER_BACKGROUND, WHITE)
+    lz.set_pixel(LAYER_BOARD, 4, RED)  # stays over any animation on the background
+    lz.render()
+    lz_leds.show()
+
+A layer's colours can also be read straight from an animation frame in the asset pack, see assets.py:
+
+    lz.load(LAYER_BACKGROUND, assets, frame_offset)
+
+Strips up to 30 LEDs, so the masks stay small ints. Nothing allocates.
+"""
+
+import array
+
+from neopixel import interpolate
+
+LAYER_BACKGROUND = 0
+LAYER_BOARD = 1
+LAYER_HIGHLIGHT = 2
+NUM_LAYERS = 3
+
+LAYER_NAMES = ("background", "board", "highlight")
+
+PRIMARIES = ((0, 0, 0), (0, 0, 255), (0, 255, 0), (0, 255, 255),
+             (255, 0, 0), (255, 0, 255), (255, 255, 0), (255, 255, 255))  # every channel on or off, the menu's
+
+
+class Compositor:
+
+    def __init__(self, leds):
+        """
+        :param leds: neopixel.Neopixel or Lane to render into, it keeps its own brightness
+        """
+        self.leds = leds
+        self.num_leds = leds.num_leds
+        self.all = (1 << self.num_leds) - 1
+        self.colors = array.array("I", [0] * (NUM_LAYERS * self.num_leds))  # layer by layer, 0xRRGGBB
+        self.masks = array.array("I", [0] * NUM_LAYERS)  # bit i set: the layer covers pixel i
+        colors = memoryview(self.colors)
+        self.views = [colors[layer * self.num_leds:(layer + 1) * self.num_leds] for layer in range(NUM_LAYERS)]
+        self.dirty = self.all  # pixels to render, all of them to start with
+
+        self.renders = 0
+        self.pixels_rendered = 0
+
+    def set_pixel(self, layer, pixel, rgb):
+        """
+        :param layer: LAYER_BACKGROUND, LAYER_BOARD or LAYER_HIGHLIGHT
+        :param pixel: index on the strip
+        :param rgb: (r, g, b) tuple, a shared constant so nothing is built
+        """
+        self.colors[layer * self.num_leds + pixel] = rgb[0] << 16 | rgb[1] << 8 | rgb[2]
+        self.masks[layer] |= 1 << pixel
+        self.dirty |= 1 << pixel
+
+    def clear_pixel(self, layer, pixel):
+        # uncover one pixel of the layer, what's under it shows again
+        self.masks[layer] &= ~(1 << pixel)
+        self.dirty |= 1 << pixel
+
+    def fill(self, layer, rgb):
+        color = rgb[0] << 16 | rgb[1] << 8 | rgb[2]
+        colors = self.colors
+        base = layer * self.num_leds
+        for i in range(self.num_leds):
+            colors[base + i] = color
+        self.masks[layer] = self.all
+        self.dirty = self.all
+
+    def gradient(self, layer, pixel1, pixel2, left_rgb, right_rgb):
+        """
+        Colours between pixel1 and pixel2 (inclusive) going from left_rgb to right_rgb, interpolated as
+        Neopixel.set_pixel_line_gradient does.
+        """
+        left = min(pixel1, pixel2)
+        span = max(pixel1, pixel2) - left
+        if span == 0:
+            return
+        r_diff = right_rgb[0] - left_rgb[0]
+        g_diff = right_rgb[1] - left_rgb[1]
+        b_diff = right_rgb[2] - left_rgb[2]
+        colors = self.colors
+        base = layer * self.num_leds + left
+        for i in range(span + 1):
+            red = interpolate(left_rgb[0], r_diff, i, span)
+            green = interpolate(left_rgb[1], g_diff, i, span)
+            blue = interpolate(left_rgb[2], b_diff, i, span)
+            colors[base + i] = red << 16 | green << 8 | blue
+        covered = ((1 << (span + 1)) - 1) << left
+        self.masks[layer] |= covered
+        self.dirty |= covered
+
+    def load(self, layer, assets, offset):
+        """
+        Read a frame of num_leds little-endian 0xRRGGBB words from an asset pack into the layer, covering it.
+
+        :param assets: assets.AssetPack
+        :param offset: where the frame starts, from AssetPack.locate
+        """
+        assets.readinto(offset, self.views[layer])
+        self.masks[layer] = self.all
+        self.dirty = self.all
+
+    def clear(self, layer):
+        # uncover the whole layer
+        self.dirty |= self.masks[layer]
+        self.masks[layer] = 0
+
+    def invalidate(self):
+        # render every pixel again, e.g. after the strip's brightness changed
+        self.dirty = self.all
+
+    def render(self):
+        """
+        Composite the dirty pixels into the strip's buffer.
+
+        :return: False if nothing was dirty
+        """
+        dirty = self.dirty
+        if not dirty:
+            return False
+        self.dirty = 0
+
+        leds = self.leds
+        pixels = leds.pixels
+        colors = self.colors
+        masks = self.masks
+        n = self.num_leds
+        count = 0
+        for px in range(n):
+            bit = 1 << px
+            if not dirty & bit:
+                continue
+            color = 0
+            for layer in range(NUM_LAYERS - 1, -1, -1):
+                if masks[layer] & bit:
+                    color = colors[layer * n + px]
+                    break
+            pixels[px] = leds.pixel_value(color >> 16, color >> 8 & 0xFF, color & 0xFF)
+            count += 1
+
+        self.renders = (self.renders + 1) & 0x3FFFFFFF
+        self.pixels_rendered = (self.pixels_rendered + count) & 0x3FFFFFFF
+        return True
@@ -1,28 +1,64 @@
-import max7219
+import font
+import framebuf
+from assets import KIND_TEXT
+from matrix_display import MatrixDisplay
 from machine import Pin, SPI
 
+# (SPI bus, sck, mosi, cs, modules) for each chain, left to right. a longer display adds chains on their own CS
+# pins, each refreshed only when its part of the frame changes; a chain on SPI 0 shares sck 18 and mosi 19. this
+# board has no GPIO free for another CS though: 0-1 are the expander's I2C, 2-5 the steppers, 6-14 the buttons,
+# 15-16 the strips, 17-19 the matrix and 20-22, 26-28 the beams (23-25 and 29 aren't on the header). a second
+# chain needs one of them freed first, e.g. a button moved onto the expander.
+CHAINS = ((0, 18, 19, 17, 8),)
+
 
 class LEDMatrix:
 
-    def __init__(self, pin_sck=18, pin_mosi=19, pin_cs=17):
+    def __init__(self, chains=CHAINS, brightness=10, scroll_speed=10, baudrate=1000000, assets=None):
         # ----------------------------------------- CONFIGURE IO ----------------------------------------- #
 
-        self.display = max7219.Matrix8x8(SPI(0, sck=Pin(pin_sck), mosi=Pin(pin_mosi)), Pin(pin_cs, Pin.OUT), 8)
+        buses = {}
+        specs = []
+        for bus, sck, mosi, cs, modules in chains:
+            if bus not in buses:
+                buses[bus] = SPI(bus, baudrate=baudrate, sck=Pin(sck), mosi=Pin(mosi))
+            specs.append((buses[bus], Pin(cs, Pin.OUT), modules))
+        self.display = MatrixDisplay(specs)
+        self.width = 8 * self.display.num
+
+        # messages pre-rendered in the asset pack are read into one buffer as wide as the widest of them, others
+        # are rendered once in the proportional font and blitted from the cache for every frame
+        self.assets = assets
+        self.asset_buf = bytearray(max(assets.max_columns if assets is not None else 0, 1))
+        self.asset_frame = framebuf.FrameBuffer(self.asset_buf, len(self.asset_buf), font.HEIGHT, framebuf.MONO_VLSB)
+        self.text_cache = font.TextCache()
+        self.frame = None  # rendered current message
+        self.frame_width = 0  # its columns
+        self.frame_x = 0  # where static and flashing messages are drawn, centred
 
         # ----------------------------------------- INITIALIZE ----------------------------------------- #
 
-        self.display.brightness(10)
+        self.brightness = brightness  # configured intensity, fades start from or return to it
+        self.intensity = brightness  # intensity register now
+        self.display.brightness(brightness)
+        self.powered = True  # flashes blank the display with the shutdown register, not by redrawing
+
+        self.fade_from = 0
+        self.fade_to = None  # None for the configured brightness, which may change during the fade
+        self.fade_time = 0  # ms, 0 when no fade is running
+        self.fade_start = -1  # tick of the first update of the fade
+
         self.reset_disp()
 
         # ----------------------------------------- PROG PARAMS ----------------------------------------- #
 
-        self.scroll_speed = 10  # ms (accuracy of 10 ms)
+        self.default_scroll_speed = scroll_speed  # ms, for messages that don't pick their own
+        self.scroll_speed = scroll_speed  # ms (accuracy of 10 ms)
         self.next_update = 0
         self.cur_message = ""
 
         self.flash = False
         self.flash_rate = 0
-        self.disp_empty = False
 
         self.column = 0
         self.buf_x = 0
@@ -34,9 +70,7 @@ class LEDMatrix:
         else:
             if ticks_elapsed >= self.next_update and self.column > 0:
                 if self.buf_x > -self.column:
-                    self.display.fill(0)
-                    self.display.text(self.cur_message, self.buf_x, 0, 1)
-                    self.display.show()
+                    self.draw(self.buf_x)
 
                     self.buf_x = self.buf_x - 1
                     self.next_update = ticks_elapsed + self.scroll_speed
@@ -45,18 +79,30 @@ class LEDMatrix:
 
             if self.flash and self.column == 0:
                 if ticks_elapsed >= self.next_update:
-                    if not self.disp_empty:
-                        self.display.fill(0)
-                        self.display.text(self.cur_message, 0, 0, 1)
-                        self.display.show()
-                        self.disp_empty = True
-                    else:
-                        self.display.fill(0)
-                        self.display.show()
-                        self.disp_empty = False
-
+                    # the frame stays in the modules, a flash is one shutdown write
+                    self.set_power(not self.powered)
                     self.next_update = ticks_elapsed + self.flash_rate  # 250 ms flash
 
+        if self.fade_time:
+            self.update_fade(ticks_elapsed)
+
+    def due(self, ticks_elapsed):
+        # whether update has a scroll step, flash or fade step to do, the loop can put it off otherwise
+        if self.fade_time or self.cur_message == "" or self.cur_message is None:
+            return True
+        return ticks_elapsed >= self.next_update and (self.column > 0 or self.flash)
+
+    def update_fade(self, ticks_elapsed):
+        if self.fade_start < 0:
+            self.fade_start = ticks_elapsed
+        elapsed = ticks_elapsed - self.fade_start
+        end = self.brightness if self.fade_to is None else self.fade_to
+        if elapsed >= self.fade_time:
+            self.fade_time = 0
+            self.set_intensity(end)
+        else:
+            self.set_intensity(self.fade_from + (end - self.fade_from) * elapsed // self.fade_time)
+
     def disp_flashing_message(self, message, rate):
         if message == self.cur_message:
             return
@@ -64,32 +110,86 @@ class LEDMatrix:
         self.reset_disp()
         self.flash = True
         self.flash_rate = rate
-        self.cur_message = message
-        self.display.fill(0)
-        self.display.text(self.cur_message, 0, 0, 1)
-        self.display.show()
+        self.set_message(message)
+        self.draw(self.frame_x)
+        self.set_power(False)  # the first update lights it, as when the flash redrew the frame
 
     def disp_static_message(self, message):
         if message == self.cur_message:
             return
 
         self.reset_disp()
-        self.cur_message = message
-        self.display.fill(0)
-        self.display.text(self.cur_message, 0, 0, 1)
-        self.display.show()
-
-    def disp_scrolling_message(self, message, scroll_speed=10):
+        self.set_message(message)
+        self.draw(self.frame_x)
+
+    # ----------------------------------------- EFFECTS ----------------------------------------- #
+
+    def set_brightness(self, brightness):
+        self.brightness = brightness
+        if not self.fade_time:
+            self.set_intensity(brightness)
+
+    def set_intensity(self, level):
+        if level != self.intensity:
+            self.intensity = level
+            self.display.brightness(level)
+
+    def set_power(self, on):
+        if on != self.powered:
+            self.powered = on
+            self.display.power(on)
+
+    def fade(self, start, end, duration):
+        """
+        Ramp the intensity register from start to end, a write for each level on the way. The frame is not
+        redrawn, so this works on top of any message.
+
+        :param start: intensity 0..15, None for the configured brightness
+        :param end: intensity 0..15, None for the configured brightness
+        :param duration: ms, counted from the next update
+        """
+        self.fade_from = self.brightness if start is None else start
+        self.fade_to = end
+        self.fade_time = max(1, duration)
+        self.fade_start = -1
+        self.set_intensity(self.fade_from)
+
+    def fade_in(self, duration):
+        self.fade(0, None, duration)
+
+    def disp_scrolling_message(self, message, scroll_speed=None):
         if message == self.cur_message:
             return
 
         self.reset_disp()
-        self.cur_message = message
-        self.scroll_speed = scroll_speed
-        self.column = len(message) * 8
+        self.column = self.set_message(message)
+        self.scroll_speed = scroll_speed if scroll_speed is not None else self.default_scroll_speed
         self.buf_x = self.buf_start
 
+    def set_message(self, message):
+        # read the message from the asset pack, or render (or find in the cache) it, returns its width in columns
+        self.cur_message = message
+        offset = self.assets.locate(message, KIND_TEXT) if self.assets is not None else -1
+        if offset >= 0:
+            self.assets.readinto(offset, self.asset_buf)
+            self.frame = self.asset_frame
+            width = self.assets.width
+        else:
+            self.frame, width = self.text_cache.get(message)
+        self.frame_width = width
+        self.frame_x = (self.width - width) // 2 if width < self.width else 0
+        return width
+
+    def draw(self, x):
+        self.display.fill(0)
+        self.display.blit(self.frame, x, 0)
+        if self.frame is self.asset_frame:
+            # past the message's columns the buffer holds what was read after it
+            self.display.fill_rect(x + self.frame_width, 0, self.width, font.HEIGHT, 0)
+        self.display.show()
+
     def reset_disp(self):
+        self.set_power(True)
         self.column = 0
         self.flash = False
         self.flash_rate = 0
@@ -0,0 +1,118 @@
+"""
+Load shedding for the main loop.
+
+The loop expects a pass every millisecond (see StepperController.update_steppers), but a pass that sends a matrix
+frame, both strips and a telemetry frame, or prints, can take longer, and then everything slows down together,
+the stepper feed included. LoadBudget times every pass and keeps a running average of what they cost. Once the
+average goes over the budget it sheds: low priority work that is due (the LED tick, matrix steps, telemetry)
+asks allow() first and is put off, one such task at most a pass, each for no longer than its own max_defer.
+The inputs, steppers and state machine never ask and keep their pace, the solenoid is timed by its own timer.
+Shedding stops once the average has been back under the budget for `hold` ms.
+
+    budget = LoadBudget()
+    budget.start(ticks)  # top of the pass
+    if led_due and budget.allow(TASK_LEDS):
+        ...
+    budget.end()  # bottom of the pass
+
+Nothing allocates, the counters wrap like the rest of the firmware's.
+"""
+
+import array
+import time
+
+TASK_LEDS = 0
+TASK_MATRIX = 1
+TASK_TELEMETRY = 2
+NUM_TASKS = 3
+
+TASK_NAMES = ("leds", "matrix", "telemetry")
+
+# longest each task is put off while shedding, ms
+MAX_DEFER = (300, 50, 500)
+
+
+class LoadBudget:
+
+    def __init__(self, budget_us=1000, hold=200, max_defer=MAX_DEFER):
+        """
+        :param budget_us: what a pass may cost on average
+        :param hold: ms under budget before shedding stops
+        :param max_defer: per task, the longest it is put off, ms
+        """
+        self.budget_us = budget_us
+        self.hold = hold
+        self.max_defer = array.array("H", max_defer)
+
+        self.avg_us = 0  # running average cost of a pass, weight 1/4 on the newest
+        self.start_us = 0
+        self.now = 0  # tick of the pass running
+        self.shed_until = 0  # shedding while now is before this
+        self.shedding = False
+        self.ran_deferred = False  # a put off task ran this pass
+        self.waiting = array.array("i", [-1] * NUM_TASKS)  # tick a task was first put off, -1 if not waiting
+
+        self.worst_us = 0
+        self.episodes = 0  # times shedding started
+        self.shed_ticks = 0  # passes spent shedding
+        self.deferred = array.array("I", [0] * NUM_TASKS)  # passes each task was put off
+
+    def start(self, ticks_elapsed):
+        # top of the pass
+        self.start_us = time.ticks_us()
+        self.now = ticks_elapsed
+        self.ran_deferred = False
+
+    def end(self):
+        # bottom of the pass
+        cost = time.ticks_diff(time.ticks_us(), self.start_us)
+        if cost > self.worst_us:
+            self.worst_us = cost
+        self.avg_us += (cost - self.avg_us) >> 2
+
+        if self.avg_us > self.budget_us:
+            if not self.shedding:
+                self.shedding = True
+                self.episodes = (self.episodes + 1) & 0x3FFFFFFF
+            self.shed_until = self.now + self.hold
+        elif self.shedding and self.now >= self.shed_until:
+            self.shedding = False
+            for task in range(NUM_TASKS):
+                self.waiting[task] = -1
+
+        if self.shedding:
+            self.shed_ticks = (self.shed_ticks + 1) & 0x3FFFFFFF
+
+    def allow(self, task):
+        """
+        Ask before running a low priority task that is due.
+
+        :param task: TASK_LEDS, TASK_MATRIX or TASK_TELEMETRY
+        :return: True to run it now, False to leave it due for a later pass
+        """
+        if not self.shedding:
+            return True
+
+        waiting = self.waiting[task]
+        if waiting < 0:
+            self.waiting[task] = self.now
+        elif self.now - waiting >= self.max_defer[task] and not self.ran_deferred:
+            self.waiting[task] = -1
+            self.ran_deferred = True
+            return True
+
+        self.deferred[task] = (self.deferred[task] + 1) & 0x3FFFFFFF
+        return False
+
+    def reset(self):
+        self.worst_us = 0
+        self.episodes = 0
+        self.shed_ticks = 0
+        for task in range(NUM_TASKS):
+            self.deferred[task] = 0
+
+    def dump(self):
+        print("budget {} us a pass, avg {} us, worst {} us, {} shedding".format(
+            self.budget_us, self.avg_us, self.worst_us, "now" if self.shedding else "not"))
+        print("shed {} times, {} passes, deferred {}".format(self.episodes, self.shed_ticks, " ".join(
+            "{} {}".format(TASK_NAMES[task], self.deferred[task]) for task in range(NUM_TASKS))))
@@ -0,0 +1,108 @@
+"""
+Buffered, level-gated logging for the main loop.
+
+print() blocks on USB CDC, so hot paths log into a preallocated ring instead. A record is the tick, the level,
+a reference to the (constant) format string and up to three integer arguments - nothing is formatted or
+allocated when logging. Records are formatted and printed by drain(), which the main loop calls from its
+100 ms LED tick. When the ring is full the oldest record is overwritten and counted as dropped.
+
+Records below MIN_LEVEL are compiled out of the check, records below the runtime level are skipped.
+"""
+
+import array
+import time
+from micropython import const
+
+DEBUG = const(0)
+INFO = const(1)
+WARN = const(2)
+ERROR = const(3)
+
+MIN_LEVEL = const(0)  # raise to drop lower levels regardless of the runtime level
+
+RING_SIZE = const(64)
+
+_LEVEL_NAMES = ("DEBUG", "INFO", "WARN", "ERROR")
+
+_ticks = array.array("I", [0] * RING_SIZE)
+_levels = bytearray(RING_SIZE)
+_formats = [None] * RING_SIZE
+_args = array.array("i", [0] * (RING_SIZE * 3))
+
+_head = 0  # next record to write
+_tail = 0  # next record to drain
+_count = 0
+
+level = INFO
+dropped = 0
+
+
+def set_level(lvl):
+    global level
+    level = lvl
+
+
+def log(lvl, fmt, a=0, b=0, c=0):
+    """
+    :param lvl: DEBUG, INFO, WARN or ERROR
+    :param fmt: format string with up to three {} placeholders, should be a literal so it is not allocated
+    :param a: integer arguments for the placeholders
+    """
+    global _head, _tail, _count, dropped
+    if lvl < MIN_LEVEL or lvl < level:
+        return
+
+    i = _head
+    _ticks[i] = time.ticks_ms()
+    _levels[i] = lvl
+    _formats[i] = fmt
+    _args[i * 3] = a
+    _args[i * 3 + 1] = b
+    _args[i * 3 + 2] = c
+
+    _head = (i + 1) % RING_SIZE
+    if _count == RING_SIZE:
+        _tail = _head  # overwrote the oldest
+        dropped += 1
+    else:
+        _count += 1
+
+
+def debug(fmt, a=0, b=0, c=0):
+    log(DEBUG, fmt, a, b, c)
+
+
+def info(fmt, a=0, b=0, c=0):
+    log(INFO, fmt, a, b, c)
+
+
+def warn(fmt, a=0, b=0, c=0):
+    log(WARN, fmt, a, b, c)
+
+
+def error(fmt, a=0, b=0, c=0):
+    log(ERROR, fmt, a, b, c)
+
+
+def pending():
+    return _count
+
+
+def drain(max_records=RING_SIZE):
+    """
+    Format and print up to `max_records` buffered records, oldest first. Call from a low priority point.
+    """
+    global _tail, _count, dropped
+    if dropped:
+        print("[log] {} records dropped".format(dropped))
+        dropped = 0
+
+    n = 0
+    while _count and n < max_records:
+        i = _tail
+        print("{:>10} {:5} ".format(_ticks[i], _LEVEL_NAMES[_levels[i]]) +
+              _formats[i].format(_args[i * 3], _args[i * 3 + 1], _args[i * 3 + 2]))
+        _formats[i] = None
+        _tail = (i + 1) % RING_SIZE
+        _count -= 1
+        n += 1
@@ -1,25 +1,36 @@
+import array
+import gc
 import os
 import random
 
+import ai
+import bus_arbiter
+import config
+from aim_table import AimTable
+from ballistics import Ballistics
+from shot_correction import ShotCorrector, beam_mask, NO_CELL
+
 import machine
 import neopixel
 import time
+from micropython import const
+
+import load_budget
+import log
+import profiler
+import input_trace
+import remote
+from boot_timeline import BootTimeline
 
+from assets import AssetPack, KIND_FRAMES, MENU_GRADIENT
+from led_compositor import Compositor, LAYER_BACKGROUND, LAYER_BOARD, LAYER_HIGHLIGHT, PRIMARIES
 from led_matrix import LEDMatrix
 from mcp23017 import MCP23017
+from solenoid import Solenoid
 from stepper import StepperController
+from step_convert import deg_to_steps
 from machine import Pin, I2C
 
-stat = os.statvfs("/")
-size = stat[1] * stat[2]
-free = stat[0] * stat[3]
-used = size - free
-
-print("Size : {:,} bytes, {:,} KB, {} MB".format(size, size / 1024, size / 1024 ** 2))
-print("Used : {:,} bytes, {:,} KB, {} MB".format(used, used / 1024, used / 1024 ** 2))
-print("Free : {:,} bytes, {:,} KB, {} MB, {} % free".format(free, free / 1024, free / 1024 ** 2,
-                                                            100 - (round(used / size, 4) * 100)))
-
 MAIN_MENU = 0
 SELECT_MODE = 1
 MANUAL_MODE = 2
@@ -28,6 +39,39 @@ GAME_OVER = 4
 
 LAUNCH = 5
 WAIT_SCORE = 6
+RAPID_MODE = 7
+
+# colours are shared constants, so setting a pixel doesn't build a tuple
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+WHITE = (255, 255, 255)
+
+# per landing zone led, the beams a ball landing on it breaks (see beam_mask) and the board cell it is
+SCORE_MASKS = (0b001001, 0b001010, 0b001100, 0b010100, 0b010010, 0b010001, 0b100001, 0b100010, 0b100100)
+SCORE_CELLS = (8, 7, 6, 3, 4, 5, 2, 1, 0)
+
+NUM_STATES = 8
+STATE_NAMES = ("main_menu", "select_mode", "manual", "auto", "game_over", "launch", "wait_score", "rapid")
+
+PROFILE = const(1)  # set to 0 to compile the loop profiler out
+RECORD_TRACE = const(0)  # set to 1 to record the inputs to trace.bin, replay it with sim/replay.py
+BOOT_CHECKS = const(0)  # set to 1 to scan for the expander at boot and print flash usage once idle
+REMOTE = const(1)  # binary command and telemetry protocol on the USB serial port, see remote.py
+GC_MANUAL = const(1)  # set to 0 to leave garbage collection automatic
+GC_RESERVE = const(16 * 1024)  # with manual gc, collect in any state once free heap drops below this
+
+
+def print_storage():
+    stat = os.statvfs("/")
+    size = stat[1] * stat[2]
+    free = stat[0] * stat[3]
+    used = size - free
+
+    print("Size : {:,} bytes, {:,} KB, {} MB".format(size, size / 1024, size / 1024 ** 2))
+    print("Used : {:,} bytes, {:,} KB, {} MB".format(used, used / 1024, used / 1024 ** 2))
+    print("Free : {:,} bytes, {:,} KB, {} MB, {} % free".format(free, free / 1024, free / 1024 ** 2,
+                                                                100 - (round(used / size, 4) * 100)))
 
 
 class MainProgram:
@@ -35,6 +79,14 @@ class MainProgram:
     def __init__(self):
         # ----------------------------------------- CONFIGURE IO ----------------------------------------- #
         print("Starting up...")
+        self.boot = BootTimeline()
+        self.boot.stage("imports")
+        self.interactive = False  # set after the first update, the end of the boot timeline
+
+        # tuning values from flash, see config.py. apply_config hands them out once everything is built.
+        self.config = config.Config()
+        cfg = self.config.values
+        self.boot.stage("config")
 
         # configure LED
         self.pico_led = machine.Pin("LED", machine.Pin.OUT)
@@ -44,43 +96,90 @@ class MainProgram:
         self.btn_idx = [6, 7, 8, 9, 10, 11, 12, 13, 14]
         self.btn_pins = [machine.Pin(pin, machine.Pin.IN, machine.Pin.PULL_UP) for pin in self.btn_idx]
         self.btn_states = [1] * len(self.btn_idx)
-        self.btn_change_counter = [0 for _ in self.btn_pins]  # used in debouncing
-        self.btn_debounce_delay = 20  # in millis
+        self.btn_change_time = [-1 for _ in self.btn_pins]  # tick a pending change was first seen, -1 if none
+        self.btn_debounce_delay = cfg[config.BTN_DEBOUNCE]  # in millis
 
         # configure beam break IO
         self.beam_idx = [20, 21, 22, 26, 27, 28]
         self.beam_pins = [machine.Pin(pin, machine.Pin.IN, machine.Pin.PULL_UP) for pin in self.beam_idx]
         self.beam_states = [1] * len(self.beam_idx)
-        self.beam_reset_counter = 0
+        self.beam_raw = [1] * len(self.beam_idx)  # read every tick, before latching into beam_states
+        self.beam_reset_time = 0  # tick the latched beam states were last changed
+        self.beam_hold = cfg[config.BEAM_HOLD]  # how long a broken beam stays latched, in millis
+        self.beam_time = array.array("i", [-1] * len(self.beam_idx))  # tick each latched beam was first seen broken
+        self.boot.stage("gpio")
+
+        # pre-rendered messages and animation frames, read from flash as they are shown, see assets.py
+        self.assets = AssetPack()
+        self.boot.stage("assets")
 
         # configure LED matrix
-        self.led_matrix = LEDMatrix()
+        self.led_matrix = LEDMatrix(brightness=cfg[config.MATRIX_BRIGHTNESS], scroll_speed=cfg[config.SCROLL_SPEED],
+                                    assets=self.assets)
         self.led_matrix.disp_static_message("INIT")
+        self.boot.stage("matrix")
 
-        # configure control pad LEDs
-        self.ctrl_leds = neopixel.Neopixel(9, 0, 15, "GRB")
-        self.ctrl_leds.brightness(5)
-        self.ctrl_leds.fill((255, 255, 255))
-        self.ctrl_leds.show()
+        # both strips are clocked out together by one state machine, pins 15 and 16. they are first sent by the LED
+        # tick of the first update. nothing writes their pixels but the compositors, see led_compositor.py.
+        self.strips = neopixel.ParallelStrips(0, 15, 2, 9, "GRB")
 
-        time.sleep_ms(10)
+        # configure control pad LEDs
+        self.ctrl_leds = self.strips.lane(0)
+        self.ctrl_leds.brightness(cfg[config.CTRL_BRIGHTNESS])
+        self.ctrl_layers = Compositor(self.ctrl_leds)
+        self.ctrl_layers.fill(LAYER_BACKGROUND, WHITE)
 
         # configure landing zone LEDs
-        self.lz_leds = neopixel.Neopixel(9, 1, 16, "GRB")
-        self.lz_leds.brightness(255)
-        self.lz_leds.fill((255, 255, 255))
-        self.lz_leds.show()
+        self.lz_leds = self.strips.lane(1)
+        self.lz_leds.brightness(cfg[config.LZ_BRIGHTNESS])
+        self.lz_layers = Compositor(self.lz_leds)
+        self.lz_layers.fill(LAYER_BACKGROUND, WHITE)
+
+        # the menu animation's frames, -1 to compute the gradients when the pack hasn't got them for these strips
+        self.menu_frames = self.assets.locate(MENU_GRADIENT, KIND_FRAMES)
+        if self.menu_frames >= 0 and self.assets.width != self.lz_leds.num_leds:
+            self.menu_frames = -1
+        self.boot.stage("strips")
 
         # configure expander board
-        self.mcp = MCP23017(I2C(0, scl=Pin(1), sda=Pin(0)), 0x20)
+        self.mcp = MCP23017(I2C(0, scl=Pin(1), sda=Pin(0)), 0x20, scan=BOOT_CHECKS)
+
+        # expander outputs are queued and sent once a tick by the arbiter, see bus_arbiter.py. the solenoid's
+        # edges skip the queue, its pulse is timed by a hardware timer.
+        self.bus = bus_arbiter.BusArbiter()
+        self.solenoid = Solenoid(self.bus.pin(self.mcp, 0, bus_arbiter.PRIO_SOLENOID))
+        self.boot.stage("expander")
 
-        # configure stepper controller
-        self.steppers = StepperController(self.mcp)
+        # configure stepper controller, homing runs in the loop
+        self.steppers = StepperController(self.mcp, self.bus)
         self.steppers.home()
+        self.steppers.feed_rate = cfg[config.FEED_RATE]
+        self.bus.flush()
+        self.boot.stage("steppers")
+
+        # load calibrated aim for each cell
+        self.aim_table = AimTable()
+        self.boot.stage("aim_table")
+
+        # fallback aim for cells that have not been calibrated, and per cell offsets learnt from where auto shots
+        # land. the model's aim cache comes from ballistics_table.py, without it building the model takes longer
+        # than the rest of the boot, see load_aim_model.
+        self.ballistics = None
+        self.corrector = None
+
+        # run one at a time from the menu's LED tick once the loop is up
+        self.deferred = [self.load_aim_model]
+        if BOOT_CHECKS:
+            self.deferred.append(print_storage)
 
         # ----------------------------------------- PROG PARAMS ----------------------------------------- #
 
         self.game_state = MAIN_MENU  # game state machine - are we disp instructions? are we playing?
+        self.active_state = -1  # state whose entry handler last ran, a change to game_state is picked up by update
+        self.state_table = self.build_state_table()
+        self.state_entries = array.array("I", [0] * NUM_STATES)  # transitions into each state
+        self.state_time = array.array("I", [0] * NUM_STATES)  # ms spent in each state, up to the last transition
+        self.state_entered = 0
         self.last_game_state = MAIN_MENU  # used as a way to loop back after launching/scoring
         self.current_player = True  # true player 1, false player 2
 
@@ -90,59 +189,145 @@ class MainProgram:
             0, 0, 0
         ]
 
-        self.launch_duration = 500  # solenoid power on duration in ms
-        self.score_timeout = 5000  # how long to wait until a miss is determined (5s)
+        self.launch_duration = cfg[config.LAUNCH_DURATION]  # solenoid power on duration in ms
+        self.score_timeout = cfg[config.SCORE_TIMEOUT]  # how long to wait until a miss is determined
 
         self.aim_cd = 0  # how long to wait between aim actions
         self.manual_theta = 0
         self.manual_phi = 0
 
+        self.auto_cell = -1  # cell picked by the computer player in auto mode, -1 when not picked yet
+        self.target_led = -1  # control pad led showing the computer's next shot, -1 for none
+        self.shot_cell = NO_CELL  # cell the last shot was aimed at, NO_CELL when aimed by hand
+        self.shot_theta = 0  # stepper position the last shot was fired from
+        self.shot_phi = 0
+        self.shot_beams = 0  # beams broken since the last shot
+        self.shot_time = 0  # tick the last shot was fired
+
+        # rapid fire: the computer plays both sides and aims the next shot while the last one is in the air
+        self.rapid_cell = -1  # cell the next shot is aimed at, -1 when not planned
+        self.rapid_guess = [0] * 9  # the board the plan was made for, the last shot landing where it was aimed
+        self.rapid_pipeline = True  # off, the next shot is planned once the last is scored, as in auto mode
+        self.rapid_replans = 0  # plans thrown away because a shot landed elsewhere
+        self.rapid_draws = 0  # boards filled with no winner, and cleared
+
         self.action_timer = 0  # general purpose timer for game purposes.
 
         self.reset_timer = 0
 
+        if PROFILE:
+            # with the remote on, its console commands reach the profiler through console_command
+            self.profiler = profiler.Profiler(console=not REMOTE)
+
+        # puts off the LED tick, matrix steps and telemetry when passes run over 1 ms, see load_budget.py
+        self.budget = load_budget.LoadBudget()
+
+        self.gc_manual = False  # see take_over_gc
+
+        # serial remote control. it owns the console input, the profiler's console commands go through it
+        self.remote = remote.Remote(self.remote_command, self.console_command) if REMOTE else None
+        self.telemetry_period = 0  # ms between telemetry frames, 0 when not streaming
+        self.telemetry_next = 0
+        self.ticks_elapsed = 0  # of the update running, for handlers called from deep in it
+
+        self.recorder = input_trace.TraceRecorder() if RECORD_TRACE else None
+        self.input_source = None  # replaces the GPIO reads when set, e.g. by a trace replay
+
         print("Initialization complete!")
 
     def update(self, ticks_elapsed):
+        self.ticks_elapsed = ticks_elapsed
+        budget = self.budget
+        budget.start(ticks_elapsed)
+        if PROFILE:
+            self.profiler.start()
+
         # ----------------------------------------- UPDATE MCU ----------------------------------------- #
         # update pico led & rgb leds
-        if ticks_elapsed >= self.led_timer:
+        if ticks_elapsed >= self.led_timer and budget.allow(load_budget.TASK_LEDS):
             if self.pico_led.value():
                 self.pico_led.off()
-                self.ctrl_leds.show()
-                self.lz_leds.show()  # also notifying the led
             else:
                 self.pico_led.on()
-                self.ctrl_leds.show()
-                self.lz_leds.show()  # also notifying the leds.
 
             if self.game_state == MAIN_MENU:
-                self.lz_leds.set_pixel_line_gradient(0, 8,
-                                                     (random.randint(0, 1)*255, random.randint(0, 1)*255, random.randint(0, 1)*255),
-                                                     (random.randint(0, 1)*255, random.randint(0, 1)*255, random.randint(0, 1)*255))
-
-                self.ctrl_leds.set_pixel_line_gradient(0, 8,
-                                                       (random.randint(0, 1) * 255, random.randint(0, 1) * 255,
-                                                        random.randint(0, 1) * 255),
-                                                       (random.randint(0, 1) * 255, random.randint(0, 1) * 255,
-                                                        random.randint(0, 1) * 255))
-                self.ctrl_leds.set_pixel(4, (255, 0, 0))
+                # the attract animation, under the red button's hint
+                self.menu_frame(self.lz_layers)
+                self.menu_frame(self.ctrl_layers)
+            self.show_leds()
 
             self.led_timer = ticks_elapsed + 100
 
+            log.drain(4)  # print buffered log records off the hot path
+
+            if self.deferred and self.interactive and self.game_state == MAIN_MENU:
+                self.run_with_gc(self.deferred.pop(0))
+
+            # tuned values go to flash once they settle, never while a shot is timed
+            if self.game_state != LAUNCH and self.game_state != WAIT_SCORE and self.config.commit(ticks_elapsed):
+                log.info("config saved, {} writes since boot", self.config.writes)
+
+            # so do calibrated aims, and only with the steppers still: rapid fire aims the next shot meanwhile
+            if (self.game_state != LAUNCH and self.game_state != WAIT_SCORE and self.steppers.at_goal()
+                    and self.aim_table.commit()):
+                log.info("aim table saved, {} writes since boot", self.aim_table.writes)
+
+            if self.gc_manual and gc.mem_free() < GC_RESERVE:
+                gc.collect()  # running low, better a pause now than a MemoryError
+
+            if self.remote is not None:
+                self.remote.flush()  # telemetry goes out in batches
+            elif PROFILE:
+                if self.profiler.poll() == "p":  # check for a dump request over serial
+                    self.dump_states(ticks_elapsed)
+                    self.boot.report()
+
+        if PROFILE:
+            self.profiler.mark(profiler.PHASE_LED)
+
         # update LED matrix for displaying scrolling messages
-        self.led_matrix.update(ticks_elapsed)
+        if self.led_matrix.due(ticks_elapsed) and budget.allow(load_budget.TASK_MATRIX):
+            self.led_matrix.update(ticks_elapsed)
+
+        if PROFILE:
+            self.profiler.mark(profiler.PHASE_MATRIX)
 
         # update GPIO states
-        self.update_btn_gpio()
-        self.update_beam_gpio()
+        if self.input_source is None:
+            self.update_btn_gpio(ticks_elapsed)
+        else:
+            self.input_source.update(ticks_elapsed, self.btn_states, self.beam_states)
+
+        if PROFILE:
+            self.profiler.mark(profiler.PHASE_BUTTONS)
+
+        if self.input_source is None:
+            self.update_beam_gpio(ticks_elapsed)
+        self.update_beam_time(ticks_elapsed)
+
+        if PROFILE:
+            self.profiler.mark(profiler.PHASE_BEAMS)
+
+        if self.recorder is not None:
+            self.recorder.record(ticks_elapsed, self.btn_states, self.beam_states)
+
+        # remote commands act like button presses, before the state machine sees the inputs
+        if self.remote is not None:
+            self.remote.poll()
+
+            if PROFILE:
+                self.profiler.mark(profiler.PHASE_REMOTE)
 
         # update stepper motors
         self.steppers.update_steppers()
 
-        if any(i == 0 for i in self.btn_states):
+        if PROFILE:
+            self.profiler.mark(profiler.PHASE_STEPPERS)
+
+        if 0 in self.btn_states:
             self.reset_timer += 1
-            print(self.reset_timer)
+            if self.reset_timer % 50 == 0:
+                log.debug("reset held for {} ticks", self.reset_timer)
             if self.reset_timer >= 250:
                 self.reset_game()
         else:
@@ -150,167 +335,563 @@ class MainProgram:
 
         # ----------------------------------------- GAME STATE MACHINE ----------------------------------------- #
 
-        # ------------------- MAIN MENU ------------------- #
-        if self.game_state == MAIN_MENU:
-            self.led_matrix.disp_scrolling_message(
-                "Welcome To Tic-Tac-Toe Mortar Launcher! PRESS RED BUTTON TO CONTINUE!")
-            self.ctrl_leds.set_pixel(4, (255, 0, 0))
-
-            if self.btn_states[4] == 0:
-                self.game_state = SELECT_MODE
-                self.ctrl_leds.clear()
-                self.lz_leds.fill((255, 255, 255))
-                self.ctrl_leds.fill((255, 255, 255))
-                self.ctrl_leds.show()
-                self.lz_leds.show()
-                self.action_timer = 0
-
-        # ------------------- SELECT MODE ------------------- #
-        elif self.game_state == SELECT_MODE:
-            if self.action_timer == 0:
-                self.led_matrix.disp_scrolling_message("SELECT GAME MODE!")
-                self.ctrl_leds.set_pixel(1, (255, 0, 0))
-                self.ctrl_leds.set_pixel(7, (255, 0, 0))
-
-                self.steppers.write_theta(10)
-
-            if self.btn_states[1] == 0 or self.btn_states[7] == 0:
+        # game_state may have been changed by the last pass or from outside (reset_game, the simulator), the
+        # exit and entry handlers run here so the new state's first tick sees its entry work done.
+        if self.game_state != self.active_state:
+            self.change_state(ticks_elapsed)
+
+        self.state_table[self.game_state][1](ticks_elapsed)
+
+        if PROFILE:
+            self.profiler.mark(profiler.PHASE_STATE)
+
+        # the expander writes of this tick, the solenoid and the phi step edges, in one pass
+        self.bus.flush()
+
+        if PROFILE:
+            self.profiler.mark(profiler.PHASE_BUS)
+
+        if self.telemetry_period and ticks_elapsed >= self.telemetry_next \
+                and budget.allow(load_budget.TASK_TELEMETRY):
+            self.send_telemetry(ticks_elapsed)
+            self.telemetry_next = ticks_elapsed + self.telemetry_period
+
+        budget.end()
+
+        if not self.interactive:
+            self.interactive = True
+            self.boot.stage("first_update")
+            self.boot.report()
+
+    # ----------------------------------------- STATE FRAMEWORK ----------------------------------------- #
+
+    def build_state_table(self):
+        # (on_enter, on_tick, on_exit) per state, indexed by the state constants. entry and exit handlers are
+        # run once per transition, on_tick every pass.
+        table = [None] * NUM_STATES
+        table[MAIN_MENU] = (self.enter_main_menu, self.tick_main_menu, None)
+        table[SELECT_MODE] = (self.enter_select_mode, self.tick_select_mode, None)
+        table[MANUAL_MODE] = (self.enter_manual_mode, self.tick_manual_mode, None)
+        table[AUTO_MODE] = (None, self.tick_auto_mode, None)
+        table[GAME_OVER] = (self.enter_game_over, self.tick_game_over, None)
+        table[LAUNCH] = (self.enter_launch, self.tick_launch, self.exit_launch)
+        table[WAIT_SCORE] = (None, self.tick_wait_score, None)
+        table[RAPID_MODE] = (None, self.tick_rapid_mode, None)
+        return tuple(table)
+
+    def change_state(self, ticks_elapsed):
+        old = self.active_state
+        new = self.game_state
+
+        if old >= 0:
+            self.state_time[old] += ticks_elapsed - self.state_entered
+        self.state_entered = ticks_elapsed
+        self.state_entries[new] += 1
+        self.active_state = new
+        log.debug("state {} -> {}", old, new)
+
+        if old >= 0 and self.state_table[old][2] is not None:
+            self.state_table[old][2](ticks_elapsed)
+        on_enter = self.state_table[new][0]
+        if on_enter is not None:
+            on_enter(ticks_elapsed)
+
+        # nothing is timing critical until the next shot, collect what the transition left behind
+        if self.gc_manual and new != LAUNCH and new != WAIT_SCORE:
+            gc.collect()
+
+    def take_over_gc(self):
+        # steady state ticks don't allocate, so automatic collection is turned off and the heap is collected on
+        # entering the idle states instead, never mid launch
+        gc.collect()
+        gc.disable()
+        self.gc_manual = True
+
+    def run_with_gc(self, task):
+        # boot work put off to the loop allocates freely (floats are heap objects on the Pico), with automatic
+        # collection off it would run out of heap and raise MemoryError, so collection is back on while it runs
+        enabled = gc.isenabled()
+        gc.enable()
+        task()
+        if not enabled:
+            gc.collect()
+            gc.disable()
+
+    # ----------------------------------------- REMOTE ----------------------------------------- #
+
+    def remote_command(self, cmd, data, n):
+        # a frame from the serial remote, see remote.py. returns the status to ack it with.
+        state = self.game_state
+        playing = state == MANUAL_MODE or state == AUTO_MODE
+
+        if cmd == remote.CMD_PING:
+            return remote.STATUS_OK
+
+        elif cmd == remote.CMD_THETA or cmd == remote.CMD_PHI:
+            if n != 2 or not playing:
+                return remote.STATUS_REJECTED
+            deg = data[0] | (data[1] << 8)
+            if deg >= 0x8000:
+                deg -= 0x10000
+            if cmd == remote.CMD_THETA:
+                self.manual_theta = deg
+                self.steppers.write_theta(deg)
+            else:
+                self.manual_phi = deg
+                self.steppers.write_phi(deg)
+            return remote.STATUS_OK
+
+        elif cmd == remote.CMD_FIRE:
+            if n != 0 or not playing:
+                return remote.STATUS_REJECTED
+            self.fire(self.ticks_elapsed)
+            return remote.STATUS_OK
+
+        elif cmd == remote.CMD_BOARD:
+            if n != 10 or data[9] < 1 or data[9] > 2:
+                return remote.STATUS_REJECTED
+            for i in range(9):
+                if data[i] > 2:
+                    return remote.STATUS_REJECTED
+            for i in range(9):
+                self.cur_board[i] = data[i]
+            self.show_board()
+            self.current_player = data[9] == 1
+            self.auto_cell = -1
+            return remote.STATUS_OK
+
+        elif cmd == remote.CMD_STATE:
+            # launch and score are only entered by firing
+            if n != 1 or data[0] >= NUM_STATES or data[0] == LAUNCH or data[0] == WAIT_SCORE:
+                return remote.STATUS_REJECTED
+            self.game_state = data[0]
+            self.action_timer = 0
+            return remote.STATUS_OK
+
+        elif cmd == remote.CMD_TELEMETRY:
+            if n != 2:
+                return remote.STATUS_REJECTED
+            self.telemetry_period = data[0] | (data[1] << 8)
+            self.telemetry_next = self.ticks_elapsed
+            return remote.STATUS_OK
+
+        elif cmd == remote.CMD_CONFIG:
+            if n == 0:
+                self.send_config()
+                return remote.STATUS_OK
+            if n != 3 or not self.config.set(data[0], data[1] | (data[2] << 8), self.ticks_elapsed):
+                return remote.STATUS_REJECTED
+            self.apply_config()
+            return remote.STATUS_OK
+
+        elif cmd == remote.CMD_PROFILE:
+            if n != 1:
+                return remote.STATUS_REJECTED
+            self.console_command(data[0])
+            return remote.STATUS_OK
+
+        return remote.STATUS_UNKNOWN
+
+    def console_command(self, char):
+        # single character commands typed on the serial console
+        if char == 0x70:  # 'p'
+            if PROFILE:
+                self.profiler.dump()
+            self.dump_states(self.ticks_elapsed)
+            self.dump_bus()
+            self.budget.dump()
+            print("solenoid: {} pulses, last {} us for {} us".format(
+                self.solenoid.pulses, self.solenoid.width_us, self.solenoid.duration_us))
+            print("leds: ctrl {} renders, {} pixels, lz {} renders, {} pixels".format(
+                self.ctrl_layers.renders, self.ctrl_layers.pixels_rendered, self.lz_layers.renders,
+                self.lz_layers.pixels_rendered))
+            print("assets: {} of {} lookups found, {} reads, {} text renders".format(
+                self.assets.hits, self.assets.lookups, self.assets.reads, self.led_matrix.text_cache.renders))
+            self.boot.report()
+        elif char == 0x72:  # 'r'
+            if PROFILE:
+                self.profiler.reset()
+            self.budget.reset()
+
+    def send_config(self):
+        out = self.remote
+        if out.begin(remote.FRAME_CONFIG, 2 * config.NUM_KEYS):
+            for key in range(config.NUM_KEYS):
+                out.put16(self.config.values[key])
+            out.end()
+
+    def apply_config(self):
+        # hand tuned values out to where they are used, they take effect from the next use
+        cfg = self.config.values
+        self.launch_duration = cfg[config.LAUNCH_DURATION]
+        self.score_timeout = cfg[config.SCORE_TIMEOUT]
+        self.btn_debounce_delay = cfg[config.BTN_DEBOUNCE]
+        self.beam_hold = cfg[config.BEAM_HOLD]
+        self.steppers.feed_rate = cfg[config.FEED_RATE]
+        self.led_matrix.default_scroll_speed = cfg[config.SCROLL_SPEED]
+        self.led_matrix.set_brightness(cfg[config.MATRIX_BRIGHTNESS])
+        self.ctrl_leds.brightness(cfg[config.CTRL_BRIGHTNESS])
+        self.lz_leds.brightness(cfg[config.LZ_BRIGHTNESS])
+        self.ctrl_layers.invalidate()
+        self.lz_layers.invalidate()
+
+    def send_telemetry(self, ticks_elapsed):
+        out = self.remote
+        if not out.begin(remote.FRAME_TELEMETRY, remote.TELEMETRY_SIZE):
+            return
+
+        cells = 0
+        for i in range(9):
+            cells |= self.cur_board[i] << (2 * i)
+        buttons = 0
+        for i in range(len(self.btn_states)):
+            if self.btn_states[i] == 0:
+                buttons |= 1 << i
+
+        out.put32(ticks_elapsed)
+        out.put(self.game_state)
+        out.put(1 if self.current_player else 2)
+        out.put16(cells)
+        out.put(cells >> 16)
+        out.put16(self.steppers.theta_pos)
+        out.put16(self.steppers.phi_pos)
+        out.put16(buttons)
+        out.put(beam_mask(self.beam_states))
+        out.end()
+
+        if out.tx_len > len(out.tx) // 2:
+            out.flush()  # fast streams don't wait for the LED tick
+
+    def dump_states(self, ticks_elapsed):
+        print("state        entries    time ms")
+        for state in range(NUM_STATES):
+            time_ms = self.state_time[state]
+            if state == self.active_state:
+                time_ms += ticks_elapsed - self.state_entered
+            print("{:12} {:7} {:10}".format(STATE_NAMES[state], self.state_entries[state], time_ms))
+
+    def show_leds(self):
+        # composite what changed and send both strips, the send is skipped if no pixel did
+        self.ctrl_layers.render()
+        self.lz_layers.render()
+        self.strips.show()
+
+    def dump_bus(self):
+        bus = self.bus
+        print("i2c: {} pin writes, {} transactions in {} flushes, {} bytes, {} elided".format(
+            bus.writes, bus.transactions, bus.flushes, bus.bytes, bus.elided))
+
+    # ------------------- MAIN MENU ------------------- #
+    def menu_frame(self, layers):
+        # a gradient between two random primaries on the background, read from the asset pack if it has them
+        left = random.getrandbits(3)
+        right = random.getrandbits(3)
+        if self.menu_frames >= 0:
+            layers.load(LAYER_BACKGROUND, self.assets, self.menu_frames + (left << 3 | right) * 4 * layers.num_leds)
+        else:
+            layers.gradient(LAYER_BACKGROUND, 0, layers.num_leds - 1, PRIMARIES[left], PRIMARIES[right])
+
+    def enter_main_menu(self, ticks_elapsed):
+        self.led_matrix.disp_scrolling_message(
+            "Welcome To Tic-Tac-Toe Mortar Launcher! PRESS RED BUTTON TO CONTINUE!")
+        self.ctrl_layers.clear(LAYER_HIGHLIGHT)
+        self.target_led = -1
+        self.ctrl_layers.set_pixel(LAYER_HIGHLIGHT, 4, RED)
+
+    def tick_main_menu(self, ticks_elapsed):
+        if self.btn_states[4] == 0:
+            self.game_state = SELECT_MODE
+            self.ctrl_layers.clear(LAYER_HIGHLIGHT)
+            self.ctrl_layers.fill(LAYER_BACKGROUND, WHITE)
+            self.lz_layers.fill(LAYER_BACKGROUND, WHITE)
+            self.show_leds()
+            self.action_timer = 0
+
+    # ------------------- SELECT MODE ------------------- #
+    def enter_select_mode(self, ticks_elapsed):
+        self.led_matrix.disp_scrolling_message("SELECT GAME MODE!")
+        self.ctrl_layers.set_pixel(LAYER_HIGHLIGHT, 1, RED)
+        self.ctrl_layers.set_pixel(LAYER_HIGHLIGHT, 7, RED)
+        self.ctrl_layers.set_pixel(LAYER_HIGHLIGHT, 3, BLUE)
+
+        self.steppers.write_theta(10)
+
+    def tick_select_mode(self, ticks_elapsed):
+        if self.btn_states[1] == 0 or self.btn_states[7] == 0:
+            self.action_timer = ticks_elapsed + 5000
+            self.led_matrix.disp_scrolling_message("AUTO MODE SELECTED" if self.btn_states[1] == 0 else "MANUAL MODE SELECTED")
+            self.last_game_state = AUTO_MODE if self.btn_states[1] == 0 else MANUAL_MODE
+            self.clear_ctrl_leds()
+
+        elif self.btn_states[3] == 0:
+            self.action_timer = ticks_elapsed + 5000
+            self.led_matrix.disp_scrolling_message("RAPID FIRE SELECTED")
+            self.last_game_state = RAPID_MODE
+            self.clear_ctrl_leds()
+
+        if self.action_timer != 0 and ticks_elapsed > self.action_timer:
+            self.game_state = self.last_game_state
+            self.steppers.override_theta(0)
+
+    def clear_ctrl_leds(self):
+        # the pad goes dark for the game, but for the hints of the mode
+        self.ctrl_layers.clear(LAYER_HIGHLIGHT)
+        self.ctrl_layers.clear(LAYER_BACKGROUND)
+        self.target_led = -1
+
+    def show_target(self, cell):
+        # the computer's next shot in blue on the control pad, in place of the last one
+        self.clear_target()
+        self.target_led = cell
+        self.ctrl_layers.set_pixel(LAYER_HIGHLIGHT, cell, BLUE)
+
+    def clear_target(self):
+        if self.target_led >= 0:
+            self.ctrl_layers.clear_pixel(LAYER_HIGHLIGHT, self.target_led)
+            self.target_led = -1
+
+    # ------------------- MANUAL MODE ------------------- #
+    def enter_manual_mode(self, ticks_elapsed):
+        self.ctrl_layers.set_pixel(LAYER_HIGHLIGHT, 4, RED)
+        self.ctrl_layers.set_pixel(LAYER_HIGHLIGHT, 1, WHITE)
+        self.ctrl_layers.set_pixel(LAYER_HIGHLIGHT, 3, WHITE)
+        self.ctrl_layers.set_pixel(LAYER_HIGHLIGHT, 5, WHITE)
+        self.ctrl_layers.set_pixel(LAYER_HIGHLIGHT, 7, WHITE)
+        self.led_matrix.disp_static_message("P1 GO!" if self.current_player else "P2 GO!")
+        self.led_matrix.fade_in(300)
+
+    def tick_manual_mode(self, ticks_elapsed):
+        if self.btn_states[1] == 0 and ticks_elapsed >= self.action_timer:  # aim up
+            self.manual_theta += 1
+            self.steppers.write_theta(self.manual_theta)
+            self.action_timer = ticks_elapsed + self.aim_cd
+
+        elif self.btn_states[3] == 0 and ticks_elapsed >= self.action_timer:  # aim left
+            self.manual_phi -= 1
+            self.steppers.write_phi(self.manual_phi)
+            self.action_timer = ticks_elapsed + self.aim_cd
+
+        elif self.btn_states[4] == 0:  # shoot!
+            self.fire(ticks_elapsed)
+
+        elif self.btn_states[5] == 0 and ticks_elapsed >= self.action_timer:  # aim right
+            self.manual_phi += 1
+            self.steppers.write_phi(self.manual_phi)
+            self.action_timer = ticks_elapsed + self.aim_cd
+
+        elif self.btn_states[7] == 0 and ticks_elapsed >= self.action_timer: # aim down
+            self.manual_theta -= 1
+            self.steppers.write_theta(self.manual_theta)
+            self.action_timer = ticks_elapsed + self.aim_cd
+
+    # ------------------- AUTO MODE ------------------- #
+    def tick_auto_mode(self, ticks_elapsed):
+        if not self.current_player and self.auto_cell < 0:  # computer plays as player 2
+            self.auto_cell = ai.best_move(self.cur_board, 2)
+            if self.auto_cell >= 0:
+                self.show_target(self.auto_cell)
+                self.aim_cell(self.auto_cell)
+
+        # fire once the steppers reach the aim
+        if not self.current_player and self.auto_cell >= 0 and self.steppers.at_goal():
+            self.fire(ticks_elapsed)
+
+        elif self.btn_states[1] == 0 and ticks_elapsed >= self.action_timer:  # aim up
+            self.manual_theta += 5
+            if self.manual_theta > 90:
+                self.manual_theta = 90
+            self.steppers.write_theta(self.manual_theta)
+            self.action_timer = ticks_elapsed + self.aim_cd
+
+        elif self.btn_states[3] == 0 and ticks_elapsed >= self.action_timer:  # aim left
+            self.manual_phi += 1
+            if self.manual_phi > 180:
+                self.manual_phi = 180
+            self.steppers.write_phi(self.manual_phi)
+            self.action_timer = ticks_elapsed + self.aim_cd
+
+        elif self.btn_states[4] == 0:  # shoot!
+            self.fire(ticks_elapsed)
+
+        elif self.btn_states[5] == 0 and ticks_elapsed >= self.action_timer:  # aim right
+            self.manual_phi -= 1
+            if self.manual_phi > 180:
+                self.manual_phi = 180
+            self.steppers.write_phi(self.manual_phi)
+            self.action_timer = ticks_elapsed + self.aim_cd
+
+        elif self.btn_states[7] == 0 and ticks_elapsed >= self.action_timer: # aim down
+            self.manual_theta -= 5
+            if self.manual_theta < 0:
+                self.manual_theta = 0
+            self.steppers.write_theta(self.manual_theta)
+            self.action_timer = ticks_elapsed + self.aim_cd
+
+    def aim_cell(self, cell):
+        # send the steppers to the calibrated aim for a cell, with the learnt offset
+        self.load_aim_model()
+        aim = self.aim_table.get(cell)
+        if aim is not None:
+            self.steppers.write_theta_steps(aim[0])
+            self.steppers.write_phi_steps(aim[1])
+        else:
+            # not calibrated yet, use the model. the cell gets calibrated if the shot lands.
+            theta, phi = self.ballistics.aim_cell(cell)
+            self.steppers.write_theta(theta)
+            self.steppers.write_phi(phi)
+
+        off_theta, off_phi = self.corrector.offset(cell)
+        self.steppers.write_theta_steps(self.steppers.theta_goal + off_theta)
+        self.steppers.write_phi_steps(self.steppers.phi_goal + off_phi)
+
+    # ------------------- RAPID FIRE ------------------- #
+    def tick_rapid_mode(self, ticks_elapsed):
+        # a plan made while the last shot was in the air guessed it would land where it was aimed
+        if self.rapid_cell >= 0 and self.cur_board != self.rapid_guess:
+            self.rapid_cell = -1
+            self.rapid_replans = (self.rapid_replans + 1) & 0x3FFFFFFF
+
+        if self.rapid_cell < 0:
+            for i in range(9):
+                self.rapid_guess[i] = self.cur_board[i]
+            if not self.plan_rapid(1 if self.current_player else 2):
+                # a full board and nobody won, start over
+                log.info("rapid fire board full, clearing it")
+                for i in range(9):
+                    self.cur_board[i] = 0
+                self.lz_layers.clear(LAYER_BOARD)
+                self.rapid_draws = (self.rapid_draws + 1) & 0x3FFFFFFF
+                return
+
+        if self.steppers.at_goal():
+            self.fire(ticks_elapsed)
+            self.rapid_cell = -1
+
+    def plan_rapid(self, player):
+        # pick and aim at the best move for player on rapid_guess
+        cell = ai.best_move(self.rapid_guess, player)
+        if cell < 0:
+            if 0 not in self.rapid_guess:
+                return False
+            cell = self.rapid_guess.index(0)  # decided on the guess, the shot still needs an aim
+        self.rapid_cell = cell
+        self.show_target(cell)
+        self.aim_cell(cell)
+        return True
+
+    def plan_next_rapid(self):
+        # the solenoid is done and the ball in the air: guess it lands where it was aimed and start aiming the
+        # other player's shot on that board
+        for i in range(9):
+            self.rapid_guess[i] = self.cur_board[i]
+        if self.shot_cell != NO_CELL:
+            self.rapid_guess[self.shot_cell] = 1 if self.current_player else 2
+        self.plan_rapid(2 if self.current_player else 1)
+
+    # ------------------- LAUNCH ------------------- #
+    def enter_launch(self, ticks_elapsed):
+        self.solenoid.fire(self.launch_duration * 1000)
+        self.led_matrix.disp_flashing_message("BOOM!", 250)
+
+    def tick_launch(self, ticks_elapsed):
+        # the pulse ends on its own timer, this only times the state
+        if ticks_elapsed >= self.action_timer:
+            self.action_timer = ticks_elapsed + self.score_timeout
+            self.game_state = WAIT_SCORE
+            if self.last_game_state == RAPID_MODE and self.rapid_pipeline:
+                self.plan_next_rapid()
+
+    def exit_launch(self, ticks_elapsed):
+        # a reset mid launch cuts the pulse, on to scoring it finishes on its timer
+        if self.game_state != WAIT_SCORE:
+            self.solenoid.off()
+
+    # ------------------- WAIT FOR SCORE ------------------- #
+    def tick_wait_score(self, ticks_elapsed):
+        rapid = self.last_game_state == RAPID_MODE
+        if rapid:
+            mask = self.beams_since(self.shot_time)  # a beam still latched from the last ball is not this one
+        else:
+            mask = beam_mask(self.beam_states)
+        self.shot_beams |= mask
+
+        cell = self.check_score(mask)
+        if cell >= 0:
+            # the aim that hit is the new calibration for that cell, so any learnt offset is folded in
+            self.aim_table.record(cell, self.shot_theta, self.shot_phi)
+            self.corrector.rebase(cell)
+            self.led_matrix.disp_flashing_message("P1 SCORE!" if self.current_player else "P2 SCORE!", 250)
+            if rapid and self.rapid_pipeline:
+                self.action_timer = ticks_elapsed  # the hit is confirmed, no need to wait out the timeout
+
+        if ticks_elapsed >= self.action_timer:
+            log.debug("solenoid pulse {} us for {} us", self.solenoid.width_us, self.solenoid.duration_us)
+            self.corrector.record(self.shot_cell, self.shot_beams, self.shot_theta, self.shot_phi)
+
+            if self.check_winner():
+                log.info("player {} won", 1 if self.current_player else 2)
+                self.game_state = GAME_OVER
+                self.action_timer = ticks_elapsed + 5000  # disp player win for 5 seconds
+            elif 0 not in self.cur_board and not rapid:
+                # nobody won and there is no cell left to play, the computer has no move (rapid fire clears the
+                # board and plays on)
+                log.info("board full, a draw")
+                self.game_state = GAME_OVER
                 self.action_timer = ticks_elapsed + 5000
-                self.led_matrix.disp_scrolling_message("AUTO MODE SELECTED" if self.btn_states[1] == 0 else "MANUAL MODE SELECTED")
-                self.last_game_state = AUTO_MODE if self.btn_states[1] == 0 else MANUAL_MODE
-                self.ctrl_leds.clear()
-
-            if self.action_timer != 0 and ticks_elapsed > self.action_timer:
-                self.game_state = self.last_game_state
-                self.steppers.override_theta(0)
-
-        # ------------------- MANUAL MODE ------------------- #
-        elif self.game_state == MANUAL_MODE:
-            self.ctrl_leds.set_pixel(4, (255, 0, 0))
-            self.ctrl_leds.set_pixel(1, (255, 255, 255))
-            self.ctrl_leds.set_pixel(3, (255, 255, 255))
-            self.ctrl_leds.set_pixel(5, (255, 255, 255))
-            self.ctrl_leds.set_pixel(7, (255, 255, 255))
-            self.led_matrix.disp_static_message("P1 GO!" if self.current_player else "P2 GO!")
-
-            if self.btn_states[1] == 0 and ticks_elapsed >= self.action_timer:  # aim up
-                self.manual_theta += 1
-                self.steppers.write_theta(self.manual_theta)
-                self.action_timer = ticks_elapsed + self.aim_cd
-
-            elif self.btn_states[3] == 0 and ticks_elapsed >= self.action_timer:  # aim left
-                self.manual_phi -= 1
-                self.steppers.write_phi(self.manual_phi)
-                self.action_timer = ticks_elapsed + self.aim_cd
-
-            elif self.btn_states[4] == 0:  # shoot!
-                print("FIRING!")
-                self.last_game_state = self.game_state
-                self.game_state = LAUNCH
-                self.action_timer = ticks_elapsed + self.launch_duration
-
-            elif self.btn_states[5] == 0 and ticks_elapsed >= self.action_timer:  # aim right
-                self.manual_phi += 1
-                self.steppers.write_phi(self.manual_phi)
-                self.action_timer = ticks_elapsed + self.aim_cd
-
-            elif self.btn_states[7] == 0 and ticks_elapsed >= self.action_timer: # aim down
-                self.manual_theta -= 1
-                self.steppers.write_theta(self.manual_theta)
-                self.action_timer = ticks_elapsed + self.aim_cd
-
-        # ------------------- AUTO MODE ------------------- #
-        elif self.game_state == AUTO_MODE:
-
-            if self.btn_states[1] == 0 and ticks_elapsed >= self.action_timer:  # aim up
-                self.manual_theta += 5
-                if self.manual_theta > 90:
-                    self.manual_theta = 90
-                self.steppers.write_theta(self.manual_theta)
-                self.action_timer = ticks_elapsed + self.aim_cd
-
-            elif self.btn_states[3] == 0 and ticks_elapsed >= self.action_timer:  # aim left
-                self.manual_phi += 1
-                if self.manual_phi > 180:
-                    self.manual_phi = 180
-                self.steppers.write_phi(self.manual_phi)
-                self.action_timer = ticks_elapsed + self.aim_cd
-
-            elif self.btn_states[4] == 0:  # shoot!
-                print("FIRING!")
-                self.last_game_state = self.game_state
-                self.game_state = LAUNCH
-                self.action_timer = ticks_elapsed + self.launch_duration
-
-            elif self.btn_states[5] == 0 and ticks_elapsed >= self.action_timer:  # aim right
-                self.manual_phi -= 1
-                if self.manual_phi > 180:
-                    self.manual_phi = 180
-                self.steppers.write_phi(self.manual_phi)
-                self.action_timer = ticks_elapsed + self.aim_cd
-
-            elif self.btn_states[7] == 0 and ticks_elapsed >= self.action_timer: # aim down
-                self.manual_theta -= 5
-                if self.manual_theta < 0:
-                    self.manual_theta = 0
-                self.steppers.write_theta(self.manual_theta)
-                self.action_timer = ticks_elapsed + self.aim_cd
-
-            if self.btn_states[0]:  # TODO: use manual mode to find steps to make shot.
-                print(self.manual_theta, self.manual_phi)
-
-        # ------------------- LAUNCH ------------------- #
-        elif self.game_state == LAUNCH:
-            self.mcp[0].output(1)
-            self.led_matrix.disp_flashing_message("BOOM!", 250)
-
-            if ticks_elapsed >= self.action_timer:
-                self.mcp[0].output(0)
-                self.action_timer = ticks_elapsed + self.score_timeout
-                self.game_state = WAIT_SCORE
-
-        # ------------------- WAIT FOR SCORE ------------------- #
-        elif self.game_state == WAIT_SCORE:
-
-            if self.check_score():
-                self.led_matrix.disp_flashing_message("P1 SCORE!" if self.current_player else "P2 SCORE!", 250)
-
-            if ticks_elapsed >= self.action_timer:
-                if self.check_winner():
-                    print("PLAYER WON")
-                    self.game_state = GAME_OVER
-                    self.action_timer = ticks_elapsed + 5000  # disp player win for 5 seconds
-                else:
-                    self.game_state = self.last_game_state
-                    self.action_timer = 0
-                    self.current_player = not self.current_player
-
-        # ------------------- GAME OVER ------------------- #
-        elif self.game_state == GAME_OVER:
-            if ticks_elapsed <= self.action_timer:
-                self.led_matrix.disp_flashing_message("P1 WINS!" if self.current_player else "P2 WINS!", 250)
             else:
-                self.led_matrix.disp_scrolling_message("PRESS ANY BUTTON TO PLAY AGAIN!")
-                if any(self.btn_states):
-                    self.reset_game()
+                self.game_state = self.last_game_state
+                self.action_timer = 0
+                self.current_player = not self.current_player
+                self.auto_cell = -1
 
-    def update_btn_gpio(self):
-        # Read the button states
-        current_button_states = [button.value() for button in self.btn_pins]
+    # ------------------- GAME OVER ------------------- #
+    def enter_game_over(self, ticks_elapsed):
+        if self.check_winner():
+            self.led_matrix.disp_flashing_message("P1 WINS!" if self.current_player else "P2 WINS!", 250)
+        else:
+            self.led_matrix.disp_flashing_message("DRAW!", 250)
 
+    def tick_game_over(self, ticks_elapsed):
+        if ticks_elapsed > self.action_timer:
+            self.led_matrix.disp_scrolling_message("PRESS ANY BUTTON TO PLAY AGAIN!")
+            if any(self.btn_states):
+                self.reset_game()
+
+    def update_btn_gpio(self, ticks_elapsed):
         # check for how long a change has been active, if its for as long as debounce delay, we can know that must be
-        # the current state!
+        # the current state! timed in ticks rather than loop passes, so a slow loop doesn't stretch it.
         for i in range(len(self.btn_pins)):
-            if current_button_states[i] != self.btn_states[i]:
-                self.btn_change_counter[i] += 1
-                if self.btn_change_counter[i] > self.btn_debounce_delay:
-                    self.btn_states[i] = current_button_states[i]
+            state = self.btn_pins[i].value()
+            if state != self.btn_states[i]:
+                if self.btn_change_time[i] < 0:
+                    self.btn_change_time[i] = ticks_elapsed
+                elif ticks_elapsed - self.btn_change_time[i] > self.btn_debounce_delay:
+                    self.btn_states[i] = state
+                    self.btn_change_time[i] = -1
             else:
-                self.btn_change_counter[i] = 0
-
-    def update_beam_gpio(self):
+                self.btn_change_time[i] = -1
+
+    def update_beam_time(self, ticks_elapsed):
+        # when each latched beam was first seen broken, so a break can be tied to the shot fired before it
+        for i in range(len(self.beam_states)):
+            if self.beam_states[i] != 0:
+                self.beam_time[i] = -1
+            elif self.beam_time[i] < 0:
+                self.beam_time[i] = ticks_elapsed
+
+    def beams_since(self, since):
+        # beam_mask of the beams broken at or after tick since
+        mask = 0
+        for i in range(len(self.beam_states)):
+            if self.beam_time[i] >= since:
+                mask |= 1 << i
+        return mask
+
+    def update_beam_gpio(self, ticks_elapsed):
         # Read the beam states
-        current_beam_states = [beam.value() for beam in self.beam_pins]
+        current_beam_states = self.beam_raw
+        for i in range(len(self.beam_pins)):
+            current_beam_states[i] = self.beam_pins[i].value()
 
         # essentially, we want to set our beam states when they are first broken
         # and we want that state to stay even after the beam is regained
@@ -319,13 +900,12 @@ class MainProgram:
         for i in range(len(self.beam_pins)):
             if self.beam_states[i] != current_beam_states[i] and current_beam_states[i] == 0:
                 self.beam_states[i] = current_beam_states[i]
-                self.beam_reset_counter = 0
-
-        self.beam_reset_counter += 1
+                self.beam_reset_time = ticks_elapsed
 
-        if self.beam_reset_counter > 500:
-            self.beam_states = current_beam_states
-            self.beam_reset_counter = 0
+        if ticks_elapsed - self.beam_reset_time > self.beam_hold:
+            for i in range(len(self.beam_pins)):
+                self.beam_states[i] = current_beam_states[i]
+            self.beam_reset_time = ticks_elapsed
 
     def check_winner(self):
         # Check rows
@@ -346,46 +926,90 @@ class MainProgram:
 
         return False
 
-    def check_score(self):
-        pos_arr = [
-            [0, 3],
-            [1, 3],
-            [2, 3],
-            [2, 4],
-            [1, 4],
-            [0, 4],
-            [0, 5],
-            [1, 5],
-            [2, 5]
-        ]
-
-        zero_indexes = [i for i, value in enumerate(self.beam_states) if value == 0]
-        idx_mapping = [8, 7, 6, 3, 4, 5, 2, 1, 0]
-
-        for index, pos in enumerate(pos_arr):
-            if pos == zero_indexes:
-                self.lz_leds.set_pixel(index, (255, 0, 0) if self.current_player == 1 else (0, 255, 0))
-                self.cur_board[idx_mapping.index(index)] = 1 if self.current_player else 2
-                return True
-
-        return False
+    def load_aim_model(self):
+        # builds the ballistic model on first use if the deferred boot hasn't got to it yet
+        if self.corrector is None:
+            self.run_with_gc(self.build_aim_model)
+
+    def build_aim_model(self):
+        start = time.ticks_ms()
+        self.ballistics = Ballistics()
+        self.corrector = ShotCorrector(
+            deg_to_steps((self.ballistics.aim_cell(6)[0] - self.ballistics.aim_cell(0)[0]) / 2),
+            deg_to_steps((self.ballistics.aim_cell(5)[1] - self.ballistics.aim_cell(3)[1]) / 2))
+        log.info("aim model built in {} ms", time.ticks_diff(time.ticks_ms(), start))
+
+    def fire(self, ticks_elapsed):
+        self.load_aim_model()  # the shot is scored against it
+        if self.game_state == AUTO_MODE and not self.current_player:
+            self.shot_cell = self.auto_cell
+        elif self.game_state == RAPID_MODE:
+            self.shot_cell = self.rapid_cell
+        else:
+            self.shot_cell = NO_CELL
+        self.shot_time = ticks_elapsed
+        self.clear_target()  # the shot is away, the next one is shown once it's picked
+        self.shot_theta = self.steppers.theta_pos
+        self.shot_phi = self.steppers.phi_pos
+        log.info("firing at cell {} from theta {} phi {}", self.shot_cell, self.shot_theta, self.shot_phi)
+        self.shot_beams = 0
+        self.last_game_state = self.game_state
+        self.game_state = LAUNCH
+        self.action_timer = ticks_elapsed + self.launch_duration
+
+    def check_score(self, mask):
+        # exactly one column beam and one row beam broken (beam_mask) scores that landing zone led's cell
+        for index in range(9):
+            if mask == SCORE_MASKS[index]:
+                cell = SCORE_CELLS[index]
+                self.cur_board[cell] = 1 if self.current_player else 2
+                self.mark_cell(index, self.cur_board[cell])
+                return cell
+
+        return -1
+
+    def mark_cell(self, index, player):
+        # player's mark on landing zone led index (the led of cell SCORE_CELLS[index])
+        self.lz_layers.set_pixel(LAYER_BOARD, index, RED if player == 1 else GREEN)
+
+    def show_board(self):
+        # redraw every mark from cur_board, after it was replaced as a whole
+        self.lz_layers.clear(LAYER_BOARD)
+        for index in range(9):
+            player = self.cur_board[SCORE_CELLS[index]]
+            if player:
+                self.mark_cell(index, player)
 
     def reset_game(self):
-        self.cur_board = [0] * 9
+        for i in range(9):
+            self.cur_board[i] = 0
+        self.lz_layers.clear(LAYER_BOARD)
         self.action_timer = 0
+        self.auto_cell = -1
+        self.rapid_cell = -1
         self.game_state = MAIN_MENU
 
-
-machine.freq(250_000_000)  # boost pico clock to 250 MHz
-m = MainProgram()
-
-total_ticks = 0
-tick_ref = 0
-d_tick = 0
-
-while True:
-    tick_ref = time.ticks_ms()
-    m.update(total_ticks)
-    time.sleep_ms(1)  # this essentially means we have an accuracy of ~1 ms, might need to increase this.
-    d_tick = time.ticks_diff(time.ticks_ms(), tick_ref)
-    total_ticks += d_tick
+        if self.recorder is not None:
+            self.recorder.flush()  # a game boundary, so a trace pulled after a power cut ends on one
+
+
+if __name__ == "__main__":
+    machine.freq(250_000_000)  # boost pico clock to 250 MHz
+    m = MainProgram()
+    if GC_MANUAL:
+        m.take_over_gc()
+
+    total_ticks = 0
+    tick_ref = 0
+    d_tick = 0
+
+    try:
+        while True:
+            tick_ref = time.ticks_ms()
+            m.update(total_ticks)
+            time.sleep_ms(1)  # this essentially means we have an accuracy of ~1 ms, might need to increase this.
+            d_tick = time.ticks_diff(time.ticks_ms(), tick_ref)
+            total_ticks += d_tick
+    finally:
+        if m.remote is not None:
+            m.remote.close()  # the REPL gets its Ctrl-C back
@@ -0,0 +1,156 @@
+"""
+One frame buffer spread over several MAX7219 chains.
+
+Every show() of a single chain clocks a word through every module for every row, so refresh cost grows with the
+chain. MatrixDisplay keeps one MONO_HLSB frame buffer, 8 rows of `num` modules, and splits it across shorter
+chains, each on its own CS pin and on either SPI bus. show() refreshes each chain on its own and only the rows of
+it that changed since it was last sent (a shadow copy per chain), so a static part of the display costs nothing
+and a chain's refresh time only depends on its own length.
+
+    display = MatrixDisplay(((spi0, Pin(17, Pin.OUT), 8), (spi0, Pin(cs, Pin.OUT), 8)))
+
+has the same drawing methods as max7219.Matrix8x8, module 0 is the left of the first chain. `cs` is whichever
+pin the second chain's CS is wired to; the launcher's board has none free, see led_matrix.CHAINS.
+"""
+
+import framebuf
+from micropython import const
+
+_DIGIT0 = const(1)
+_DECODEMODE = const(9)
+_INTENSITY = const(10)
+_SCANLIMIT = const(11)
+_SHUTDOWN = const(12)
+_DISPLAYTEST = const(15)
+
+
+class Chain:
+
+    def __init__(self, spi, cs, num, first):
+        """
+        :param spi: machine.SPI the chain is on
+        :param cs: machine.Pin, the chain's load/CS line
+        :param num: modules in the chain
+        :param first: the chain's first module in the frame buffer
+        """
+        self.spi = spi
+        self.cs = cs
+        self.cs.init(cs.OUT, True)
+        self.num = num
+        self.first = first
+        self._row = bytearray(2 * num)
+        self.shadow = bytearray(8 * num)  # rows as last sent
+        self.valid = False  # shadow matches the modules, off until the first full refresh
+
+        self.refreshes = 0  # show()s that sent something
+        self.rows = 0  # row writes
+        self.bytes = 0
+
+    def write(self, command, data):
+        # the same register on every module
+        row = self._row
+        for m in range(self.num):
+            row[2 * m] = command
+            row[2 * m + 1] = data
+        self._send()
+
+    def _send(self):
+        self.cs(0)
+        self.spi.write(self._row)
+        self.cs(1)
+        self.bytes = (self.bytes + len(self._row)) & 0x3FFFFFFF  # stays a small int
+
+    def refresh(self, buffer, stride):
+        """
+        Send the rows of the chain's part of the frame that changed.
+
+        :param buffer: the frame buffer, `stride` bytes a row
+        :return: rows sent
+        """
+        row = self._row
+        shadow = self.shadow
+        num = self.num
+        sent = 0
+        for y in range(8):
+            src = y * stride + self.first
+            dst = y * num
+            changed = not self.valid
+            if not changed:
+                for m in range(num):
+                    if buffer[src + m] != shadow[dst + m]:
+                        changed = True
+                        break
+            if changed:
+                for m in range(num):
+                    data = buffer[src + m]
+                    shadow[dst + m] = data
+                    row[2 * m] = _DIGIT0 + y
+                    row[2 * m + 1] = data
+                self._send()
+                sent += 1
+        self.valid = True
+        if sent:
+            self.refreshes = (self.refreshes + 1) & 0x3FFFFFFF
+            self.rows = (self.rows + sent) & 0x3FFFFFFF
+        return sent
+
+
+class MatrixDisplay:
+
+    def __init__(self, chains):
+        """
+        :param chains: (spi, cs pin, modules) for each chain, left to right
+        """
+        self.chains = []
+        first = 0
+        for spi, cs, num in chains:
+            self.chains.append(Chain(spi, cs, num, first))
+            first += num
+        self.num = first
+
+        self.buffer = bytearray(8 * self.num)
+        fb = framebuf.FrameBuffer(self.buffer, 8 * self.num, 8, framebuf.MONO_HLSB)
+        self.framebuf = fb
+        self.fill = fb.fill  # (col)
+        self.pixel = fb.pixel  # (x, y[, c])
+        self.hline = fb.hline  # (x, y, w, col)
+        self.vline = fb.vline  # (x, y, h, col)
+        self.line = fb.line  # (x1, y1, x2, y2, col)
+        self.rect = fb.rect  # (x, y, w, h, col)
+        self.fill_rect = fb.fill_rect  # (x, y, w, h, col)
+        self.text = fb.text  # (string, x, y, col=1)
+        self.scroll = fb.scroll  # (dx, dy)
+        self.blit = fb.blit  # (fbuf, x, y[, key])
+        self.init()
+
+    def init(self):
+        for chain in self.chains:
+            for command, data in (
+                (_SHUTDOWN, 0),
+                (_DISPLAYTEST, 0),
+                (_SCANLIMIT, 7),
+                (_DECODEMODE, 0),
+                (_SHUTDOWN, 1),
+            ):
+                chain.write(command, data)
+            chain.valid = False
+
+    def brightness(self, value):
+        if not 0 <= value <= 15:
+            raise ValueError("Brightness out of range")
+        for chain in self.chains:
+            chain.write(_INTENSITY, value)
+
+    def power(self, on):
+        # shutdown blanks the modules but keeps their digit registers, powering back on shows the same frame
+        for chain in self.chains:
+            chain.write(_SHUTDOWN, 1 if on else 0)
+
+    def show(self):
+        for chain in self.chains:
+            chain.refresh(self.buffer, self.num)
+
+    def invalidate(self):
+        # resend every row on the next show, e.g. after a module lost power
+        for chain in self.chains:
+            chain.valid = False
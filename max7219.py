@@ -21,6 +21,7 @@ class Matrix8x8:
         self.cs.init(cs.OUT, True)
         self.buffer = bytearray(8 * num)
         self.num = num
+        self._row = bytearray(2 * num)  # one (register, data) word per module, reused for every write
         fb = framebuf.FrameBuffer(self.buffer, 8 * num, 8, framebuf.MONO_HLSB)
         self.framebuf = fb
         self.fill = fb.fill  # (col)
@@ -36,9 +37,12 @@ class Matrix8x8:
         self.init()
 
     def _write(self, command, data):
-        self.cs(0)
+        row = self._row
         for m in range(self.num):
-            self.spi.write(bytearray([command, data]))
+            row[2 * m] = command
+            row[2 * m + 1] = data
+        self.cs(0)
+        self.spi.write(row)
         self.cs(1)
 
     def init(self):
@@ -57,8 +61,11 @@ class Matrix8x8:
         self._write(_INTENSITY, value)
 
     def show(self):
+        row = self._row
         for y in range(8):
-            self.cs(0)
             for m in range(self.num):
-                self.spi.write(bytearray([_DIGIT0 + y, self.buffer[(y * self.num) + m]]))
-            self.cs(1)
\ No newline at end of file
+                row[2 * m] = _DIGIT0 + y
+                row[2 * m + 1] = self.buffer[(y * self.num) + m]
+            self.cs(0)
+            self.spi.write(row)
+            self.cs(1)
@@ -72,11 +72,15 @@ class Port():
             setattr(self, reg, getattr(self, reg) & ~bit)
 
     def _read(self, reg):
-        return self._mcp._i2c.readfrom_mem(self._mcp._address, self._which_reg(reg), 1)[0]
+        buf = self._mcp._buf
+        self._mcp._i2c.readfrom_mem_into(self._mcp._address, self._which_reg(reg), buf)
+        return buf[0]
 
     def _write(self, reg, val):
         val &= 0xff
-        self._mcp._i2c.writeto_mem(self._mcp._address, self._which_reg(reg), bytearray([val]))
+        buf = self._mcp._buf
+        buf[0] = val
+        self._mcp._i2c.writeto_mem(self._mcp._address, self._which_reg(reg), buf)
         # if writing to the config register, make a copy in mcp so that it knows
         # which bank you're using for subsequent writes
         if reg == _MCP_IOCON:
@@ -159,16 +163,17 @@ class Port():
 
 
 class MCP23017():
-    def __init__(self, i2c, address=0x20):
+    def __init__(self, i2c, address=0x20, scan=True):
         self._i2c = i2c
         self._address = address
         self._config = 0x00
         self._virtual_pins = {}
-        self.init()
+        self._buf = bytearray(1)  # register transfers go through this, so reads and writes don't allocate
+        self.init(scan)
 
-    def init(self):
-        # error if device not found at i2c addr
-        if self._i2c.scan().count(self._address) == 0:
+    def init(self, scan=True):
+        # error if device not found at i2c addr. without the scan a missing device fails on the first write instead
+        if scan and self._i2c.scan().count(self._address) == 0:
             raise OSError('MCP23017 not found at I2C address {:#x}'.format(self._address))
 
         self.porta = Port(0, self)
@@ -35,6 +35,39 @@ def sk6812():
     wrap()
 
 
+# PIO state machine clocking 2, 4 or 8 WS2812 strips on consecutive pins at once. Each FIFO word carries 16 bits
+# (put with shift 16): 16 / lanes bit-planes, most significant first. A plane is one bit for every strip, bit i for
+# the strip on out pin i. A bit takes 10 cycles like ws2812: all pins high, the plane, all pins low.
+def ws2812_lanes(lanes):
+    @rp2.asm_pio(out_init=(rp2.PIO.OUT_LOW,) * lanes, out_shiftdir=rp2.PIO.SHIFT_LEFT, autopull=True,
+                 pull_thresh=16)
+    def ws2812_parallel():
+        T1 = 2
+        T2 = 5
+        T3 = 3
+        wrap_target()
+        out(x, lanes)
+        mov(pins, invert(null))     [T1 - 1]
+        mov(pins, x)                [T2 - 1]
+        mov(pins, null)             [T3 - 2]
+        wrap()
+    return ws2812_parallel
+
+
+def interpolate(start, diff, i, span):
+    """
+    start + diff * i / span rounded as round() rounds it, halves to even, in integers so nothing is allocated.
+    Where the float maths round(diff * (i / span) + start) lands just off an exact half this gives the exact
+    answer instead.
+    """
+    n = start * span + diff * i
+    q = n // span
+    twice = 2 * (n - q * span)
+    if twice > span or twice == span and q & 1:
+        q += 1
+    return q
+
+
 # we need this because Micropython can't construct slice objects directly, only by
 # way of supporting slice notation.
 # So, e.g. slice_maker[1::4] gives a slice(1,None,4) object.
@@ -98,6 +131,7 @@ class Neopixel:
             self.shift = (((mode.index('R') ^ 3) - 1) * 8, ((mode.index('G') ^ 3) - 1) * 8,
                           ((mode.index('B') ^ 3) - 1) * 8, 0)
         self.sm.active(1)
+        self._put = self.sm.put  # bound once, show() runs every LED tick
         self.num_leds = num_leds
         self.brightnessvalue = 255
 
@@ -138,20 +172,19 @@ class Neopixel:
         r_diff = right_rgb_w[0] - left_rgb_w[0]
         g_diff = right_rgb_w[1] - left_rgb_w[1]
         b_diff = right_rgb_w[2] - left_rgb_w[2]
-        if with_W:
-            w_diff = (right_rgb_w[3] - left_rgb_w[3])
-
-        for i in range(right_pixel - left_pixel + 1):
-            fraction = i / (right_pixel - left_pixel)
-            red = round(r_diff * fraction + left_rgb_w[0])
-            green = round(g_diff * fraction + left_rgb_w[1])
-            blue = round(b_diff * fraction + left_rgb_w[2])
+        w_diff = right_rgb_w[3] - left_rgb_w[3] if with_W else 0
+
+        # interpolate in integers, so no floats or colour tuples are allocated
+        span = right_pixel - left_pixel
+        for i in range(span + 1):
+            red = interpolate(left_rgb_w[0], r_diff, i, span)
+            green = interpolate(left_rgb_w[1], g_diff, i, span)
+            blue = interpolate(left_rgb_w[2], b_diff, i, span)
+            white = 0
             # if it's (r, g, b, w)
             if with_W:
-                white = round(w_diff * fraction + left_rgb_w[3])
-                self.set_pixel(left_pixel + i, (red, green, blue, white), how_bright)
-            else:
-                self.set_pixel(left_pixel + i, (red, green, blue), how_bright)
+                white = interpolate(left_rgb_w[3], w_diff, i, span)
+            self.pixels[left_pixel + i] = self.pixel_value(red, green, blue, white, how_bright)
 
     def set_pixel_line(self, pixel1, pixel2, rgb_w, how_bright=None):
         """
@@ -177,20 +210,12 @@ class Neopixel:
         :param how_bright: [default: None] Brightness of current interval. If None, use global brightness value
         :return: None
         """
-        if how_bright is None:
-            how_bright = self.brightness()
-        sh_R, sh_G, sh_B, sh_W = self.shift
-        bratio = how_bright / 255.0
-
-        red = round(rgb_w[0] * bratio)
-        green = round(rgb_w[1] * bratio)
-        blue = round(rgb_w[2] * bratio)
         white = 0
         # if it's (r, g, b, w)
         if len(rgb_w) == 4 and self.W_in_mode:
-            white = round(rgb_w[3] * bratio)
+            white = rgb_w[3]
 
-        pix_value = white << sh_W | blue << sh_B | red << sh_R | green << sh_G
+        pix_value = self.pixel_value(rgb_w[0], rgb_w[1], rgb_w[2], white, how_bright)
         # set some subset, if pixel_num is a slice:
         if type(pixel_num) is slice:
             for i in range(*pixel_num.indices(self.num_leds)):
@@ -198,6 +223,25 @@ class Neopixel:
         else:
             self.pixels[pixel_num] = pix_value
 
+    def pixel_value(self, red, green, blue, white=0, how_bright=None):
+        """
+        Scale a colour by brightness and pack it for the state machine, the value set_pixel stores in `pixels`.
+        Code that keeps its own colours (led_compositor) writes `pixels` with it. Integer maths, rounding to
+        nearest, so nothing is allocated.
+
+        :param how_bright: brightness 1..255, or None for the global brightness value
+        :return: packed pixel value
+        """
+        if how_bright is None:
+            how_bright = self.brightnessvalue
+        sh_R, sh_G, sh_B, sh_W = self.shift
+
+        red = (red * how_bright * 2 + 255) // 510
+        green = (green * how_bright * 2 + 255) // 510
+        blue = (blue * how_bright * 2 + 255) // 510
+        white = (white * how_bright * 2 + 255) // 510
+        return white << sh_W | blue << sh_B | red << sh_R | green << sh_G
+
     def __setitem__(self, idx, rgb_w):
         """
         if npix is a Neopixel object,
@@ -247,7 +291,7 @@ class Neopixel:
         cut = 8
         if self.W_in_mode:
             cut = 0
-        sm_put = self.sm.put
+        sm_put = self._put
         for pixval in self.pixels:
             sm_put(pixval, cut)
 
@@ -268,4 +312,108 @@ class Neopixel:
 
         :return: None
         """
-        self.pixels = array.array("I", [0] * self.num_leds)
\ No newline at end of file
+        pixels = self.pixels
+        for i in range(self.num_leds):
+            pixels[i] = 0
+
+
+class ParallelStrips:
+    """
+    Up to 8 RGB strips on consecutive pins, sent together by one state machine. Sending takes as long as one strip
+    alone, however many lanes there are. Each strip is a Lane with the Neopixel API:
+
+        strips = ParallelStrips(0, 15, 2, 9, "GRB")
+        ctrl, lz = strips.lane(0), strips.lane(1)
+        ctrl.fill((255, 0, 0))
+        ctrl.show()  # sends every lane, skipped if no lane changed since the last send
+    """
+
+    def __init__(self, state_machine, first_pin, lanes, num_leds, mode="RGB"):
+        """
+        :param state_machine: id of PIO state machine used
+        :param first_pin: pin of lane 0, lane i is on first_pin + i
+        :param lanes: 2, 4 or 8 (the pins of unused lanes are still driven)
+        :param num_leds: LEDs per strip
+        :param mode: RGB order, as Neopixel. RGBW strips need their own Neopixel.
+        """
+        if lanes not in (2, 4, 8):
+            raise ValueError("lanes must be 2, 4 or 8")
+        if 'W' in mode:
+            raise ValueError("RGBW strips are not supported in lanes")
+        self.lanes = lanes
+        self.num_leds = num_leds
+        self.strips = [Lane(self, num_leds, mode) for _ in range(lanes)]
+        self.sent = [array.array("I", [0] * num_leds) for _ in range(lanes)]  # pixels as last sent
+        self.valid = False  # sent matches the strips, off until the first send
+
+        # a pixel's 24 bits are cut into chunks of 16 / lanes bits, each spread over one halfword of planes
+        self.chunk_bits = 16 // lanes
+        self.chunks = 24 // self.chunk_bits
+        self.spread = array.array("H", [0] * (1 << self.chunk_bits))
+        for value in range(1 << self.chunk_bits):
+            for bit in range(self.chunk_bits):
+                if value >> bit & 1:
+                    self.spread[value] |= 1 << (bit * lanes)
+        self.planes = array.array("H", [0] * (num_leds * self.chunks))
+
+        self.sm = rp2.StateMachine(state_machine, ws2812_lanes(lanes), freq=8000000, out_base=Pin(first_pin))
+        self.sm.active(1)
+        self._put = self.sm.put
+
+    def lane(self, i):
+        return self.strips[i]
+
+    def show(self):
+        """
+        Send every lane, unless none changed since the last send.
+        """
+        if self.valid and not self._changed():
+            return
+
+        planes = self.planes
+        spread = self.spread
+        chunks = self.chunks
+        bits = self.chunk_bits
+        mask = (1 << bits) - 1
+        for j in range(len(planes)):
+            planes[j] = 0
+        for i in range(self.lanes):
+            pixels = self.strips[i].pixels
+            sent = self.sent[i]
+            for px in range(self.num_leds):
+                value = pixels[px]
+                sent[px] = value
+                base = px * chunks
+                shift = 24
+                for c in range(chunks):
+                    shift -= bits
+                    planes[base + c] |= spread[(value >> shift) & mask] << i
+
+        self._put(planes, 16)
+        self.valid = True
+
+    def _changed(self):
+        for i in range(self.lanes):
+            pixels = self.strips[i].pixels
+            sent = self.sent[i]
+            for px in range(self.num_leds):
+                if pixels[px] != sent[px]:
+                    return True
+        return False
+
+
+class Lane(Neopixel):
+    # one strip of a ParallelStrips: the Neopixel API, with show() going through the shared state machine
+
+    def __init__(self, group, num_leds, mode):
+        self.group = group
+        self.pixels = array.array("I", [0] * num_leds)
+        self.mode = mode
+        self.W_in_mode = False
+        self.shift = (((mode.index('R') ^ 3) - 1) * 8, ((mode.index('G') ^ 3) - 1) * 8,
+                      ((mode.index('B') ^ 3) - 1) * 8, 0)
+        self.num_leds = num_leds
+        self.brightnessvalue = 255
+
+    def show(self):
+        self.group.show()
@@ -0,0 +1,124 @@
+"""
+Main loop profiler.
+
+Times each phase of MainProgram.update with ticks_us into fixed-bucket histograms, and tracks the loop period
+and its worst-case jitter. Everything is preallocated, a mark is a ticks_us, a ticks_diff and a bucket add,
+so it can be left on. To compile it out entirely set PROFILE = const(0) in main.py.
+
+Send 'p' over the USB serial console to dump the results (MainProgram adds its per-state counts), 'r' to reset
+them.
+"""
+
+import array
+import select
+import sys
+import time
+
+PHASE_LED = 0
+PHASE_MATRIX = 1
+PHASE_BUTTONS = 2
+PHASE_BEAMS = 3
+PHASE_STEPPERS = 4
+PHASE_STATE = 5
+PHASE_LOOP = 6  # whole loop period, start to start
+PHASE_REMOTE = 7
+PHASE_BUS = 8
+
+PHASE_NAMES = ("led", "matrix", "buttons", "beams", "steppers", "state", "period", "remote", "bus")
+NUM_PHASES = 9
+
+# bucket i counts durations below 16 << i us, the last bucket everything above
+NUM_BUCKETS = 10
+BUCKET_BASE = 16
+
+
+class Profiler:
+
+    def __init__(self, period_us=1000, console=True):
+        """
+        :param period_us: nominal loop period, jitter is measured against it
+        :param console: poll the serial console for 'p' and 'r', off when something else owns it (remote.py)
+        """
+        self.period_us = period_us
+
+        self.hist = array.array("I", [0] * (NUM_PHASES * NUM_BUCKETS))
+        self.total = array.array("I", [0] * NUM_PHASES)  # us, wraps after ~17 minutes of a phase (small ints)
+        self.worst = array.array("I", [0] * NUM_PHASES)
+        self.count = array.array("I", [0] * NUM_PHASES)
+
+        self.worst_jitter = 0
+        self.loop_start = 0
+        self.last_mark = 0
+        self.started = False
+
+        self.poller = None
+        if console:
+            self.poller = select.poll()
+            self.poller.register(sys.stdin, select.POLLIN)
+            # MicroPython's ipoll doesn't allocate a result list, CPython (the simulator) only has poll
+            self._poll = getattr(self.poller, "ipoll", self.poller.poll)
+
+    def _add(self, phase, us):
+        bucket = 0
+        limit = BUCKET_BASE
+        while us >= limit and bucket < NUM_BUCKETS - 1:
+            bucket += 1
+            limit <<= 1
+
+        self.hist[phase * NUM_BUCKETS + bucket] += 1
+        self.total[phase] = (self.total[phase] + us) & 0x3FFFFFFF
+        self.count[phase] += 1
+        if us > self.worst[phase]:
+            self.worst[phase] = us
+
+    def start(self):
+        # call at the top of every loop
+        now = time.ticks_us()
+        if self.started:
+            period = time.ticks_diff(now, self.loop_start)
+            self._add(PHASE_LOOP, period)
+            jitter = abs(period - self.period_us)
+            if jitter > self.worst_jitter:
+                self.worst_jitter = jitter
+        self.started = True
+        self.loop_start = now
+        self.last_mark = now
+
+    def mark(self, phase):
+        # call at the end of each phase, times it from the previous mark
+        now = time.ticks_us()
+        self._add(phase, time.ticks_diff(now, self.last_mark))
+        self.last_mark = now
+
+    def reset(self):
+        for i in range(len(self.hist)):
+            self.hist[i] = 0
+        for i in range(NUM_PHASES):
+            self.total[i] = 0
+            self.worst[i] = 0
+            self.count[i] = 0
+        self.worst_jitter = 0
+        self.started = False
+
+    def dump(self):
+        print("phase       count     avg us  worst us  histogram (<16us, <32us, ... >=4096us)")
+        for phase in range(NUM_PHASES):
+            count = self.count[phase]
+            avg = self.total[phase] // count if count else 0
+            buckets = self.hist[phase * NUM_BUCKETS:(phase + 1) * NUM_BUCKETS]
+            print("{:10} {:6} {:10} {:9}  {}".format(
+                PHASE_NAMES[phase], count, avg, self.worst[phase], " ".join(str(b) for b in buckets)))
+        print("worst jitter: {} us against a {} us period".format(self.worst_jitter, self.period_us))
+
+    def poll(self):
+        # non-blocking check for a dump/reset request on the serial console, returns the command read if any
+        if self.poller is None:
+            return None
+        for _ in self._poll(0):
+            cmd = sys.stdin.read(1)
+            if cmd == "p":
+                self.dump()
+            elif cmd == "r":
+                self.reset()
+            return cmd
+        return None
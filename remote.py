@@ -0,0 +1,227 @@
+"""
+Binary command and telemetry protocol on the USB serial port.
+
+Frames in both directions:
+
+    SYNC  LEN  CMD  payload (LEN bytes)  CHECK
+
+CHECK is the low byte of LEN + CMD + the payload bytes. SYNC is above 0x7F, so it never shows up in the text the
+firmware prints on the same port; bytes outside a frame are text. Commands (host -> board), every one is
+answered with an ACK frame (CMD | 0x80) carrying a status byte:
+
+    PING                        -
+    THETA / PHI                 int16 angle in degrees
+    FIRE                        -
+    BOARD                       9 cells (0 empty, 1, 2), player to move (1 or 2)
+    STATE                       game state to switch to
+    TELEMETRY                   uint16 period in ms, 0 stops the stream
+    PROFILE                     'p' dump the profiler, 'r' reset it
+    CONFIG                      uint8 key, uint16 value (see config.py); empty asks for a CONFIG frame
+
+TELEMETRY frames (board -> host), little endian:
+
+    uint32 ticks, uint8 state, uint8 player, uint8[3] board (2 bits a cell), int16 theta steps, int16 phi steps,
+    uint16 pressed buttons, uint8 broken beams
+
+CONFIG frames (board -> host): a uint16 for every config key, in key order.
+
+Input is read with a non-blocking poll, at most max_bytes a tick. Output is queued in a fixed buffer and
+written out in one go by flush(), which the main loop calls from its LED tick.
+
+Reading the USB serial port, the remote takes over the REPL's console: MicroPython raises KeyboardInterrupt on
+every 0x03 byte there, and frames are full of them (CMD_PHI, a LEN of 3, payload and check bytes), so Ctrl-C is
+turned off until close(). The firmware is then stopped by a reset.
+"""
+
+import micropython
+import select
+import sys
+
+SYNC = 0xA5
+MAX_PAYLOAD = 24
+
+CMD_PING = 0x01
+CMD_THETA = 0x02
+CMD_PHI = 0x03
+CMD_FIRE = 0x04
+CMD_BOARD = 0x05
+CMD_STATE = 0x06
+CMD_TELEMETRY = 0x07
+CMD_PROFILE = 0x08
+CMD_CONFIG = 0x09
+
+ACK = 0x80
+FRAME_TELEMETRY = 0xF0
+FRAME_CONFIG = 0xF1
+TELEMETRY_SIZE = 16
+
+STATUS_OK = 0
+STATUS_REJECTED = 1  # not possible in the current state, or bad arguments
+STATUS_UNKNOWN = 2
+STATUS_BAD_FRAME = 3
+
+# receive states
+_WAIT_SYNC = 0
+_WAIT_LEN = 1
+_WAIT_CMD = 2
+_WAIT_DATA = 3
+_WAIT_CHECK = 4
+
+
+def checksum(length, cmd, payload, n):
+    total = length + cmd
+    for i in range(n):
+        total += payload[i]
+    return total & 0xFF
+
+
+class Remote:
+
+    def __init__(self, handler, text_handler=None, stream_in=None, stream_out=None, max_bytes=32,
+                 tx_size=256):
+        """
+        :param handler: handler(cmd, payload, length) for every valid frame, returns a status byte. payload is
+        a reused buffer, valid until the handler returns
+        :param text_handler: text_handler(byte) for bytes outside frames, e.g. console commands
+        :param stream_in: binary stream to read, default the USB serial port
+        :param stream_out: binary stream to write, default the USB serial port
+        :param max_bytes: most bytes parsed a tick
+        :param tx_size: output queue size, frames that don't fit are dropped and counted
+        """
+        self.handler = handler
+        self.text_handler = text_handler
+        self.console = stream_in is None  # reading the REPL's input
+        self.stream_in = stream_in if stream_in is not None else sys.stdin.buffer
+        self.stream_out = stream_out if stream_out is not None else sys.stdout.buffer
+        self.max_bytes = max_bytes
+
+        self.poller = select.poll()
+        self.poller.register(self.stream_in, select.POLLIN)
+        self._poll = getattr(self.poller, "ipoll", self.poller.poll)  # ipoll doesn't allocate on MicroPython
+
+        self.byte = bytearray(1)
+        self.rx = bytearray(MAX_PAYLOAD)
+        self.rx_state = _WAIT_SYNC
+        self.rx_len = 0
+        self.rx_cmd = 0
+        self.rx_pos = 0
+
+        self.tx = bytearray(tx_size)
+        self.tx_view = memoryview(self.tx)
+        self.tx_len = 0
+        self.tx_frame = 0  # start of the frame being queued
+
+        self.frames = 0
+        self.bad_frames = 0
+        self.dropped = 0
+
+        # 0x03 is data from here on, not Ctrl-C (the simulator's micropython has no kbd_intr)
+        if self.console and hasattr(micropython, "kbd_intr"):
+            micropython.kbd_intr(-1)
+
+    def close(self):
+        # give Ctrl-C back to the REPL
+        if self.console and hasattr(micropython, "kbd_intr"):
+            micropython.kbd_intr(3)
+
+    # ----------------------------------------- RECEIVE ----------------------------------------- #
+
+    def poll(self):
+        # parse what has arrived, up to max_bytes. acks go out straight away, telemetry waits for flush()
+        frames = self.frames + self.bad_frames
+        n = 0
+        while n < self.max_bytes:
+            ready = False
+            for _ in self._poll(0):
+                ready = True
+                break
+            if not ready or not self.stream_in.readinto(self.byte):
+                break
+            self._feed(self.byte[0])
+            n += 1
+
+        if self.frames + self.bad_frames != frames:
+            self.flush()
+
+    def _feed(self, b):
+        state = self.rx_state
+        if state == _WAIT_SYNC:
+            if b == SYNC:
+                self.rx_state = _WAIT_LEN
+            elif self.text_handler is not None:
+                self.text_handler(b)
+        elif state == _WAIT_LEN:
+            if b > MAX_PAYLOAD:
+                self.bad_frames += 1
+                self.rx_state = _WAIT_SYNC
+            else:
+                self.rx_len = b
+                self.rx_state = _WAIT_CMD
+        elif state == _WAIT_CMD:
+            self.rx_cmd = b
+            self.rx_pos = 0
+            self.rx_state = _WAIT_DATA if self.rx_len else _WAIT_CHECK
+        elif state == _WAIT_DATA:
+            self.rx[self.rx_pos] = b
+            self.rx_pos += 1
+            if self.rx_pos == self.rx_len:
+                self.rx_state = _WAIT_CHECK
+        else:
+            self.rx_state = _WAIT_SYNC
+            if b != checksum(self.rx_len, self.rx_cmd, self.rx, self.rx_len):
+                self.bad_frames += 1
+                self.ack(self.rx_cmd, STATUS_BAD_FRAME)
+                return
+            self.frames += 1
+            self.ack(self.rx_cmd, self.handler(self.rx_cmd, self.rx, self.rx_len))
+
+    # ----------------------------------------- TRANSMIT ----------------------------------------- #
+
+    def begin(self, cmd, length):
+        """
+        Start a frame in the output queue, the caller then put()s exactly `length` payload bytes and end()s it.
+
+        :return: False (and the frame is dropped) if it doesn't fit
+        """
+        if self.tx_len + length + 4 > len(self.tx):
+            self.dropped += 1
+            return False
+        tx = self.tx
+        i = self.tx_len
+        tx[i] = SYNC
+        tx[i + 1] = length
+        tx[i + 2] = cmd
+        self.tx_frame = i
+        self.tx_len = i + 3
+        return True
+
+    def put(self, byte):
+        self.tx[self.tx_len] = byte & 0xFF
+        self.tx_len += 1
+
+    def put16(self, value):
+        self.put(value)
+        self.put(value >> 8)
+
+    def put32(self, value):
+        self.put16(value)
+        self.put16(value >> 16)
+
+    def end(self):
+        # the check covers everything after SYNC
+        tx = self.tx
+        total = 0
+        for i in range(self.tx_frame + 1, self.tx_len):
+            total += tx[i]
+        tx[self.tx_len] = total & 0xFF
+        self.tx_len += 1
+
+    def ack(self, cmd, status):
+        if self.begin(cmd | ACK, 1):
+            self.put(status)
+            self.end()
+
+    def flush(self):
+        if self.tx_len:
+            self.stream_out.write(self.tx_view[:self.tx_len])
+            self.tx_len = 0
@@ -0,0 +1,136 @@
+"""
+Closed-loop shot correction.
+
+Every auto shot is logged with the cell it was aimed at, the beams it broke and the stepper position it was
+fired from. When the ball lands somewhere else, the miss in rows/columns is turned into a theta/phi error and
+folded into a per-cell offset with a running estimator: the gain starts at 1/n (a plain running mean) and
+settles at `min_gain` (an exponential average) so the offset keeps tracking drift. Memory is fixed and each
+update is O(1).
+
+The beams are two rows of three. Beams 0-2 each cross one board column (beam 0 = column 2), beams 3-5 each
+cross one board row (beam 3 = row 2). A ball that lands off the grid may still break one beam, which still
+tells us the error along that axis.
+"""
+
+import array
+
+NO_CELL = -1
+
+# log record: intended cell, beam mask, theta, phi, observed cell
+_LOG_FIELDS = 5
+
+
+def beam_mask(beam_states):
+    # bit i set when beam i is broken
+    mask = 0
+    for i in range(len(beam_states)):
+        if beam_states[i] == 0:
+            mask |= 1 << i
+    return mask
+
+
+def _axis(mask):
+    # mean beam index of the broken beams on one axis (3 bits), or -1 if none are broken
+    total = 0
+    count = 0
+    for i in range(3):
+        if mask & (1 << i):
+            total += i
+            count += 1
+    if count == 0:
+        return -1
+    return total / count
+
+
+class ShotCorrector:
+
+    def __init__(self, theta_per_row, phi_per_col, min_gain=0.2, log_size=32):
+        """
+        :param theta_per_row: theta steps between neighbouring rows (towards the launcher is positive)
+        :param phi_per_col: phi steps between neighbouring columns (towards column 2 is positive)
+        :param min_gain: lowest gain of the estimator, higher follows drift faster but is noisier
+        :param log_size: number of shots kept in the log
+        """
+        self.theta_per_row = theta_per_row
+        self.phi_per_col = phi_per_col
+        self.min_gain = min_gain
+
+        self.offsets = array.array("f", [0] * 18)  # theta, phi interleaved per cell, in steps
+        self.updates = array.array("H", [0] * 9)
+
+        self.log = array.array("h", [0] * (log_size * _LOG_FIELDS))
+        self.log_size = log_size
+        self.log_idx = 0
+
+        self.shots = 0
+        self.hits = 0
+
+    def offset(self, cell):
+        """
+        :return: tuple of (theta, phi) correction in whole steps for a cell
+        """
+        # round to an even number of steps, the step pin is toggled twice per step
+        return round(self.offsets[cell * 2] / 2) * 2, round(self.offsets[cell * 2 + 1] / 2) * 2
+
+    def record(self, cell, mask, theta, phi):
+        """
+        Log a shot and update the offset of the cell it was aimed at.
+
+        :param cell: intended board cell, NO_CELL for hand aimed shots (logged only)
+        :param mask: broken beams, see beam_mask()
+        :param theta: theta steps the shot was fired from
+        :param phi: phi steps the shot was fired from
+        :return: cell the ball landed in, or NO_CELL
+        """
+        beam_col = _axis(mask)
+        beam_row = _axis(mask >> 3)
+
+        col = -1 if beam_col < 0 else 2 - beam_col
+        row = -1 if beam_row < 0 else 2 - beam_row
+        observed = NO_CELL
+        if col >= 0 and row >= 0 and col == int(col) and row == int(row):
+            observed = int(row) * 3 + int(col)
+
+        idx = self.log_idx * _LOG_FIELDS
+        self.log[idx] = cell
+        self.log[idx + 1] = mask
+        self.log[idx + 2] = theta
+        self.log[idx + 3] = phi
+        self.log[idx + 4] = observed
+        self.log_idx = (self.log_idx + 1) % self.log_size
+
+        if cell == NO_CELL:
+            return observed
+
+        self.shots += 1
+        if observed == cell:
+            self.hits += 1
+
+        if mask == 0:
+            return observed  # no idea where it went
+
+        n = self.updates[cell] + 1
+        if n < 0xFFFF:
+            self.updates[cell] = n
+        gain = max(self.min_gain, 1 / n)
+
+        # landing a row nearer than intended means theta was too high for that cell (and so on)
+        if row >= 0:
+            error = (row - cell // 3) * self.theta_per_row
+            self.offsets[cell * 2] -= gain * error
+        if col >= 0:
+            error = (col - cell % 3) * self.phi_per_col
+            self.offsets[cell * 2 + 1] -= gain * error
+
+        return observed
+
+    def rebase(self, cell):
+        """
+        Drop the offset of a cell once the aim that hit it has been stored as its new calibration.
+        """
+        self.offsets[cell * 2] = 0
+        self.offsets[cell * 2 + 1] = 0
+        self.updates[cell] = 0
+
+    def hit_rate(self):
+        return self.hits / self.shots if self.shots else 0
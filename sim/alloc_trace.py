@@ -0,0 +1,106 @@
+"""
+Heap allocation tracer for firmware code run under the simulator.
+
+CPython allocates for nearly everything (ints above 256, iterators, frames), so its allocator can't tell
+whether the firmware would allocate on the Pico. Instead every bytecode executed in the firmware modules is
+checked against the constructs that allocate on MicroPython:
+
+    - building lists, tuples (other than constants), dicts, sets, slices and strings
+    - closures, lambdas, comprehensions and generator expressions
+    - true division, which always gives a boxed float on the rp2 port
+    - calls to constructors and string methods (bytearray(), array.array(), "".format(), ...)
+    - machine calls that return a new buffer (I2C.readfrom_mem, I2C.scan, ...)
+
+Not caught: floats from arithmetic on other floats, ints past 2**30 and bound methods stored as values.
+
+    tracer = AllocTracer()
+    with tracer:
+        program.update(ticks)
+    tracer.sites  # {(file, line, what): count}
+"""
+
+import dis
+import os
+import sys
+
+import simulator
+
+BUILD_OPS = {"BUILD_LIST", "BUILD_TUPLE", "BUILD_MAP", "BUILD_CONST_KEY_MAP", "BUILD_SET", "BUILD_STRING",
+             "BUILD_SLICE", "FORMAT_VALUE", "MAKE_FUNCTION", "LIST_EXTEND", "SET_UPDATE", "DICT_UPDATE",
+             "DICT_MERGE", "LIST_TO_TUPLE", "RETURN_GENERATOR"}
+DIVISION = {"/", "/="}
+
+ALLOCATING_BUILTINS = {"bytearray", "bytes", "list", "tuple", "dict", "set", "str", "float", "sorted",
+                       "enumerate", "zip", "map", "filter", "reversed", "memoryview"}
+ALLOCATING_METHODS = {"format", "join", "split", "strip", "encode", "decode", "copy", "array", "items",
+                      "keys", "values"}
+ALLOCATING_MACHINE_CALLS = {"readfrom_mem", "readfrom", "scan", "read"}
+
+MACHINE_FILE = os.path.join(simulator.SIM_DIR, "machine.py")
+
+
+def _is_firmware(filename):
+    return os.path.dirname(os.path.abspath(filename)) == simulator.REPO_DIR
+
+
+class AllocTracer:
+
+    def __init__(self):
+        self.sites = {}
+        self._ops = {}  # code object -> {offset: what allocates there}
+
+    def _code_ops(self, code):
+        ops = self._ops.get(code)
+        if ops is None:
+            ops = {}
+            for ins in dis.get_instructions(code):
+                what = None
+                if ins.opname in BUILD_OPS:
+                    what = ins.opname
+                elif ins.opname == "BINARY_OP" and ins.argrepr in DIVISION:
+                    what = "float division"
+                elif ins.opname in ("LOAD_GLOBAL", "LOAD_NAME") and ins.argval in ALLOCATING_BUILTINS:
+                    what = "{}()".format(ins.argval)
+                elif ins.opname in ("LOAD_ATTR", "LOAD_METHOD") and ins.argval in ALLOCATING_METHODS:
+                    what = ".{}()".format(ins.argval)
+                if what is not None:
+                    ops[ins.offset] = what
+            self._ops[code] = ops
+        return ops
+
+    def _hit(self, frame, what):
+        key = (os.path.basename(frame.f_code.co_filename), frame.f_lineno, what)
+        self.sites[key] = self.sites.get(key, 0) + 1
+
+    def _trace(self, frame, event, arg):
+        code = frame.f_code
+        if event == "call":
+            if code.co_filename == MACHINE_FILE and code.co_name in ALLOCATING_MACHINE_CALLS:
+                caller = frame.f_back
+                if caller is not None and _is_firmware(caller.f_code.co_filename):
+                    self._hit(caller, "machine {}()".format(code.co_name))
+                return None
+            if not _is_firmware(code.co_filename):
+                return None
+            frame.f_trace_opcodes = True
+            frame.f_trace_lines = False
+            return self._trace
+        if event == "opcode":
+            what = self._code_ops(code).get(frame.f_lasti)
+            if what is not None:
+                self._hit(frame, what)
+        return self._trace
+
+    def __enter__(self):
+        sys.settrace(self._trace)
+        return self
+
+    def __exit__(self, *exc):
+        sys.settrace(None)
+        return False
+
+    def total(self):
+        return sum(self.sites.values())
+
+    def reset(self):
+        self.sites = {}
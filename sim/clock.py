@@ -0,0 +1,106 @@
+"""
+Simulated time base.
+
+install() adds the MicroPython tick functions (ticks_ms, ticks_us, ticks_diff, ticks_add, sleep_ms, sleep_us)
+to the host `time` module. By default they run on a virtual clock that only moves when the code sleeps or
+the simulator advances it, so runs are deterministic and idle waits cost nothing. With realtime=True they
+follow the host's performance counter instead, for timing code with the profiler.
+
+machine.Timer callbacks are alarms on the clock. On the virtual clock they fire at their due time while the
+clock is advanced past it, in the middle of a sleep. On the host clock they fire on the first sleep that ends
+after it.
+"""
+
+import time
+
+_host_sleep = time.sleep
+_perf_counter_ns = time.perf_counter_ns
+
+
+class Clock:
+
+    def __init__(self):
+        self.now_us = 0
+        self.realtime = False
+        self._base_ns = _perf_counter_ns()
+        self.alarms = []  # armed machine.Timers, each with a due_us and fire()
+
+    def us(self):
+        if self.realtime:
+            return (_perf_counter_ns() - self._base_ns) // 1000
+        return self.now_us
+
+    def advance_us(self, us):
+        if self.realtime:
+            _host_sleep(us / 1000000)
+            self.run_alarms(self.us())
+        else:
+            self.set_us(self.now_us + us)
+
+    def set_us(self, us):
+        # move the virtual clock to `us`, firing the alarms due on the way with the clock at their due time
+        while True:
+            alarm = self._next_alarm()
+            if alarm is None or alarm.due_us > us:
+                break
+            self.now_us = max(self.now_us, alarm.due_us)
+            alarm.fire()
+        self.now_us = us
+
+    def run_alarms(self, now):
+        while True:
+            alarm = self._next_alarm()
+            if alarm is None or alarm.due_us > now:
+                break
+            alarm.fire()
+
+    def _next_alarm(self):
+        alarms = self.alarms
+        if not alarms:
+            return None
+        return min(alarms, key=lambda alarm: alarm.due_us)
+
+    def advance_ms(self, ms):
+        self.advance_us(ms * 1000)
+
+
+clock = Clock()
+
+
+def ticks_ms():
+    return clock.us() // 1000
+
+
+def ticks_us():
+    return clock.us()
+
+
+def ticks_cpu():
+    return clock.us()
+
+
+def ticks_diff(new, old):
+    return new - old
+
+
+def ticks_add(ticks, delta):
+    return ticks + delta
+
+
+def sleep_ms(ms):
+    clock.advance_us(ms * 1000)
+
+
+def sleep_us(us):
+    clock.advance_us(us)
+
+
+def install():
+    time.ticks_ms = ticks_ms
+    time.ticks_us = ticks_us
+    time.ticks_cpu = ticks_cpu
+    time.ticks_diff = ticks_diff
+    time.ticks_add = ticks_add
+    time.sleep_ms = sleep_ms
+    time.sleep_us = sleep_us
+    return clock
@@ -0,0 +1,73 @@
+"""
+Register models of the peripherals on the launcher board, attached to the simulated buses.
+"""
+
+
+class MCP23017Model:
+    # 22 registers in bank 0 layout, IODIR A/B default to all inputs
+
+    def __init__(self):
+        self.regs = bytearray(22)
+        self.regs[0] = 0xFF
+        self.regs[1] = 0xFF
+        self.inputs = [0xFF, 0xFF]  # levels driven onto the pins from outside, pulled high
+        self.on_latch = None  # optional callback(port, old, new) on every output latch write
+
+    def read(self, reg):
+        if reg in (0x12, 0x13):  # GPIO: outputs read back their latch, inputs the pin level
+            port = reg - 0x12
+            iodir = self.regs[port]
+            return (self.regs[0x14 + port] & ~iodir | self.inputs[port] & iodir) & 0xFF
+        return self.regs[reg]
+
+    def write(self, reg, val):
+        if reg in (0x12, 0x13):  # writing GPIO writes the output latch
+            reg += 2
+        old = self.regs[reg]
+        self.regs[reg] = val
+        if reg in (0x14, 0x15) and self.on_latch is not None:
+            self.on_latch(reg - 0x14, old, val)
+
+    def output(self, pin):
+        # current level of an output pin
+        return (self.regs[0x14 + pin // 8] >> (pin % 8)) & 1
+
+    def drive(self, pin, level):
+        # drive an input pin from outside
+        bit = 1 << (pin % 8)
+        port = pin // 8
+        self.inputs[port] = self.inputs[port] | bit if level else self.inputs[port] & ~bit
+
+
+class MAX7219Model:
+    # decodes a chain of MAX7219s from the SPI byte stream, frames are latched on CS rising
+
+    def __init__(self, num):
+        self.num = num
+        self.digits = [bytearray(8) for _ in range(num)]
+        self.intensity = [0] * num
+        self.shutdown = [True] * num
+        self.frames = 0
+        self._pending = bytearray()
+
+    def select(self):
+        self._pending = bytearray()
+
+    def receive(self, data):
+        self._pending.extend(data)
+
+    def latch(self):
+        # the first word clocked in is shifted furthest down the chain, only the last `num` words stay
+        words = len(self._pending) // 2
+        first = max(0, words - self.num)
+        for k in range(first, words):
+            module = self.num - 1 - (k - first)
+            reg = self._pending[k * 2]
+            data = self._pending[k * 2 + 1]
+            if 1 <= reg <= 8:
+                self.digits[module][reg - 1] = data
+            elif reg == 10:
+                self.intensity[module] = data
+            elif reg == 12:
+                self.shutdown[module] = data == 0
+        self.frames += 1
@@ -0,0 +1,186 @@
+"""
+Simulator stand-in for the MicroPython `framebuf` module, MONO_HLSB, MONO_VLSB and MONO_HMSB only.
+
+text() uses the real 8x8 cell size but not the real font: every printable character gets a deterministic
+placeholder glyph, which is enough to exercise the drivers and count bus traffic.
+"""
+
+MONO_VLSB = 0
+MONO_HLSB = 3
+MONO_HMSB = 4
+
+
+# a column byte with its bits spread to bit 0 of successive bytes, row r at bit 8 * r
+_SPREAD = [sum(((c >> r) & 1) << (8 * r) for r in range(8)) for c in range(256)]
+
+_glyph_cache = {}
+_row_cache = {}
+
+
+def _glyph(ch):
+    # 8 column bytes, LSB at the top, like the firmware's font
+    glyph = _glyph_cache.get(ch)
+    if glyph is None:
+        code = ord(ch)
+        if code <= 32 or code > 126:
+            glyph = bytes(8)
+        else:
+            glyph = bytes(((code * 37 + col * 11) & 0x7E) | 0x02 if 0 < col < 7 else 0 for col in range(8))
+        _glyph_cache[ch] = glyph
+    return glyph
+
+
+def _glyph_rows(ch):
+    # the same glyph as 8 row bytes, MSB on the left, for the MONO_HLSB fast path
+    rows = _row_cache.get(ch)
+    if rows is None:
+        glyph = _glyph(ch)
+        rows = bytes(sum(((glyph[col] >> row) & 1) << (7 - col) for col in range(8)) for row in range(8))
+        _row_cache[ch] = rows
+    return rows
+
+
+class FrameBuffer:
+
+    def __init__(self, buffer, width, height, format, stride=None):
+        self.buffer = buffer
+        self.width = width
+        self.height = height
+        self.format = format
+        self.stride = width if stride is None else stride
+
+    def _index(self, x, y):
+        if self.format == MONO_VLSB:
+            return (y >> 3) * self.stride + x, y & 7
+        if self.format == MONO_HLSB:
+            return (x + y * self.stride) >> 3, 7 - (x & 7)
+        return (x + y * self.stride) >> 3, x & 7
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        idx, bit = self._index(x, y)
+        if c is None:
+            return (self.buffer[idx] >> bit) & 1
+        if c:
+            self.buffer[idx] |= 1 << bit
+        else:
+            self.buffer[idx] &= ~(1 << bit) & 0xFF
+
+    def fill(self, c):
+        self.buffer[:] = (b"\xff" if c else b"\x00") * len(self.buffer)
+
+    def fill_rect(self, x, y, w, h, c):
+        for yy in range(max(0, y), min(self.height, y + h)):
+            for xx in range(max(0, x), min(self.width, x + w)):
+                self.pixel(xx, yy, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self.fill_rect(x, y, w, h, c)
+            return
+        self.hline(x, y, w, c)
+        self.hline(x, y + h - 1, w, c)
+        self.vline(x, y, h, c)
+        self.vline(x + w - 1, y, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        dx = abs(x2 - x1)
+        dy = -abs(y2 - y1)
+        sx = 1 if x1 < x2 else -1
+        sy = 1 if y1 < y2 else -1
+        err = dx + dy
+        while True:
+            self.pixel(x1, y1, c)
+            if x1 == x2 and y1 == y2:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x1 += sx
+            if e2 <= dx:
+                err += dx
+                y1 += sy
+
+    def text(self, s, x, y, c=1):
+        if self.format == MONO_HLSB and c and y == 0 and self.height == 8:
+            self._text_hlsb(s, x)
+            return
+        for ch in s:
+            if x >= self.width:
+                break
+            if x > -8:
+                glyph = _glyph(ch)
+                for col in range(8):
+                    bits = glyph[col]
+                    for row in range(8):
+                        if bits >> row & 1:
+                            self.pixel(x + col, y + row, c)
+            x += 8
+
+    def _text_hlsb(self, s, x):
+        # whole glyph rows OR-ed into the buffer, clipped to the row
+        buf = self.buffer
+        row_bytes = self.width >> 3
+        for ch in s:
+            if x >= self.width:
+                break
+            if x > -8:
+                rows = _glyph_rows(ch)
+                shift = x & 7
+                first = x >> 3
+                for row in range(8):
+                    bits = rows[row]
+                    base = (row * self.stride) >> 3
+                    if 0 <= first < row_bytes:
+                        buf[base + first] |= bits >> shift
+                    if shift and 0 <= first + 1 < row_bytes:
+                        buf[base + first + 1] |= (bits << (8 - shift)) & 0xFF
+            x += 8
+
+    def scroll(self, dx, dy):
+        pixels = [[self.pixel(x, y) for x in range(self.width)] for y in range(self.height)]
+        for y in range(self.height):
+            for x in range(self.width):
+                sx = x - dx
+                sy = y - dy
+                if 0 <= sx < self.width and 0 <= sy < self.height:
+                    self.pixel(x, y, pixels[sy][sx])
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        if (fbuf.format == MONO_VLSB and self.format == MONO_HLSB and fbuf.height == 8 and self.height == 8
+                and y == 0 and key == -1):
+            self._blit_columns(fbuf, x)
+            return
+        for yy in range(max(0, -y), min(fbuf.height, self.height - y)):
+            for xx in range(max(0, -x), min(fbuf.width, self.width - x)):
+                c = fbuf.pixel(xx, yy)
+                if c != key:
+                    self.pixel(x + xx, y + yy, c)
+
+    def _blit_columns(self, fbuf, x):
+        # a row of column bytes (rendered text) onto a row of HLSB bytes, a destination byte at a time
+        src = fbuf.buffer
+        buf = self.buffer
+        row_bytes = self.stride >> 3
+        first = x + max(0, -x)
+        last = x + min(fbuf.width, self.width - x)  # destination columns first..last-1
+        if first >= last:
+            return
+        for byte in range(first >> 3, ((last - 1) >> 3) + 1):
+            rows = 0
+            mask = 0
+            for bit in range(8):
+                dx = byte * 8 + bit
+                if first <= dx < last:
+                    mask |= 0x80 >> bit
+                    rows |= _SPREAD[src[dx - x]] << (7 - bit)
+            for row in range(8):
+                i = row * row_bytes + byte
+                buf[i] = (buf[i] & ~mask & 0xFF) | ((rows >> (8 * row)) & 0xFF)
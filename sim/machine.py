@@ -0,0 +1,231 @@
+"""
+Simulator stand-in for the MicroPython `machine` module on the RP2040.
+
+Pins, I2C and SPI keep their state in memory and count bus traffic so benchmarks can report it. Inputs are
+driven with Pin.drive(), output edges can be watched with Pin.watch(). Devices are attached to buses through
+I2C.devices / SPI.listeners (see simulator.wire_board()).
+"""
+
+import time
+
+_freq = 125_000_000
+
+
+def freq(hz=None):
+    global _freq
+    if hz is None:
+        return _freq
+    _freq = hz
+
+
+def reset():
+    raise SystemExit("machine.reset()")
+
+
+def idle():
+    pass
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    _levels = {}  # pin id -> level driven from outside
+    _watchers = {}  # pin id -> callback(level) on output change
+    _outputs = {}  # pin id -> current output level
+
+    def __init__(self, id, mode=IN, pull=None, value=None):
+        self.id = id
+        self.mode = mode
+        self.pull = pull
+        self._irq = None
+        if value is not None:
+            self._set(value)
+
+    @classmethod
+    def drive(cls, id, level):
+        cls._levels[id] = level
+
+    @classmethod
+    def watch(cls, id, callback):
+        cls._watchers[id] = callback
+
+    @classmethod
+    def level(cls, id):
+        return cls._outputs.get(id, 0)
+
+    @classmethod
+    def reset_all(cls):
+        cls._levels = {}
+        cls._watchers = {}
+        cls._outputs = {}
+
+    def init(self, mode=-1, pull=-1, value=None):
+        if mode != -1:
+            self.mode = mode
+        if pull != -1:
+            self.pull = pull
+        if value is not None:
+            self._set(value)
+
+    def _set(self, val):
+        val = 1 if val else 0
+        if Pin._outputs.get(self.id) != val:
+            Pin._outputs[self.id] = val
+            watcher = Pin._watchers.get(self.id)
+            if watcher is not None:
+                watcher(val)
+
+    def value(self, val=None):
+        if val is None:
+            if self.mode == Pin.OUT:
+                return Pin._outputs.get(self.id, 0)
+            return Pin._levels.get(self.id, 1 if self.pull == Pin.PULL_UP else 0)
+        self._set(val)
+
+    def __call__(self, val=None):
+        return self.value(val)
+
+    def on(self):
+        self._set(1)
+
+    def off(self):
+        self._set(0)
+
+    def toggle(self):
+        self._set(not self.value())
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING):
+        self._irq = handler
+
+
+class _Bus:
+    timed = False  # transfers advance the clock by their time on the bus, see simulator.Board(bus_time=True)
+
+    def __init__(self):
+        self.transactions = 0
+        self.bytes = 0
+
+    def stats(self):
+        return {"transactions": self.transactions, "bytes": self.bytes}
+
+    def reset_stats(self):
+        self.transactions = 0
+        self.bytes = 0
+
+
+class I2C(_Bus):
+    devices = {}  # bus id -> {address: device model}
+    buses = {}  # bus id -> last I2C created on it
+
+    def __init__(self, id, scl=None, sda=None, freq=400000):
+        super().__init__()
+        self.id = id
+        self.freq = freq
+        I2C.buses[id] = self
+
+    def _device(self, addr):
+        dev = I2C.devices.get(self.id, {}).get(addr)
+        if dev is None:
+            raise OSError(5)  # EIO, nobody acked
+        return dev
+
+    def _charge(self, nbytes):
+        if _Bus.timed:
+            time.sleep_us(nbytes * 9 * 1000000 // self.freq)  # 8 bits and an ack a byte
+
+    def scan(self):
+        self.transactions += 1
+        return sorted(I2C.devices.get(self.id, {}))
+
+    def readfrom_mem(self, addr, memaddr, nbytes):
+        dev = self._device(addr)
+        self.transactions += 1
+        self.bytes += 2 + nbytes  # address + register, then data
+        self._charge(2 + nbytes)
+        return bytes(dev.read(memaddr + i) for i in range(nbytes))
+
+    def readfrom_mem_into(self, addr, memaddr, buf):
+        dev = self._device(addr)
+        self.transactions += 1
+        self.bytes += 2 + len(buf)
+        self._charge(2 + len(buf))
+        for i in range(len(buf)):
+            buf[i] = dev.read(memaddr + i)
+
+    def writeto_mem(self, addr, memaddr, buf):
+        dev = self._device(addr)
+        self.transactions += 1
+        self.bytes += 2 + len(buf)
+        self._charge(2 + len(buf))
+        for i in range(len(buf)):
+            dev.write(memaddr + i, buf[i])
+
+
+class SPI(_Bus):
+    listeners = {}  # bus id -> callback(data)
+    buses = {}
+
+    def __init__(self, id, baudrate=1000000, sck=None, mosi=None, miso=None):
+        super().__init__()
+        self.id = id
+        self.baudrate = baudrate
+        SPI.buses[id] = self
+
+    def init(self, baudrate=1000000, **kwargs):
+        self.baudrate = baudrate
+
+    def write(self, buf):
+        self.transactions += 1
+        self.bytes += len(buf)
+        if _Bus.timed:
+            time.sleep_us(len(buf) * 8 * 1000000 // self.baudrate)
+        listener = SPI.listeners.get(self.id)
+        if listener is not None:
+            listener(buf, self.id)
+
+
+class Timer:
+    # callbacks fire from the simulated clock, see clock.py. `hard` is accepted and ignored.
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, mode=PERIODIC, period=-1, freq=-1, tick_hz=1000, callback=None, hard=False):
+        self.callback = None
+        self.due_us = 0
+        if callback is not None:
+            self.init(mode=mode, period=period, freq=freq, tick_hz=tick_hz, callback=callback, hard=hard)
+
+    def init(self, mode=PERIODIC, period=-1, freq=-1, tick_hz=1000, callback=None, hard=False):
+        from clock import clock
+        self.mode = mode
+        self.callback = callback
+        if freq > 0:
+            self.period_us = 1000000 // freq
+        else:
+            self.period_us = (period if period > 0 else 1000) * 1000000 // tick_hz
+        self.due_us = time.ticks_us() + self.period_us
+        if self not in clock.alarms:
+            clock.alarms.append(self)
+
+    def fire(self):
+        from clock import clock
+        if self.mode == Timer.ONE_SHOT:
+            clock.alarms.remove(self)
+        else:
+            self.due_us += self.period_us
+        callback = self.callback
+        if self.mode == Timer.ONE_SHOT:
+            self.callback = None
+        callback(self)
+
+    def deinit(self):
+        from clock import clock
+        self.callback = None
+        if self in clock.alarms:
+            clock.alarms.remove(self)
@@ -0,0 +1,330 @@
+"""
+Host side of the serial remote protocol (remote.py). Talks to the board's USB serial port or to the simulator
+on a pseudo-terminal (sim/serial_bridge.py):
+
+    python sim/remote_client.py /dev/ttyACM0 ping
+    python sim/remote_client.py /dev/ttyACM0 state manual
+    python sim/remote_client.py /dev/ttyACM0 aim 30 -10
+    python sim/remote_client.py /dev/ttyACM0 fire
+    python sim/remote_client.py /dev/ttyACM0 board 120020001 1
+    python sim/remote_client.py /dev/ttyACM0 watch --period 100
+    python sim/remote_client.py /dev/ttyACM0 config [NAME VALUE]
+    python sim/remote_client.py sim demo
+
+The port sim starts sim/serial_bridge.py and uses its pty. The demo switches to manual mode, aims, fires and
+follows the shot in the telemetry.
+
+    client = RemoteClient("/dev/ttyACM0")
+    client.state("manual")
+    client.aim(30, -10)
+    client.telemetry(50)
+    frame = client.read_telemetry()  # {"ticks": ..., "state": "manual", "theta": ..., ...}
+"""
+
+import argparse
+import os
+import select
+import subprocess
+import sys
+import termios
+import time
+import tty
+
+SIM_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SIM_DIR))
+
+import config
+import remote
+
+STATE_NAMES = ("main_menu", "select_mode", "manual", "auto", "game_over", "launch", "wait_score", "rapid")
+STATUS_NAMES = ("ok", "rejected", "unknown command", "bad frame")
+
+
+class RemoteError(Exception):
+    pass
+
+
+def frame(cmd, payload=b""):
+    body = bytes((len(payload), cmd)) + bytes(payload)
+    return bytes((remote.SYNC,)) + body + bytes((sum(body) & 0xFF,))
+
+
+def decode_telemetry(payload):
+    cells = payload[6] | (payload[7] << 8) | (payload[8] << 16)
+
+    def signed(lo, hi):
+        value = lo | (hi << 8)
+        return value - 0x10000 if value >= 0x8000 else value
+
+    state = payload[4]
+    return {
+        "ticks": int.from_bytes(payload[0:4], "little"),
+        "state": STATE_NAMES[state] if state < len(STATE_NAMES) else state,
+        "player": payload[5],
+        "board": [(cells >> (2 * i)) & 3 for i in range(9)],
+        "theta": signed(payload[9], payload[10]),
+        "phi": signed(payload[11], payload[12]),
+        "buttons": payload[13] | (payload[14] << 8),
+        "beams": payload[15],
+    }
+
+
+class RemoteClient:
+
+    def __init__(self, port, timeout=1.0):
+        """
+        :param port: serial device path, e.g. /dev/ttyACM0 or the pty printed by sim/serial_bridge.py
+        :param timeout: seconds to wait for an ack
+        """
+        self.fd = os.open(port, os.O_RDWR | os.O_NOCTTY)
+        tty.setraw(self.fd)
+        termios.tcflush(self.fd, termios.TCIFLUSH)
+        self.timeout = timeout
+
+        self.rx = bytearray()
+        self.text = bytearray()  # bytes outside frames: the firmware's prints
+        self.acks = []  # (cmd, status)
+        self.frames = []  # decoded telemetry, oldest first
+        self.config_values = None  # from the last CONFIG frame
+        self.bad_frames = 0
+
+    def close(self):
+        os.close(self.fd)
+
+    # ----------------------------------------- RECEIVE ----------------------------------------- #
+
+    def pump(self, timeout=0.0):
+        # read whatever arrives within `timeout` and parse it
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        self.rx += os.read(self.fd, 4096)
+        self._parse()
+        return True
+
+    def _parse(self):
+        rx = self.rx
+        while rx:
+            start = rx.find(remote.SYNC)
+            if start < 0:
+                self.text += rx
+                del rx[:]
+                return
+            self.text += rx[:start]
+            del rx[:start]
+            if len(rx) < 3:
+                return
+            length, cmd = rx[1], rx[2]
+            if length > remote.MAX_PAYLOAD:
+                self.text += rx[:1]  # not a frame after all, resync on the next SYNC
+                del rx[:1]
+                continue
+            if len(rx) < length + 4:
+                return
+            payload = bytes(rx[3:3 + length])
+            if (length + cmd + sum(payload)) & 0xFF != rx[3 + length]:
+                self.bad_frames += 1
+                del rx[:1]
+                continue
+            del rx[:length + 4]
+
+            if cmd == remote.FRAME_TELEMETRY and length == remote.TELEMETRY_SIZE:
+                self.frames.append(decode_telemetry(payload))
+            elif cmd == remote.FRAME_CONFIG and length == 2 * config.NUM_KEYS:
+                self.config_values = {config.NAMES[i]: payload[2 * i] | (payload[2 * i + 1] << 8)
+                                      for i in range(config.NUM_KEYS)}
+            elif cmd & remote.ACK and length == 1:
+                self.acks.append((cmd & ~remote.ACK, payload[0]))
+
+    def lines(self):
+        # complete lines the firmware printed since the last call
+        end = self.text.rfind(b"\n")
+        if end < 0:
+            return []
+        lines = self.text[:end].decode(errors="replace").splitlines()
+        del self.text[:end + 1]
+        return lines
+
+    def read_telemetry(self, timeout=1.0):
+        """
+        :return: the oldest unread telemetry frame, or None if none arrives within `timeout`
+        """
+        end = time.monotonic() + timeout
+        while not self.frames:
+            left = end - time.monotonic()
+            if left <= 0:
+                return None
+            self.pump(left)
+        return self.frames.pop(0)
+
+    # ----------------------------------------- COMMANDS ----------------------------------------- #
+
+    def command(self, cmd, payload=b""):
+        """
+        Send a command and wait for its ack.
+
+        :return: the status byte
+        :raises RemoteError: no ack within the timeout
+        """
+        self.acks = [ack for ack in self.acks if ack[0] != cmd]
+        os.write(self.fd, frame(cmd, payload))
+        end = time.monotonic() + self.timeout
+        while True:
+            for ack in self.acks:
+                if ack[0] == cmd:
+                    self.acks.remove(ack)
+                    return ack[1]
+            left = end - time.monotonic()
+            if left <= 0:
+                raise RemoteError("no ack for command 0x{:02x}".format(cmd))
+            self.pump(left)
+
+    def _checked(self, cmd, payload=b""):
+        status = self.command(cmd, payload)
+        if status != remote.STATUS_OK:
+            raise RemoteError("command 0x{:02x}: {}".format(
+                cmd, STATUS_NAMES[status] if status < len(STATUS_NAMES) else status))
+
+    def ping(self):
+        start = time.monotonic()
+        self._checked(remote.CMD_PING)
+        return time.monotonic() - start
+
+    def aim(self, theta=None, phi=None):
+        # angles in degrees, the launcher must be in manual or auto mode
+        if theta is not None:
+            self._checked(remote.CMD_THETA, int(theta).to_bytes(2, "little", signed=True))
+        if phi is not None:
+            self._checked(remote.CMD_PHI, int(phi).to_bytes(2, "little", signed=True))
+
+    def fire(self):
+        self._checked(remote.CMD_FIRE)
+
+    def set_board(self, cells, player):
+        """
+        :param cells: 9 cells, 0 empty, 1 or 2 for the player holding it
+        :param player: player to move, 1 or 2
+        """
+        self._checked(remote.CMD_BOARD, bytes(cells) + bytes((player,)))
+
+    def state(self, name):
+        self._checked(remote.CMD_STATE, bytes((STATE_NAMES.index(name),)))
+
+    def telemetry(self, period_ms):
+        # stream a frame every period_ms, 0 stops it
+        self._checked(remote.CMD_TELEMETRY, int(period_ms).to_bytes(2, "little"))
+
+    def config(self, name=None, value=None):
+        """
+        Read the tuning values, or set one. A set takes effect at once and reaches flash once tuning settles.
+
+        :param name: key from config.NAMES
+        :return: {name: value} of all keys, after the set
+        """
+        if name is not None:
+            key = config.NAMES.index(name)
+            self._checked(remote.CMD_CONFIG, bytes((key,)) + int(value).to_bytes(2, "little"))
+        self.config_values = None
+        self._checked(remote.CMD_CONFIG)  # the CONFIG frame is queued before the ack
+        return self.config_values
+
+    def profile(self, what="p"):
+        # 'p' prints the profiler, state and boot reports, 'r' resets the profiler
+        self._checked(remote.CMD_PROFILE, what.encode())
+
+
+# ----------------------------------------- CLI ----------------------------------------- #
+
+def start_bridge():
+    bridge = subprocess.Popen([sys.executable, os.path.join(SIM_DIR, "serial_bridge.py")],
+                              stdout=subprocess.PIPE, text=True)
+    line = bridge.stdout.readline().split()
+    if len(line) != 3:
+        bridge.kill()
+        raise RemoteError("serial bridge didn't start")
+    return bridge, line[2]
+
+
+def demo(client):
+    print("ping {:.1f} ms".format(client.ping() * 1000))
+    client.state("manual")
+    client.telemetry(50)
+    client.aim(30, -10)
+
+    # aimed once the steppers stop moving
+    last = None
+    frame = client.read_telemetry()
+    while frame is not None and (last is None or (frame["theta"], frame["phi"]) != (last["theta"], last["phi"])):
+        last, frame = frame, client.read_telemetry()
+    print("aimed", frame)
+
+    client.fire()
+    states = []
+    end = time.monotonic() + 3
+    while time.monotonic() < end:
+        frame = client.read_telemetry()
+        if frame is not None and (not states or states[-1] != frame["state"]):
+            states.append(frame["state"])
+    print("after firing:", " -> ".join(states))
+    client.telemetry(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial remote control client")
+    parser.add_argument("port", help="serial port, or sim to start the simulator on a pty and use that")
+    parser.add_argument("--period", type=int, default=100, help="telemetry period for watch, ms")
+    parser.add_argument("command", help="ping, state NAME, aim THETA PHI, fire, board CELLS PLAYER, watch, "
+                                        "config [NAME VALUE], profile, demo")
+    parser.add_argument("args", nargs="*")
+    args = parser.parse_args()
+
+    bridge = None
+    port = args.port
+    if port == "sim":
+        bridge, port = start_bridge()
+
+    client = RemoteClient(port)
+    try:
+        if args.command == "ping":
+            print("{:.1f} ms".format(client.ping() * 1000))
+        elif args.command == "state":
+            client.state(args.args[0])
+        elif args.command == "aim":
+            client.aim(int(args.args[0]), int(args.args[1]))
+        elif args.command == "fire":
+            client.fire()
+        elif args.command == "board":
+            client.set_board([int(c) for c in args.args[0]], int(args.args[1]))
+        elif args.command == "config":
+            values = client.config(*args.args[:1], *(int(v) for v in args.args[1:2]))
+            for name in config.NAMES:
+                print("{:18} {}".format(name, values[name]))
+        elif args.command == "profile":
+            client.profile(args.args[0] if args.args else "p")
+            time.sleep(0.5)
+            client.pump()
+            print("\n".join(client.lines()))
+        elif args.command == "watch":
+            client.telemetry(args.period)
+            try:
+                while True:
+                    frame = client.read_telemetry()
+                    if frame is not None:
+                        print(frame)
+                    for line in client.lines():
+                        print(">", line)
+            except KeyboardInterrupt:
+                client.telemetry(0)
+        elif args.command == "demo":
+            demo(client)
+        else:
+            parser.error("unknown command " + args.command)
+    finally:
+        client.close()
+        if bridge is not None:
+            bridge.terminate()
+            bridge.wait()
+
+
+if __name__ == "__main__":
+    main()
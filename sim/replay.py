@@ -0,0 +1,162 @@
+"""
+Replays an input trace recorded by input_trace.TraceRecorder into MainProgram under the simulator:
+
+    python sim/replay.py trace.bin [--repeat 3]
+    python sim/replay.py --record demo.bin     # record a short scripted game in the simulator first
+
+Every recorded pass is one call to update with the recorded tick, the recorded button and beam states stand in
+for the GPIO reads. Nothing sleeps: the virtual clock is set to each pass's tick, so replays run as fast as the
+host can call update. The state machine's state (mode, board, player, timers, stepper goals) is hashed after
+every pass. Replays of one trace always give the same digest, --repeat checks that and exits 1 if they differ.
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import simulator
+
+
+class TraceInput:
+    # MainProgram.input_source that plays back the current pass's input word
+
+    def __init__(self):
+        import input_trace
+        self.unpack = input_trace.unpack_inputs
+        self.word = input_trace.INPUTS_IDLE
+
+    def update(self, ticks_elapsed, btn_states, beam_states):
+        self.unpack(self.word, btn_states, beam_states)
+
+
+def state_of(program):
+    steppers = program.steppers
+    return (program.game_state, program.last_game_state, program.current_player, tuple(program.cur_board),
+            program.action_timer, program.auto_cell, program.shot_beams, steppers.theta_goal, steppers.phi_goal,
+            steppers.theta_pos, steppers.phi_pos)
+
+
+def replay(data, digest=True):
+    """
+    Replay a trace into a fresh MainProgram on a fresh board.
+
+    :param data: trace file contents
+    :param digest: hash the program state after every pass
+    :return: (passes, last tick, digest hex or None, host seconds)
+    """
+    import input_trace
+
+    clock = simulator.install()
+    clock.now_us = 0
+    random.seed(0)  # the attract mode colours
+    board = simulator.Board(matrix_model=False)
+    program = board.load_program()
+    source = TraceInput()
+    program.input_source = source
+
+    h = hashlib.sha1() if digest else None
+    passes = 0
+    ticks = 0
+    start = time.perf_counter()
+    for ticks, word in input_trace.read_trace(data):
+        source.word = word
+        clock.set_us(ticks * 1000)  # fires the timers due on the way
+        program.update(ticks)
+        if h is not None:
+            h.update(repr(state_of(program)).encode())
+        passes += 1
+    elapsed = time.perf_counter() - start
+
+    return passes, ticks, h.hexdigest() if h is not None else None, elapsed
+
+
+# ----------------------------------------- DEMO RECORDING ----------------------------------------- #
+
+def record_demo(path):
+    # menu -> manual mode, two shots (one lands in the centre, one misses), a reset hold
+    import input_trace
+    import main
+
+    path = os.path.abspath(path)
+    simulator.install()
+    board = simulator.Board(matrix_model=False)
+    program = board.load_program()
+    program.recorder = input_trace.TraceRecorder(path)
+    runner = simulator.Runner(program)
+
+    def press(button, ms=60):
+        board.press(button)
+        runner.run_ms(ms)
+        board.release(button)
+        runner.run_ms(ms)
+
+    runner.run_ms(500)
+    press(4)
+    press(7)
+    runner.run_until(lambda: program.game_state == main.MANUAL_MODE, 10000)
+    press(1, 300)
+    press(4)
+    runner.run_until(lambda: program.game_state == main.WAIT_SCORE, 2000)
+    board.break_beam(1)
+    board.break_beam(4)
+    runner.run_ms(20)
+    board.restore_all()
+    runner.run_until(lambda: program.game_state == main.MANUAL_MODE, 10000)
+    press(5, 200)
+    press(4)
+    runner.run_until(lambda: program.game_state == main.MANUAL_MODE, 10000)
+    press(0, 400)
+    runner.run_ms(500)
+    program.recorder.close()
+    return runner.loops, program.recorder.bytes_written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded input trace")
+    parser.add_argument("trace", nargs="?", help="trace file to replay")
+    parser.add_argument("--repeat", type=int, default=2, help="replays to run, their digests must match")
+    parser.add_argument("--record", metavar="PATH", help="record a scripted demo game to PATH and replay it")
+    args = parser.parse_args()
+
+    if not args.trace and not args.record:
+        parser.error("give a trace to replay or --record PATH")
+
+    # keep the startup banners and anything the firmware writes to flash out of the way
+    path = os.path.abspath(args.record or args.trace)
+    os.chdir(tempfile.mkdtemp(prefix="launcher-replay-"))
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+
+    simulator.install()
+    import log
+    log.set_level(log.ERROR)
+
+    if args.record:
+        loops, size = record_demo(path)
+        print("recorded {} passes into {} bytes".format(loops, size), file=stdout)
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    digests = set()
+    for i in range(args.repeat):
+        os.chdir(tempfile.mkdtemp(prefix="launcher-replay-"))  # fresh aim.bin for every replay
+        passes, ticks, digest, elapsed = replay(data)
+        digests.add(digest)
+        print("replay {}: {} passes ({:.1f} s of play) in {:.3f} s, {:,.0f} passes/s, digest {}".format(
+            i + 1, passes, ticks / 1000, elapsed, passes / elapsed, digest), file=stdout)
+
+    sys.stdout = stdout
+    if len(digests) > 1:
+        print("replays diverged")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
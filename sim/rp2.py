@@ -0,0 +1,65 @@
+"""
+Simulator stand-in for the MicroPython `rp2` module.
+
+PIO programs are not assembled or run, a StateMachine just counts the words pushed into it and keeps the last
+1024 of them, as they sit in the FIFO (after put's shift), so LED output can be inspected.
+"""
+
+
+class PIO:
+    OUT_LOW = 0
+    OUT_HIGH = 1
+    IN_LOW = 0
+    IN_HIGH = 1
+    SHIFT_LEFT = 0
+    SHIFT_RIGHT = 1
+    JOIN_NONE = 0
+    JOIN_TX = 1
+    JOIN_RX = 2
+
+
+def asm_pio(**kwargs):
+    def decorator(func):
+        return func
+    return decorator
+
+
+class StateMachine:
+    machines = {}  # id -> last StateMachine created with that id
+
+    def __init__(self, id, program=None, freq=-1, **kwargs):
+        self.id = id
+        self.program = program
+        self.freq = freq
+        self.running = False
+        self.words = 0
+        self.frame = []
+        StateMachine.machines[id] = self
+
+    def init(self, program=None, freq=-1, **kwargs):
+        self.program = program
+        self.freq = freq
+
+    def active(self, value=None):
+        if value is None:
+            return self.running
+        self.running = bool(value)
+
+    def put(self, value, shift=0):
+        if isinstance(value, int):
+            self.words += 1
+            self.frame.append((value << shift) & 0xFFFFFFFF)
+        else:
+            self.words += len(value)
+            self.frame.extend((v << shift) & 0xFFFFFFFF for v in value)
+        if len(self.frame) > 1024:
+            del self.frame[:-1024]
+
+    def tx_fifo(self):
+        return 0
+
+    def stats(self):
+        return {"words": self.words}
+
+    def reset_stats(self):
+        self.words = 0
@@ -0,0 +1,72 @@
+"""
+Serves the simulated board on a pseudo-terminal, standing in for the Pico's USB serial port:
+
+    python sim/serial_bridge.py
+    serial port /dev/pts/5
+
+The firmware runs on the host clock. Its remote (remote.py) reads and writes the pty master and its printed
+output goes there too, so anything that talks to the real board over serial - sim/remote_client.py, a terminal
+program sending 'p' - works against the path printed at startup.
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import tty
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import simulator
+
+
+def open_pty():
+    """
+    :return: (master fd, slave fd, slave path). the slave is in raw mode and stays open, so the master
+    doesn't see a hang-up while no client has the port open
+    """
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    return master, slave, os.ttyname(slave)
+
+
+def serve(seconds=None):
+    clock = simulator.install()
+    clock.realtime = True
+    os.chdir(tempfile.mkdtemp(prefix="launcher-serial-"))
+
+    master, slave, path = open_pty()
+    print("serial port", path)
+    sys.stdout.flush()
+
+    # from here on the firmware's prints go to the port, as on the board
+    sys.stdout = io.TextIOWrapper(os.fdopen(os.dup(master), "wb", buffering=0), write_through=True)
+
+    import remote
+    board = simulator.Board(matrix_model=False)
+    program = board.load_program()
+    program.remote = remote.Remote(program.remote_command, program.console_command,
+                                   os.fdopen(master, "rb", buffering=0),
+                                   os.fdopen(os.dup(master), "wb", buffering=0))
+
+    runner = simulator.Runner(program)
+    end = None if seconds is None else seconds * 1000
+    try:
+        while end is None or runner.total_ticks < end:
+            runner.step()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        os.close(slave)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated board on a pseudo-terminal")
+    parser.add_argument("--seconds", type=float, help="stop after this long, default run until interrupted")
+    args = parser.parse_args()
+    serve(args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+"""
+Host simulator for the launcher firmware.
+
+    import sys; sys.path.insert(0, "sim")
+    import simulator
+    simulator.install()
+    board = simulator.Board()
+    runner = simulator.Runner(board.load_program())
+    board.press(4)
+    runner.run_ms(100)
+
+install() puts the stand-in MicroPython modules in sim/ and the firmware in the repo root on sys.path, and
+adds the tick functions to `time` (see clock.py) and mem_free to `gc`. Board wires the peripheral models onto the simulated buses
+and drives the button and beam inputs. Runner steps MainProgram the same way the loop at the bottom of main.py
+does. headless() strips a program down to its game logic for long runs nobody watches, like tournaments.
+"""
+
+import os
+import sys
+
+SIM_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(SIM_DIR)
+
+BUTTON_PINS = (6, 7, 8, 9, 10, 11, 12, 13, 14)
+BEAM_PINS = (20, 21, 22, 26, 27, 28)
+MATRIX_CS_PIN = 17
+MCP_ADDRESS = 0x20
+
+_installed = False
+
+
+def install():
+    global _installed
+    if not _installed:
+        sys.path.insert(0, REPO_DIR)
+        sys.path.insert(0, SIM_DIR)
+        _installed = True
+
+    # MicroPython's heap figure, the host never runs short
+    import gc
+    if not hasattr(gc, "mem_free"):
+        gc.mem_free = lambda: 1 << 20
+
+    import clock
+    return clock.install()
+
+
+class Board:
+
+    def __init__(self, matrix_modules=8, matrix_model=True, matrix_chains=None, bus_time=False):
+        """
+        :param matrix_modules: length of the MAX7219 chain
+        :param matrix_model: decode the SPI stream into the MAX7219 model, off saves time in long runs
+        :param matrix_chains: (SPI bus, CS pin, modules) for each chain, as led_matrix.CHAINS, instead of the one
+        chain of matrix_modules
+        :param bus_time: SPI and I2C transfers take their time on the bus off the virtual clock, so passes cost
+        something (PIO sends and the code itself still cost nothing)
+        """
+        import machine
+        import rp2
+        from clock import clock
+        from devices import MCP23017Model, MAX7219Model
+
+        clock.alarms = []  # timers of the last board
+        machine._Bus.timed = bus_time
+        machine.Pin.reset_all()
+        machine.I2C.buses = {}
+        machine.SPI.buses = {}
+        rp2.StateMachine.machines = {}
+
+        self.mcp = MCP23017Model()
+        machine.I2C.devices = {0: {MCP_ADDRESS: self.mcp}}
+        self.solenoid_edges = []  # (us, level) of every change of the solenoid output
+        self.mcp.on_latch = self._mcp_latch
+
+        # one model per chain, SPI bytes go to the chains whose CS is low
+        if matrix_chains is None:
+            matrix_chains = ((0, MATRIX_CS_PIN, matrix_modules),)
+        self.chain_specs = matrix_chains
+        self.chains = [MAX7219Model(modules) for _, _, modules in matrix_chains]
+        self.matrix = self.chains[0]
+        self.chain_selected = [False] * len(self.chains)
+        self.chain_bytes = [0] * len(self.chains)
+        self.bus_chains = {}  # SPI bus -> indices of the chains on it
+        machine.SPI.listeners = {}
+        if matrix_model:
+            for i, (bus, cs, _) in enumerate(matrix_chains):
+                self.bus_chains[bus] = self.bus_chains.get(bus, ()) + (i,)
+                machine.SPI.listeners[bus] = self._matrix_spi
+                machine.Pin.watch(cs, lambda level, i=i: self._matrix_cs(i, level))
+
+    def _mcp_latch(self, port, old, new):
+        if port == 0 and (old ^ new) & 1:
+            import time
+            self.solenoid_edges.append((time.ticks_us(), new & 1))
+
+    def solenoid_pulses(self):
+        # widths in us of the solenoid pulses that have ended
+        pulses = []
+        on = None
+        for us, level in self.solenoid_edges:
+            if level:
+                on = us
+            elif on is not None:
+                pulses.append(us - on)
+                on = None
+        return pulses
+
+    def _matrix_cs(self, chain, level):
+        self.chain_selected[chain] = not level
+        if level:
+            self.chains[chain].latch()
+        else:
+            self.chains[chain].select()
+
+    def _matrix_spi(self, data, bus):
+        for i in self.bus_chains[bus]:
+            if self.chain_selected[i]:
+                self.chains[i].receive(data)
+                self.chain_bytes[i] += len(data)
+
+    def chain_stats(self):
+        # per matrix chain: SPI bytes, frames latched and time on the bus at the bus's baudrate
+        import machine
+        stats = []
+        for i, (bus, _, _) in enumerate(self.chain_specs):
+            baudrate = machine.SPI.buses[bus].baudrate if bus in machine.SPI.buses else 1000000
+            stats.append({"bytes": self.chain_bytes[i], "latches": self.chains[i].frames,
+                          "bus_us": self.chain_bytes[i] * 8e6 / baudrate})
+        return stats
+
+    def reset_chain_stats(self):
+        for i in range(len(self.chains)):
+            self.chain_bytes[i] = 0
+            self.chains[i].frames = 0
+
+    def load_program(self, assets=True):
+        """
+        :param assets: put the repo's assets.bin on the flash (the working directory) first, as it is deployed
+        next to main.py. off, or with no pack built, every message is rendered at runtime
+        """
+        import shutil
+        import main
+        source = os.path.join(REPO_DIR, "assets.bin")
+        if assets and os.path.exists(source) and not os.path.exists("assets.bin"):
+            shutil.copyfile(source, "assets.bin")
+        elif not assets and os.path.exists("assets.bin") and os.path.abspath(".") != REPO_DIR:
+            os.remove("assets.bin")
+        return main.MainProgram()
+
+    # ----------------------------------------- INPUTS ----------------------------------------- #
+
+    def press(self, button):
+        import machine
+        machine.Pin.drive(BUTTON_PINS[button], 0)
+
+    def release(self, button):
+        import machine
+        machine.Pin.drive(BUTTON_PINS[button], 1)
+
+    def release_all(self):
+        for button in range(len(BUTTON_PINS)):
+            self.release(button)
+
+    def break_beam(self, beam):
+        import machine
+        machine.Pin.drive(BEAM_PINS[beam], 0)
+
+    def restore_beam(self, beam):
+        import machine
+        machine.Pin.drive(BEAM_PINS[beam], 1)
+
+    def restore_all(self):
+        for beam in range(len(BEAM_PINS)):
+            self.restore_beam(beam)
+
+    def solenoid(self):
+        return self.mcp.output(0)
+
+    # ----------------------------------------- BUS STATS ----------------------------------------- #
+
+    def buses(self):
+        import machine
+        import rp2
+        buses = {}
+        for id, bus in machine.I2C.buses.items():
+            buses["i2c{}".format(id)] = bus
+        for id, bus in machine.SPI.buses.items():
+            buses["spi{}".format(id)] = bus
+        for id, sm in rp2.StateMachine.machines.items():
+            buses["sm{}".format(id)] = sm
+        return buses
+
+    def bus_stats(self):
+        return {name: bus.stats() for name, bus in self.buses().items()}
+
+    def reset_bus_stats(self):
+        for bus in self.buses().values():
+            bus.reset_stats()
+        self.reset_chain_stats()
+
+
+class Runner:
+
+    def __init__(self, program):
+        import time
+        self.program = program
+        self.time = time
+        self.total_ticks = 0
+        self.loops = 0
+
+    def step(self):
+        # one pass of the loop at the bottom of main.py
+        time = self.time
+        tick_ref = time.ticks_ms()
+        self.program.update(self.total_ticks)
+        time.sleep_ms(1)
+        self.total_ticks += time.ticks_diff(time.ticks_ms(), tick_ref)
+        self.loops += 1
+
+    def run_ms(self, ms):
+        end = self.total_ticks + ms
+        while self.total_ticks < end:
+            self.step()
+
+    def run_until(self, condition, max_ms=60000):
+        end = self.total_ticks + max_ms
+        while not condition() and self.total_ticks < end:
+            self.step()
+        return condition()
+
+    # ----------------------------------------- FAST FORWARD ----------------------------------------- #
+
+    def next_deadline(self, limit):
+        # earliest tick at which the program could do anything new without new input
+        program = self.program
+        now = self.total_ticks
+        deadline = limit
+
+        # some states check the timer with >=, some with >
+        if now < program.action_timer:
+            deadline = min(deadline, program.action_timer)
+        elif now == program.action_timer:
+            deadline = min(deadline, now + 1)
+
+        for change_time in program.btn_change_time:
+            if change_time >= 0:
+                deadline = min(deadline, change_time + program.btn_debounce_delay + 1)
+
+        # a press or a break the program hasn't read yet
+        source = program.input_source
+        if getattr(source, "changed", False):
+            deadline = min(deadline, now + 1)
+        elif source is None:
+            for i in range(len(program.btn_pins)):
+                if program.btn_change_time[i] < 0 and program.btn_pins[i].value() != program.btn_states[i]:
+                    deadline = min(deadline, now + 1)
+            for i in range(len(program.beam_pins)):
+                if program.beam_pins[i].value() == 0 and program.beam_states[i] != 0:
+                    deadline = min(deadline, now + 1)
+
+        if 0 in program.beam_states:
+            deadline = min(deadline, program.beam_reset_time + program.beam_hold + 1)
+
+        # the computer plans its shot on the next tick and fires as soon as its aim is reached. in auto mode a full
+        # board leaves it nothing to plan, rapid fire clears it.
+        import main
+        if program.game_state == main.AUTO_MODE and not program.current_player:
+            if program.auto_cell >= 0:
+                acts = program.steppers.at_goal()
+            else:
+                acts = 0 in program.cur_board and not program.check_winner()
+        elif program.game_state == main.RAPID_MODE:
+            acts = program.rapid_cell < 0 or program.cur_board != program.rapid_guess or program.steppers.at_goal()
+        else:
+            acts = False
+        if acts:
+            deadline = min(deadline, now + 1)
+
+        return max(deadline, now)
+
+    def fast_forward(self, until, condition=None):
+        """
+        Advance to tick `until`, only calling update at the ticks where a timer can expire, an input changes or the
+        computer player acts. Stepper moves are made in one go, up to the next of those ticks, with the virtual
+        clock charged for the travel time.
+
+        :param condition: optional callable, stop as soon as it returns True
+        :return: True if stopped by the condition
+        """
+        steppers = self.program.steppers
+        clock = self.time
+        while self.total_ticks < until:
+            if condition is not None and condition():
+                return True
+            if not steppers.at_goal():
+                # up to the next deadline, a move made while the program waits on something else (the next shot
+                # aimed while the last is scored) doesn't hold that up
+                steps = max(abs(steppers.theta_goal - steppers.theta_pos), abs(steppers.phi_goal - steppers.phi_pos))
+                steps = min(steps, (self.next_deadline(until) - self.total_ticks) // steppers.feed_rate)
+                steppers.theta_pos = _toward(steppers.theta_pos, steppers.theta_goal, steps)
+                steppers.phi_pos = _toward(steppers.phi_pos, steppers.phi_goal, steps)
+                clock.sleep_ms(steps * steppers.feed_rate)
+                self.total_ticks += steps * steppers.feed_rate
+
+            target = self.next_deadline(until)
+            if target > self.total_ticks:
+                clock.sleep_ms(target - self.total_ticks)
+                self.total_ticks = target
+            self.step()
+
+        return condition is not None and condition()
+
+
+# ----------------------------------------- HEADLESS ----------------------------------------- #
+
+class HeadlessInputs:
+    """
+    MainProgram.input_source for headless runs. The buttons and beams are still pins driven through the Board, and
+    read by the program's own update_btn_gpio and update_beam_gpio, but only on the passes where a read can change
+    something: the first after a press, release, break or restore made through here, the one a debounce ends on
+    and the one a latched beam is let go on. While the pins stay as they are, the reads in between leave every
+    state as it was, so skipping them leaves the game as it would run.
+    """
+
+    def __init__(self, board, program):
+        self.board = board
+        self.program = program
+        self.changed = False  # a pin was driven since the last read
+        self.due = -1  # tick the next debounce or beam latch ends, -1 if none is running
+
+    def update(self, ticks_elapsed, btn_states, beam_states):
+        if not self.changed and (self.due < 0 or ticks_elapsed < self.due):
+            return
+        self.changed = False
+        program = self.program
+        program.update_btn_gpio(ticks_elapsed)
+        program.update_beam_gpio(ticks_elapsed)
+
+        # the same ends next_deadline wakes the program for
+        due = -1
+        for change_time in program.btn_change_time:
+            if change_time >= 0 and (due < 0 or change_time + program.btn_debounce_delay + 1 < due):
+                due = change_time + program.btn_debounce_delay + 1
+        if 0 in beam_states and (due < 0 or program.beam_reset_time + program.beam_hold + 1 < due):
+            due = program.beam_reset_time + program.beam_hold + 1
+        self.due = due
+
+    def press(self, button):
+        self.board.press(button)
+        self.changed = True
+
+    def release(self, button):
+        self.board.release(button)
+        self.changed = True
+
+    def break_beam(self, beam):
+        self.board.break_beam(beam)
+        self.changed = True
+
+    def restore_all(self):
+        self.board.restore_all()
+        self.changed = True
+
+
+def _nothing(*args, **kwargs):
+    return None
+
+
+class _Silent:
+    # stands in for an output-only part of the program, every method does nothing and returns None
+
+    def __getattr__(self, name):
+        return _nothing
+
+
+def headless(board, program):
+    """
+    Strip a program down to its game logic: the LED matrix, the LED strips' sends, the profiler and the remote do
+    nothing, and the input pins are only read when that can change an input's state, see HeadlessInputs. For long runs
+    where only the game's outcome is looked at, a tournament's thousands of games.
+
+    :return: the HeadlessInputs to press buttons and break beams through
+    """
+    program.led_matrix = _Silent()
+    program.show_leds = _nothing
+    program.profiler = _Silent()
+    program.remote = None
+    inputs = HeadlessInputs(board, program)
+    program.input_source = inputs
+    return inputs
+
+
+def _toward(pos, goal, steps):
+    if pos < goal:
+        return min(pos + steps, goal)
+    return max(pos - steps, goal)
@@ -0,0 +1,223 @@
+"""
+Headless tournament. Plays full games of the real MainProgram under the simulator with scripted players:
+
+    python sim/tournament.py --games 10000 --mode auto --p1 random --hit-rate 0.7
+
+Each game starts straight in the play mode (the menus are skipped). Scripted players press the fire button
+and the simulated ball breaks the beams of the cell it lands in: the intended cell with probability
+--hit-rate, nothing with probability --miss-rate, otherwise a neighbouring cell, --flight-ms after the
+solenoid pulse ends. In auto mode player 2 is the firmware's own AI, which aims and fires by itself, in rapid
+mode it plays both sides and a full board with no winner ends the game as a draw (--serial turns off aiming
+the next shot while the last is in the air, and ending the score wait on a hit).
+
+The program runs on the virtual clock and is fast-forwarded from one timer deadline to the next, so launch
+durations and score timeouts cost a single update each. It also runs headless (simulator.headless): no matrix,
+LED strip, profiler or remote work, and the input pins are only read while an input changes. --full runs all of
+that too, as on the Pico; the results are the same, only slower. Games are spread over a process pool. Reports
+win rates, shot hit rates, update calls per game, host time per update and shots per minute of virtual time.
+
+One core plays about 450 auto mode games/s headless, 170 with --full. That is short of thousands: every game
+still runs about 68 passes of the real MainProgram.update, which are most of the cost, so more than that takes
+more --workers.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import simulator
+
+HOLD_MS = 30  # how long scripted buttons are held and beams stay broken
+MAX_SHOTS = 60  # a game with no winner by then counts as a draw
+
+NEIGHBOURS = [[n for n in range(9) if n != c and abs(n // 3 - c // 3) <= 1 and abs(n % 3 - c % 3) <= 1]
+              for c in range(9)]
+
+
+def cell_beams(cell):
+    # column beam, row beam - the inverse of MainProgram.check_score
+    return 2 - cell % 3, 5 - cell // 3
+
+
+def land(rng, intended, hit_rate, miss_rate):
+    roll = rng.random()
+    if roll < hit_rate:
+        return intended
+    if roll < hit_rate + miss_rate:
+        return -1
+    return rng.choice(NEIGHBOURS[intended])
+
+
+def pick_cell(rng, strategy, board, player):
+    import ai
+    if strategy == "ai":
+        cell = ai.best_move(board, player)
+        if cell >= 0:
+            return cell
+    empty = [i for i in range(9) if board[i] == 0]
+    return rng.choice(empty) if empty else rng.randrange(9)
+
+
+def play_games(job):
+    seed, games, options = job
+    simulator.install()
+    os.chdir(tempfile.mkdtemp(prefix="launcher-tournament-"))
+
+    import log
+    import main
+    log.set_level(log.ERROR)
+
+    rng = random.Random(seed)
+    board = simulator.Board(matrix_model=False)
+    program = board.load_program()
+    inputs = board if options.get("full") else simulator.headless(board, program)
+    runner = simulator.Runner(program)
+    mode = {"auto": main.AUTO_MODE, "rapid": main.RAPID_MODE, "manual": main.MANUAL_MODE}[options["mode"]]
+    program.rapid_pipeline = not options.get("serial", False)
+    strategies = {1: options["p1"], 2: options["p2"]}
+
+    def advance_until(condition, max_ms=20000):
+        return runner.fast_forward(runner.total_ticks + max_ms, condition)
+
+    stats = {"games": 0, "p1_wins": 0, "p2_wins": 0, "draws": 0, "shots": 0, "hits": 0,
+             "p1_shots": 0, "p1_hits": 0, "p2_shots": 0, "p2_hits": 0, "stalls": 0, "updates": 0, "host_s": 0.0,
+             "play_ms": 0}
+
+    start = time.perf_counter()
+    loops_start = runner.loops
+    for _ in range(games):
+        program.reset_game()
+        program.game_state = mode
+        program.current_player = True
+        shots = 0
+        game_start = runner.total_ticks
+        draws = program.rapid_draws
+
+        while program.game_state != main.GAME_OVER and shots < MAX_SHOTS:
+            player = 1 if program.current_player else 2
+
+            if mode == main.RAPID_MODE or mode == main.AUTO_MODE and player == 2:
+                launched = advance_until(lambda: program.game_state == main.LAUNCH)
+                intended = program.shot_cell
+            else:
+                intended = pick_cell(rng, strategies[player], program.cur_board, player)
+                inputs.press(4)
+                launched = advance_until(lambda: program.game_state == main.LAUNCH)
+                inputs.release(4)
+            if not launched:
+                stats["stalls"] += 1
+                break  # the firmware didn't shoot, there's no shot to count and the game can't go on
+
+            advance_until(lambda: program.game_state == main.WAIT_SCORE)
+            if options["flight_ms"]:
+                runner.fast_forward(runner.total_ticks + options["flight_ms"])
+
+            landed = land(rng, intended, options["hit_rate"], options["miss_rate"])
+            if landed >= 0:
+                for beam in cell_beams(landed):
+                    inputs.break_beam(beam)
+                runner.fast_forward(runner.total_ticks + HOLD_MS)
+                inputs.restore_all()
+
+            advance_until(lambda: program.game_state != main.WAIT_SCORE)
+
+            shots += 1
+            stats["shots"] += 1
+            stats["p{}_shots".format(player)] += 1
+            if landed == intended:
+                stats["hits"] += 1
+                stats["p{}_hits".format(player)] += 1
+
+            if program.rapid_draws != draws or 0 not in program.cur_board:
+                break  # a full board ends the game, rapid fire clears it (or already has) to play on
+
+        stats["play_ms"] += runner.total_ticks - game_start
+        stats["games"] += 1
+        if program.game_state == main.GAME_OVER and program.check_winner():
+            stats["p1_wins" if program.current_player else "p2_wins"] += 1
+        else:
+            stats["draws"] += 1
+
+    stats["updates"] = runner.loops - loops_start
+    stats["host_s"] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless launcher tournament")
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--mode", choices=("manual", "auto", "rapid"), default="auto")
+    parser.add_argument("--p1", choices=("random", "ai"), default="random", help="player 1 strategy")
+    parser.add_argument("--p2", choices=("random", "ai"), default="random",
+                        help="player 2 strategy in manual mode, in auto and rapid mode it is the firmware AI")
+    parser.add_argument("--hit-rate", type=float, default=0.7)
+    parser.add_argument("--miss-rate", type=float, default=0.1)
+    parser.add_argument("--flight-ms", type=int, default=0, help="from the end of the pulse to the landing")
+    parser.add_argument("--serial", action="store_true", help="rapid mode without the pipelining")
+    parser.add_argument("--full", action="store_true", help="run the outputs and poll the pins every pass")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    options = {"mode": args.mode, "p1": args.p1, "p2": args.p2,
+               "hit_rate": args.hit_rate, "miss_rate": args.miss_rate, "flight_ms": args.flight_ms,
+               "serial": args.serial, "full": args.full}
+
+    chunks = max(1, args.workers * 4)
+    per_chunk = -(-args.games // chunks)
+    jobs = []
+    remaining = args.games
+    for i in range(chunks):
+        n = min(per_chunk, remaining)
+        if n <= 0:
+            break
+        jobs.append((args.seed * 1000003 + i, n, options))
+        remaining -= n
+
+    # keep the startup banner of every worker's MainProgram off the report
+    devnull = open(os.devnull, "w")
+    stdout = sys.stdout
+    sys.stdout = devnull
+
+    start = time.perf_counter()
+    if args.workers > 1:
+        with multiprocessing.Pool(args.workers, initializer=_quiet) as pool:
+            results = pool.map(play_games, jobs)
+    else:
+        results = [play_games(job) for job in jobs]
+    elapsed = time.perf_counter() - start
+
+    sys.stdout = stdout
+    total = {}
+    for result in results:
+        for key, value in result.items():
+            total[key] = total.get(key, 0) + value
+
+    games = total["games"]
+    print("{} games ({} mode, p1 {}, p2 {}) on {} workers in {:.2f} s: {:,.0f} games/s".format(
+        games, args.mode, "firmware ai" if args.mode == "rapid" else args.p1,
+        args.p2 if args.mode == "manual" else "firmware ai", args.workers, elapsed, games / elapsed))
+    print("p1 wins {:.1%}, p2 wins {:.1%}, draws {:.1%}".format(
+        total["p1_wins"] / games, total["p2_wins"] / games, total["draws"] / games))
+    for who in ("p1", "p2"):
+        shots = total[who + "_shots"]
+        print("{} hit rate {:.1%} over {} shots".format(who, total[who + "_hits"] / shots if shots else 0, shots))
+    if total["stalls"]:
+        print("{} games ended waiting for a launch that never came, counted as draws".format(total["stalls"]))
+    print("{:.1f} shots/game, {:.1f} updates/game, {:.1f} us host time per update".format(
+        total["shots"] / games, total["updates"] / games, total["host_s"] / total["updates"] * 1e6))
+    print("{:.1f} shots/min of play".format(total["shots"] / (total["play_ms"] / 60000.0)))
+
+
+def _quiet():
+    sys.stdout = open(os.devnull, "w")
+
+
+if __name__ == "__main__":
+    main()
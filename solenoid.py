@@ -0,0 +1,76 @@
+"""
+Solenoid pulse timed by a hardware timer.
+
+The launch used to switch the solenoid on when entering LAUNCH and off on the first loop pass after
+launch_duration, so a shot's power depended on how late that pass ran and on the I2C traffic ahead of it. fire()
+switches it on, arms a one-shot machine.Timer for the duration in microseconds and returns, the timer's
+callback switches it off. Both edges are sent to the expander straight away rather than with the arbiter's
+flush, and ticks_us is taken as each write returns, so width_us is the pulse the expander put out, to within
+one I2C write.
+
+The callback is a soft one (scheduled, the rp2 default): I2C can't be used from a hard interrupt, which could
+also land inside a transfer of the main loop's. It runs at the next bytecode boundary after the alarm, so the
+off edge can be held back by the longest single native call in the loop (an SPI row, an LED strip send, about
+a hundred us) but no longer by a whole loop pass.
+
+    solenoid = Solenoid(bus.pin(mcp, 0, PRIO_SOLENOID))
+    solenoid.fire(500000)
+    ...
+    if not solenoid.active:
+        print(solenoid.width_us)
+"""
+
+import time
+from machine import Timer
+
+
+class Solenoid:
+
+    def __init__(self, pin, timer=None):
+        """
+        :param pin: bus_arbiter.LatchPin driving the solenoid
+        :param timer: machine.Timer to time the pulse with, a virtual one by default
+        """
+        self.pin = pin
+        self.timer = Timer() if timer is None else timer
+        self._timeout_cb = self._timeout  # bound once, arming the timer doesn't allocate it
+
+        self.active = False
+        self.duration_us = 0  # asked for by the last fire
+        self.width_us = 0  # measured, of the last pulse that ended
+        self.on_us = 0
+        self.pulses = 0
+
+        pin.send(0)
+
+    def fire(self, duration_us):
+        """
+        Start a pulse and return, the timer ends it.
+
+        :param duration_us: pulse width
+        :return: False if a pulse is still running
+        """
+        if self.active:
+            return False
+        self.duration_us = duration_us
+        self.active = True
+        self.pin.send(1)
+        self.on_us = time.ticks_us()
+        self.timer.init(mode=Timer.ONE_SHOT, tick_hz=1000000, period=duration_us, callback=self._timeout_cb)
+        return True
+
+    def _timeout(self, timer):
+        self.off()
+
+    def off(self):
+        # end the pulse now. the timer's callback, or early, e.g. on a reset mid launch
+        self.timer.deinit()
+        self.pin.send(0)
+        if self.active:
+            self.width_us = time.ticks_diff(time.ticks_us(), self.on_us)
+            self.active = False
+            self.pulses = (self.pulses + 1) & 0x3FFFFFFF
+
+    def error_us(self):
+        # measured minus asked for, of the last pulse
+        return self.width_us - self.duration_us
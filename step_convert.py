@@ -0,0 +1,32 @@
+"""
+Angle to stepper step conversion.
+
+A 1.8 degree motor at `microstep` microsteps moves deg * microstep / 1.8 microsteps, and the step pin is toggled
+twice per microstep. Whole degrees (what the aim buttons produce) are converted with a precomputed Q16 scale
+factor, a multiply and a shift, no floats. Fractional degrees (e.g. from the ballistic model) use a precomputed
+float scale, which gives exactly the result of the original `round(deg * (1/(1.8 / microstep)))*2`.
+
+The Q16 result matches the float one for every whole degree in -180..180: deg * microstep / 1.8 is always at
+least 1/18 away from a .5 tie, far more than the scale factor's rounding error over that range.
+"""
+
+MICROSTEPS = (1, 2, 4, 8, 16, 32)
+
+_SHIFT = 16
+_HALF = 1 << (_SHIFT - 1)
+
+_SCALE = {}
+_SCALE_F = {}
+for _m in MICROSTEPS:
+    _SCALE[_m] = round((1 << _SHIFT) * _m / 1.8)
+    _SCALE_F[_m] = 1/(1.8 / _m)
+
+
+def deg_to_steps(deg, microstep=8):
+    if type(deg) is int:
+        return ((deg * _SCALE[microstep] + _HALF) >> _SHIFT) << 1
+    return round(deg * _SCALE_F[microstep]) << 1
+
+
+def steps_to_deg(steps, microstep=8):
+    return steps * 1.8 / (microstep * 2)
@@ -1,9 +1,20 @@
 from machine import Pin
 
+import log
+from bus_arbiter import PRIO_STEP
+from step_convert import deg_to_steps
+
+THETA_MAX = 180  # deg
+PHI_MAX = 180  # deg, either way
+
 
 class StepperController:
 
-    def __init__(self, mcp):
+    def __init__(self, mcp, bus):
+        """
+        :param mcp: expander with the phi driver and limit switch
+        :param bus: bus_arbiter.BusArbiter the phi pins are written through, flushed by the caller every tick
+        """
         self.mcp = mcp
 
         self.theta_a_step = Pin(4, Pin.OUT)
@@ -14,11 +25,10 @@ class StepperController:
         self.theta_pos = 0
         self.theta_goal = 0
 
-        mcp.pin(1, mode=0, value=0)
-        mcp.pin(2, mode=0, value=0)
-
-        self.phi_step = mcp[1]
-        self.phi_dir = mcp[2]
+        self.phi_step = bus.pin(mcp, 1, PRIO_STEP)
+        self.phi_dir = bus.pin(mcp, 2, PRIO_STEP, setup=True)  # sent ahead of a step it changes with
+        self.phi_step(0)
+        self.phi_dir(0)
 
         self.phi_pos = 0
         self.phi_goal = 0
@@ -33,6 +43,9 @@ class StepperController:
         self.feed_ticks = 0
         self.feed_rate = 10
 
+        self.theta_max_steps = deg_to_steps(THETA_MAX)
+        self.phi_max_steps = deg_to_steps(PHI_MAX)
+
         self.do_home = False
 
     """
@@ -52,22 +65,32 @@ class StepperController:
                 self.theta_pos += -1 if self.theta_pos > self.theta_goal else 1
 
             if self.phi_pos != self.phi_goal:
-                self.phi_dir.output(self.phi_pos > self.phi_goal)
+                self.phi_dir.value(self.phi_pos > self.phi_goal)
 
-                self.phi_step.output(int(not self.phi_step.value()))
+                self.phi_step.value(int(not self.phi_step.value()))
                 self.phi_pos += -1 if self.phi_pos > self.phi_goal else 1
 
             self.feed_ticks = 0
 
     def write_theta(self, deg, microstep=8):
-        deg = max(0, min(deg, 180))
-        self.theta_goal = round(deg * (1/(1.8 / microstep)))*2
-        print("setting goal of ", self.theta_goal, " or ", deg , " degrees")
+        deg = max(0, min(deg, THETA_MAX))
+        self.theta_goal = deg_to_steps(deg, microstep)
+        log.debug("theta goal {} steps ({} deg)", self.theta_goal, int(deg))
 
     def write_phi(self, deg, microstep=8):
-        deg = max(-180, min(deg, 180))
-        self.phi_goal = round(deg * (1/(1.8 / microstep)))*2
-        print("setting goal of ", self.theta_goal)
+        deg = max(-PHI_MAX, min(deg, PHI_MAX))
+        self.phi_goal = deg_to_steps(deg, microstep)
+        log.debug("phi goal {} steps ({} deg)", self.phi_goal, int(deg))
+
+    # same limits as write_theta/write_phi, for callers that already work in steps
+    def write_theta_steps(self, steps):
+        self.theta_goal = max(0, min(steps, self.theta_max_steps))
+
+    def write_phi_steps(self, steps):
+        self.phi_goal = max(-self.phi_max_steps, min(steps, self.phi_max_steps))
+
+    def at_goal(self):
+        return self.theta_pos == self.theta_goal and self.phi_pos == self.phi_goal
 
     def step_phi(self, step):
         self.phi_goal = max(-180, min(self.phi_pos + step, 180))